@@ -0,0 +1,162 @@
+# agents/supervisor/admission.py
+"""
+Admission control for the supervisor.
+
+Bounds the number of tasks in flight, rate-limits each sender with a token
+bucket, sheds low-priority work first when the supervisor is loaded, and
+hands the worker to the most urgent waiting task so critical tasks are not
+stuck behind a backlog. Lower priority numbers are more urgent; 1 is
+critical.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+CRITICAL_PRIORITY = 1
+
+# Rejection reasons reported in task_rejected messages
+REASON_RATE_LIMITED = "rate_limited"
+REASON_LOAD_SHED = "load_shed"
+REASON_INFLIGHT_LIMIT = "inflight_limit"
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second on average, bursting up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        self._refill(time.monotonic())
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def retry_after(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` will be available."""
+        self._refill(time.monotonic())
+        return max(0.0, (tokens - self._tokens) / self.rate)
+
+
+class PriorityGate:
+    """
+    Serializes access to the worker. When it frees up, the most urgent waiter
+    goes next (FIFO within a priority).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._busy = False
+        self._waiting = []
+        self._order = itertools.count()
+
+    @contextmanager
+    def acquire(self, priority: int):
+        with self._cond:
+            entry = (priority, next(self._order))
+            heapq.heappush(self._waiting, entry)
+            while self._busy or self._waiting[0] != entry:
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._busy = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+
+class AdmissionController:
+    """
+    Decides whether a submitted task is admitted.
+
+    - Every sender has its own token bucket (``rate`` tasks/s, ``burst`` deep).
+    - At most ``max_inflight`` tasks are admitted and unfinished at once; the
+      last ``reserved_critical`` slots are only available to critical tasks.
+    - Once ``shed_threshold`` tasks are in flight, tasks with priority
+      ``shed_priority`` or less urgent are rejected.
+    """
+
+    def __init__(self, max_inflight: int = 32, reserved_critical: int = 4, shed_threshold: Optional[int] = None,
+                 shed_priority: int = 3, rate: float = 50.0, burst: float = 100.0,
+                 overload_window_seconds: float = 5.0):
+        self.max_inflight = max_inflight
+        self.reserved_critical = reserved_critical
+        self.shed_threshold = shed_threshold if shed_threshold is not None else max_inflight // 2
+        self.shed_priority = shed_priority
+        self.rate = rate
+        self.burst = burst
+        self.overload_window_seconds = overload_window_seconds
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._last_rejection: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def try_admit(self, sender: str, priority: int):
+        """
+        Returns (None, 0.0) and takes an inflight slot if the task is admitted,
+        otherwise (reason, retry_after_seconds). Admitted tasks must call
+        release() when done.
+        """
+        with self._lock:
+            critical = priority <= CRITICAL_PRIORITY
+            limit = self.max_inflight if critical else self.max_inflight - self.reserved_critical
+
+            reason, retry_after = None, 0.0
+            if self.inflight >= limit:
+                reason = REASON_INFLIGHT_LIMIT
+            elif priority >= self.shed_priority and self.inflight >= self.shed_threshold:
+                reason = REASON_LOAD_SHED
+            else:
+                bucket = self._buckets.get(sender)
+                if bucket is None:
+                    bucket = self._buckets[sender] = TokenBucket(self.rate, self.burst)
+                if not bucket.try_acquire():
+                    reason, retry_after = REASON_RATE_LIMITED, bucket.retry_after()
+
+            if reason is not None:
+                self.rejected[reason] = self.rejected.get(reason, 0) + 1
+                self._last_rejection = time.monotonic()
+                return reason, retry_after
+
+            self.inflight += 1
+            self.admitted += 1
+            self.peak_inflight = max(self.peak_inflight, self.inflight)
+            return None, 0.0
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+
+    @property
+    def overloaded(self) -> bool:
+        """True while shedding load or within the overload window of the last rejection."""
+        if self.inflight >= self.shed_threshold:
+            return True
+        last = self._last_rejection
+        return last is not None and time.monotonic() - last < self.overload_window_seconds
+
+    def stats(self) -> dict:
+        return {
+            "inflight": self.inflight,
+            "peak_inflight": self.peak_inflight,
+            "max_inflight": self.max_inflight,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
@@ -1,9 +1,20 @@
 # agents/supervisor/supervisor.py
 import json
+import threading
+import time
+import uuid
+from collections import deque
 from datetime import datetime
+from agents.supervisor.admission import AdmissionController, PriorityGate
 from agents.workers.disaster_worker import DisasterAllocationWorker
 from communication.models import Message, Task
 from communication import protocol
+from monitoring import tracing
+from monitoring.metrics import MetricsRegistry
+from optimization.fairness import FairnessAccumulator
+
+# Window over which health_check reports task throughput
+THROUGHPUT_WINDOW_SECONDS = 60.0
 
 
 class SupervisorAgent:
@@ -12,39 +23,226 @@ class SupervisorAgent:
     receives completion reports, and logs results.
     """
 
-    def __init__(self):
+    def __init__(self, content_type: str = protocol.CONTENT_TYPE_JSON, worker=None,
+                 admission: AdmissionController = None):
         self.id = "Supervisor_Main"
-        self.worker = DisasterAllocationWorker("Worker_Disaster", self.id)
+        # In-process worker by default; pass a communication.transport.RemoteWorker
+        # to drive a worker running in another process
+        self.worker = worker or DisasterAllocationWorker("Worker_Disaster", self.id)
+        if getattr(self.worker, "on_report", False) is None:
+            self.worker.on_report = self.receive_report
         self.log_file = "supervisor_log.jsonl"
+        # Wire format for task messages; CONTENT_TYPE_COMPACT packs zone
+        # lists as binary columns (see communication.codec)
+        self.content_type = content_type
+        # Optional callback(task_id, allocation_plan_chunk) invoked as streamed
+        # partial reports arrive, before the whole plan is done
+        self.on_zones = None
+        self._streams = {}
+        # Runtime metrics surfaced by health_check and the exporters below
+        self.metrics = MetricsRegistry()
+        self._started = time.monotonic()
+        self._completions = deque()
+        self._completions_lock = threading.Lock()
+        self.metrics.add_collector(self._refresh_gauges)
+        # Inflight bound, per-sender rate limits and load shedding for task
+        # floods; the gate hands the worker to the most urgent waiting task
+        self.admission = admission or AdmissionController()
+        self._gate = PriorityGate()
 
     # ----------------------------------------------------------------------
     # CORE ACTIONS
     # ----------------------------------------------------------------------
-    def assign_task(self, zones: list, available_volunteers: int):
-        """Build a new message and send to worker."""
-        task = Task(
-            name="allocate_resources",
-            priority=1,
-            parameters={"zones": zones, "available_volunteers": available_volunteers},
-        )
-
-        msg = Message.new(
-            sender=self.id,
-            recipient=self.worker._id,
-            msg_type=protocol.TASK_ASSIGNMENT,
-            task=task,
-        )
-
-        print(f"[{self.id}] Sending task to worker...")
-        self.worker.handle_incoming_message(msg.json())
-        self._log("task_assignment", msg.dict())
+    def assign_task(self, zones: list, available_volunteers: int, priority: int = 1, sender: str = None,
+                    response_teams: list = None, staging_points: list = None, duration_hours: float = None,
+                    shift_hours: float = None, scenarios: list = None, scenario_mode: str = "expected",
+                    roster: list = None, roster_hour: float = None, depots: list = None):
+        """
+        Build a new message and send to worker. Safe to call from several
+        dispatcher threads: tasks past admission control get a task_rejected
+        report instead of queueing. Returns the final report (or rejection).
+        Priority 1 is critical; larger numbers are less urgent. With
+        response_teams, the report also carries the team assignment; with
+        staging_points, allocation penalizes travel from those points; with
+        duration_hours, it carries a per-shift timeline (shift_hours long).
+        With scenarios (candidate scenarios with zones and weights), zones
+        may be empty and one plan covers them all (scenario_mode
+        "expected" or "robust"). With roster (individual volunteers), the
+        report names who goes where (only those available at roster_hour).
+        With depots (shared stock by resource type), zones naming a depot
+        draw on it and the report carries each depot's use.
+        """
+        with tracing.span("supervisor.assign_task", priority=priority, zones=len(zones)):
+            # Admission is decided before any message is built, so rejecting a
+            # flood costs as little as possible
+            reason, retry_after = self.admission.try_admit(sender or self.id, priority)
+            if reason is not None:
+                return self._reject(sender, priority, reason, retry_after)
+
+            # The admitted slot is released however the task ends (including a
+            # message that fails to build or encode)
+            try:
+                trace_id, span_id = tracing.current_context()
+                with tracing.span("message.build"):
+                    parameters = {"zones": zones, "available_volunteers": available_volunteers}
+                    if response_teams:
+                        parameters["response_teams"] = response_teams
+                    if staging_points:
+                        parameters["staging_points"] = staging_points
+                    if depots:
+                        parameters["depots"] = depots
+                    if roster:
+                        parameters["roster"] = roster
+                        if roster_hour is not None:
+                            parameters["roster_hour"] = roster_hour
+                    if scenarios:
+                        parameters["scenarios"] = scenarios
+                        parameters["scenario_mode"] = scenario_mode
+                    if duration_hours:
+                        parameters["duration_hours"] = duration_hours
+                        if shift_hours:
+                            parameters["shift_hours"] = shift_hours
+                    task = Task(
+                        name="allocate_resources",
+                        priority=priority,
+                        parameters=parameters,
+                    )
+
+                    msg = Message.new(
+                        sender=self.id,
+                        recipient=self.worker._id,
+                        msg_type=protocol.TASK_ASSIGNMENT,
+                        task=task,
+                        content_type=self.content_type,
+                        trace_id=trace_id,
+                        parent_span_id=span_id,
+                    )
+                with tracing.span("message.encode", content_type=self.content_type):
+                    payload = msg.encode()
+
+                print(f"[{self.id}] Sending task to worker...")
+                depth = self.metrics.gauge("supervisor_queue_depth", "Tasks admitted and waiting for the worker",
+                                           priority=priority)
+                depth.inc()
+                start = time.perf_counter()
+                with self._gate.acquire(priority):
+                    depth.dec()
+                    service_start = time.perf_counter()
+                    tracing.record_span("supervisor.queue_wait", start, service_start - start)
+                    report = self.worker.handle_incoming_message(payload)
+                    busy = time.perf_counter() - service_start
+            finally:
+                self.admission.release()
+            self._record_task(time.perf_counter() - start, busy, report, priority)
+            with tracing.span("supervisor.log"):
+                self._log("task_assignment", msg.dict())
+            return report
+
+    def _reject(self, sender: str, priority: int, reason: str, retry_after: float) -> dict:
+        """Builds, logs and returns an explicit rejection for a task that was not admitted."""
+        self.metrics.counter("supervisor_tasks_rejected_total", "Tasks refused by admission control",
+                             reason=reason, priority=priority).inc()
+        report = {
+            "message_id": str(uuid.uuid4()),
+            "sender": self.id,
+            "recipient": sender or self.id,
+            "type": protocol.TASK_REJECTED,
+            "related_message_id": None,
+            "status": "REJECTED",
+            "results": {"reason": reason, "priority": priority, "retry_after_seconds": round(retry_after, 3)},
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        print(f"[{self.id}] Rejected priority {priority} task from {sender or self.id} ({reason})")
+        self._log(protocol.TASK_REJECTED, report)
+        return report
 
     def receive_report(self, message_obj: dict):
-        """Handles incoming completion reports from workers."""
+        """Handles incoming completion reports (and streamed partial reports) from workers."""
+        if message_obj.get("type") == protocol.COMPLETION_REPORT_PARTIAL:
+            self._receive_partial(message_obj)
+            return
+
+        stream = self._streams.pop(message_obj.get("related_message_id"), None)
+        expected = (message_obj.get("results") or {}).get("stream")
+        if expected and (stream is None or stream["zones_received"] != expected["zones"]):
+            received = stream["zones_received"] if stream else 0
+            print(f"[{self.id}] WARNING: stream incomplete ({received}/{expected['zones']} zones received)")
+        if stream is not None:
+            fairness = stream["fairness"].metrics()
+            print(f"[{self.id}] Streamed plan fairness: Gini {fairness['gini']}, Jain {fairness['jain_index']}")
+            self._log("stream_fairness", {"related_message_id": message_obj.get("related_message_id"), **fairness})
+
         print(f"[{self.id}] Received completion report!")
         print(json.dumps(message_obj, indent=2))
         self._log("completion_report", message_obj)
 
+    def _receive_partial(self, message_obj: dict):
+        """Consumes one chunk of a streamed plan without buffering the rest."""
+        task_id = message_obj.get("related_message_id")
+        stream = self._streams.setdefault(task_id, {"next_sequence": 0, "zones_received": 0,
+                                                    "fairness": FairnessAccumulator()})
+        sequence = message_obj.get("sequence")
+        if sequence != stream["next_sequence"]:
+            print(f"[{self.id}] WARNING: expected chunk {stream['next_sequence']}, got {sequence}")
+        stream["next_sequence"] = sequence + 1
+
+        chunk = message_obj["results"]["allocation_plan"]
+        stream["zones_received"] += len(chunk)
+        stream["fairness"].add_plan(chunk)
+        start, end = message_obj["zone_range"]
+        print(f"[{self.id}] Received zones {start}-{end - 1} (chunk {sequence})")
+
+        if self.on_zones is not None:
+            self.on_zones(task_id, chunk)
+        self._log(protocol.COMPLETION_REPORT_PARTIAL, message_obj)
+
+    def stream_fairness(self, task_id: str):
+        """Fairness metrics of the zones streamed so far for a task (None when no stream is open)."""
+        stream = self._streams.get(task_id)
+        return stream["fairness"].metrics() if stream else None
+
+    def _record_task(self, elapsed: float, busy: float, report, priority: int):
+        """Updates latency, throughput, utilization, solve-phase and LTM metrics for one task."""
+        m = self.metrics
+        m.histogram("supervisor_task_latency_seconds", "End-to-end task latency").observe(elapsed)
+        m.histogram("supervisor_task_latency_by_priority_seconds", "End-to-end task latency by priority",
+                    priority=priority).observe(elapsed)
+        m.counter("supervisor_worker_busy_seconds_total", "Time the worker spent on tasks").inc(busy)
+        with self._completions_lock:
+            self._completions.append(time.monotonic())
+
+        status = report.get("status", "UNKNOWN") if report else "NO_REPORT"
+        m.counter("supervisor_tasks_total", "Tasks by completion status", status=status).inc()
+
+        results = (report or {}).get("results") or {}
+        phases = (results.get("optimization_metadata") or {}).get("phase_timings_seconds") or {}
+        for phase, seconds in phases.items():
+            m.histogram("optimizer_phase_seconds", "Model build / solve / extraction time",
+                        phase=phase).observe(seconds)
+        for tier, outcome in (results.get("ltm_lookup") or {}).items():
+            m.counter("ltm_lookups_total", "LTM lookups by tier and outcome", tier=tier, outcome=outcome).inc()
+        self._refresh_gauges()
+
+    def _refresh_gauges(self):
+        """Recomputes the time-dependent gauges (throughput, utilization, uptime)."""
+        now = time.monotonic()
+        with self._completions_lock:
+            while self._completions and now - self._completions[0] > THROUGHPUT_WINDOW_SECONDS:
+                self._completions.popleft()
+        uptime = now - self._started
+        window = min(uptime, THROUGHPUT_WINDOW_SECONDS) or 1.0
+        busy = self.metrics.counter("supervisor_worker_busy_seconds_total").value
+        self.metrics.gauge("supervisor_uptime_seconds", "Seconds since the supervisor started").set(uptime)
+        self.metrics.gauge("supervisor_throughput_tasks_per_second",
+                           f"Tasks completed per second over the last {THROUGHPUT_WINDOW_SECONDS:.0f}s"
+                           ).set(len(self._completions) / window)
+        self.metrics.gauge("supervisor_worker_utilization", "Fraction of uptime the worker was busy"
+                           ).set(busy / uptime if uptime > 0 else 0.0)
+        self.metrics.gauge("supervisor_inflight_tasks", "Admitted tasks not yet finished"
+                           ).set(self.admission.inflight)
+        self.metrics.gauge("supervisor_overloaded", "1 while admission control is shedding or rejecting load"
+                           ).set(1.0 if self.admission.overloaded else 0.0)
+
     def _log(self, msg_type: str, content: dict):
         """Append logs with timestamps to JSONL file."""
         entry = {"time": datetime.utcnow().isoformat(), "type": msg_type, "data": content}
@@ -55,4 +253,37 @@ class SupervisorAgent:
     # HEALTH CHECK
     # ----------------------------------------------------------------------
     def health_check(self):
-        return {"status": "OK", "timestamp": datetime.utcnow().isoformat()}
+        """Status ("OK", or "OVERLOADED" while tasks are being shed or rejected) plus live runtime metrics."""
+        self._refresh_gauges()
+        m = self.metrics
+        tasks = {labels["status"]: int(c.value) for labels, c in m.series("supervisor_tasks_total")}
+        ltm = {}
+        for labels, c in m.series("ltm_lookups_total"):
+            tier = ltm.setdefault(labels["tier"], {"hits": 0, "misses": 0})
+            tier["hits" if labels["outcome"] == "hit" else "misses"] += int(c.value)
+        for tier in ltm.values():
+            tier["hit_ratio"] = round(tier["hits"] / (tier["hits"] + tier["misses"]), 4)
+
+        return {
+            "status": "OVERLOADED" if self.admission.overloaded else "OK",
+            "timestamp": datetime.utcnow().isoformat(),
+            "uptime_seconds": round(m.gauge("supervisor_uptime_seconds").value, 3),
+            "metrics": {
+                "tasks": tasks,
+                "throughput_per_second": round(m.gauge("supervisor_throughput_tasks_per_second").value, 4),
+                "latency_seconds": m.histogram("supervisor_task_latency_seconds").summary(),
+                "solve_phases_seconds": {
+                    labels["phase"]: h.summary() for labels, h in m.series("optimizer_phase_seconds")
+                },
+                "ltm": ltm,
+                "queue_depth": {
+                    labels["priority"]: int(g.value) for labels, g in m.series("supervisor_queue_depth")
+                },
+                "worker_utilization": round(m.gauge("supervisor_worker_utilization").value, 4),
+            },
+            "admission": self.admission.stats(),
+        }
+
+    def export_metrics(self, path: str, fmt: str = "json"):
+        """Writes current metrics to a local file as "json" or "prometheus" text."""
+        self.metrics.export(path, fmt)
@@ -1,15 +1,16 @@
 # agents/workers/disaster_worker.py
+import hashlib
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 from .worker_base import AbstractWorkerAgent
-
-# Import optimization engine
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from monitoring import tracing
 from optimization.volunteer_allocator import VolunteerAllocator
+from optimization.team_assignment import assign_teams
+from optimization.multiperiod import SHIFT_HOURS, RollingHorizonPlanner
+from optimization.fairness import FairnessAccumulator
+from optimization.roster import match_roster
 
 
 class DisasterAllocationWorker(AbstractWorkerAgent):
@@ -18,15 +19,22 @@ class DisasterAllocationWorker(AbstractWorkerAgent):
     Implements LTM and messaging as per Supervisor–Worker protocol.
     """
 
-    def __init__(self, agent_id: str, supervisor_id: str, fairness_weight: float = 0.6):
+    def __init__(self, agent_id: str, supervisor_id: str, fairness_weight: float = 0.6, transport=None,
+                 report_chunk_size: Optional[int] = None, solver: str = "auto"):
         super().__init__(agent_id, supervisor_id)
+        # Stream large plans as partial reports of this many zones (None = single report)
+        self.report_chunk_size = report_chunk_size
+        # Outgoing channel with a send(recipient, message_obj) method, e.g.
+        # communication.transport.SocketTransport; None prints to console
+        self.transport = transport
         self.ltm_dir = Path("LTM") / agent_id
         self.ltm_dir.mkdir(parents=True, exist_ok=True)
         self.ltm_file = self.ltm_dir / "allocations.json"
         
         # Initialize optimization engine
-        # fairness_weight=0.6 balances fairness (no zeros) with severity priority
-        self.optimizer = VolunteerAllocator(fairness_weight=fairness_weight)
+        # fairness_weight=0.6 balances fairness (no zeros) with severity priority;
+        # solver="auto" only loads PuLP/CBC when the exact solver cannot be used
+        self.optimizer = VolunteerAllocator(fairness_weight=fairness_weight, solver=solver)
         print(f"[{agent_id}] Initialized with optimization engine (fairness_weight={fairness_weight})")
 
     # ----------------------------------------------------------------------
@@ -50,21 +58,33 @@ class DisasterAllocationWorker(AbstractWorkerAgent):
 
         if cached_result:
             print(f"[{self._id}] Retrieved cached result from LTM.")
-            return {"source": "LTM", **cached_result}
+            return {"source": "LTM", **cached_result, "ltm_lookup": {"file": "hit"}}
 
         print(f"[{self._id}] Computing optimal allocation plan...")
+        if task_data.get("scenarios"):
+            result = self._scenario_result(task_data)
+            self.write_to_ltm(key, result)
+            return {"source": "LIVE", **result, "ltm_lookup": {"file": "miss"}}
+
         zones = task_data.get("zones", [])
         available_volunteers = task_data.get("available_volunteers", 0)
         
-        # Use optimization engine for allocation
-        optimization_result = self.optimizer.allocate(zones, available_volunteers)
+        # Use optimization engine for allocation (travel-cost aware when staging points are given,
+        # drawing on shared stock when depots are)
+        optimization_result = self.optimizer.allocate(zones, available_volunteers,
+                                                      staging_points=task_data.get("staging_points"),
+                                                      depots=task_data.get("depots"))
         
         # Transform optimizer output to match expected format
+        # (the optimizer echoes each zone's severity, so no per-zone lookup is needed)
         plan = [
             {
                 "zone_id": alloc["zone_id"],
                 "assigned_volunteers": alloc["allocated"],
-                "severity": next((z["severity"] for z in zones if z["id"] == alloc["zone_id"]), "N/A")
+                "severity": alloc["severity"],
+                # Kept so satisfaction metrics can be rebuilt from the plan (e.g. a streamed one)
+                "required": alloc["required"],
+                **({"sources": alloc["sources"]} if "sources" in alloc else {})
             }
             for alloc in optimization_result["allocation_plan"]
         ]
@@ -76,23 +96,157 @@ class DisasterAllocationWorker(AbstractWorkerAgent):
             "optimization_metadata": {
                 "objective_value": optimization_result["objective_value"],
                 "solve_time_seconds": optimization_result["solve_time_seconds"],
+                "phase_timings_seconds": optimization_result["phase_timings_seconds"],
                 "model_type": optimization_result["model_type"],
+                "solver": optimization_result["solver"],
                 "fairness_weight": optimization_result["fairness_weight"],
                 "fairness_metrics": optimization_result["fairness_metrics"]
             }
         }
 
+        # Second stage: deploy response teams (when the task carries them) against the plan
+        teams = task_data.get("response_teams")
+        if teams:
+            with tracing.span("optimizer.assign_teams", teams=len(teams)):
+                result["team_assignment"] = assign_teams(zones, teams, optimization_result["allocation_plan"])
+
+        # Named volunteers from the roster (when the task carries one) for the plan's counts
+        roster = task_data.get("roster")
+        if roster:
+            with tracing.span("optimizer.match_roster", volunteers=len(roster)):
+                result["roster_assignment"] = match_roster(zones, roster, optimization_result["allocation_plan"],
+                                                           hour=task_data.get("roster_hour"))
+
+        if "travel" in optimization_result:
+            result["optimization_metadata"]["travel"] = optimization_result["travel"]
+        if "decomposition" in optimization_result:
+            result["optimization_metadata"]["decomposition"] = optimization_result["decomposition"]
+        if "depots" in optimization_result:
+            result["optimization_metadata"]["depots"] = optimization_result["depots"]
+        # Shadow prices and ranges, so what-if questions need no new task (see optimization.sensitivity)
+        if "sensitivity" in optimization_result:
+            result["sensitivity"] = optimization_result["sensitivity"]
+
+        # Multi-period: a per-shift timeline over the scenario's duration
+        if task_data.get("duration_hours"):
+            with tracing.span("optimizer.plan_shifts", hours=task_data["duration_hours"]):
+                result["timeline"] = self._plan_timeline(task_data)
+
         self.write_to_ltm(key, result)
-        return {"source": "LIVE", **result}
+        # Per-tier LTM lookup outcome, aggregated into hit ratios by the supervisor
+        return {"source": "LIVE", **result, "ltm_lookup": {"file": "miss"}}
+
+    def _scenario_result(self, task_data: dict) -> dict:
+        """
+        One plan across task_data["scenarios"] (candidate scenarios, each with
+        zones and an optional weight), maximizing the expected value or, with
+        task_data["scenario_mode"] = "robust", the worst-case value.
+        """
+        mode = task_data.get("scenario_mode", "expected")
+        outcome = self.optimizer.allocate_scenarios(task_data["scenarios"],
+                                                    task_data.get("available_volunteers", 0), mode=mode)
+        plan = [
+            {"zone_id": entry["zone_id"], "assigned_volunteers": entry["allocated"],
+             "severity": entry["expected_severity"], "required": entry["expected_required"]}
+            for entry in outcome["allocation_plan"]
+        ]
+        fairness = FairnessAccumulator()
+        fairness.add_plan(plan)
+        return {
+            "allocation_plan": plan,
+            "remaining_volunteers": outcome["remaining_volunteers"],
+            "timestamp": outcome["timestamp"],
+            "optimization_metadata": {
+                "objective_value": outcome["objective_value"],
+                "solve_time_seconds": outcome["solve_time_seconds"],
+                "model_type": "Scenario Decomposition",
+                "solver": "scenarios",
+                "fairness_weight": outcome["fairness_weight"],
+                "fairness_metrics": fairness.metrics(),
+                "scenario_mode": mode,
+                "expected_value": outcome["expected_value"],
+                "worst_case_value": outcome["worst_case_value"],
+                "bound": outcome["bound"],
+                "gap": outcome["gap"],
+                "iterations": outcome["iterations"],
+                "scenarios": outcome["scenarios"]
+            }
+        }
+
+    def _plan_timeline(self, task_data: dict) -> list:
+        """
+        Rolling-horizon shift plan over task_data["duration_hours"] (shifts
+        of task_data["shift_hours"], default 8). Shifts are cached in LTM with
+        the state each hands to the next one, one line per period in a file
+        named by a digest of the zones, volunteers and planner settings (not
+        the duration), so extending the horizon only solves the new shifts and
+        caching a shift appends one line. Staging points are not used here;
+        shifts follow the plain allocation model.
+        """
+        planner = RollingHorizonPlanner(fairness_weight=self.optimizer.fairness_weight,
+                                        shift_hours=task_data.get("shift_hours", SHIFT_HOURS))
+        zones = task_data.get("zones", [])
+        available_volunteers = task_data.get("available_volunteers", 0)
+        base = {"zones": zones, "available_volunteers": available_volunteers, **planner.params()}
+        digest = hashlib.sha256(json.dumps(base, sort_keys=True).encode("utf-8")).hexdigest()
+        path = self.ltm_dir / "timelines" / f"{digest}.jsonl"
+
+        periods = planner.periods(task_data["duration_hours"])
+        cached = self._read_timeline(path)[:periods]
+        timeline = [{**entry["record"], "source": "LTM"} for entry in cached]
+        state = cached[-1]["state"] if cached else planner.initial_state(available_volunteers)
+        for period in range(len(cached), periods):
+            record, state = planner.step(zones, period, state)
+            self._append_timeline(path, {"period": period, "record": record, "state": state})
+            timeline.append({**record, "source": "LIVE"})
+        return timeline
+
+    def _read_timeline(self, path: Path) -> list:
+        """Cached shifts of one timeline file, in period order (up to the first unreadable line)."""
+        with tracing.span("ltm.read", tier="file") as span:
+            try:
+                lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+            except Exception as e:
+                print(f"[{self._id}] ERROR reading from LTM: {e}")
+                return []
+            entries = []
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # partly written last line
+                    break
+                if entry.get("period") != len(entries):
+                    break
+                entries.append(entry)
+            if len(entries) < len(lines):
+                # Drop the damaged tail so later appends continue the valid prefix
+                path.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8")
+            span.set(hit=bool(entries))
+            return entries
+
+    def _append_timeline(self, path: Path, entry: dict) -> bool:
+        """Appends one shift to a timeline file."""
+        with tracing.span("ltm.write", tier="file"):
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+                return True
+            except Exception as e:
+                print(f"[{self._id}] ERROR writing to LTM: {e}")
+                return False
 
     # ----------------------------------------------------------------------
     # COMMUNICATION HANDLERS
     # ----------------------------------------------------------------------
     def send_message(self, recipient: str, message_obj: dict):
         """
-        Sends JSON response to Supervisor (for demo, prints to console).
-        Replace with socket or HTTP later if needed.
+        Sends the response to the Supervisor through the configured transport
+        (see communication.transport). Without one, prints to console.
         """
+        if self.transport is not None:
+            self.transport.send(recipient, message_obj)
+            return
         print(f"[{self._id}] Sending message to {recipient}:")
         print(json.dumps(message_obj, indent=2))
 
@@ -101,25 +255,29 @@ class DisasterAllocationWorker(AbstractWorkerAgent):
     # ----------------------------------------------------------------------
     def write_to_ltm(self, key: str, value: Any) -> bool:
         """Store key–value pair in allocations.json (LTM)."""
-        try:
-            if self.ltm_file.exists():
-                data = json.loads(self.ltm_file.read_text())
-            else:
-                data = {}
-            data[key] = value
-            self.ltm_file.write_text(json.dumps(data, indent=2))
-            return True
-        except Exception as e:
-            print(f"[{self._id}] ERROR writing to LTM: {e}")
-            return False
+        with tracing.span("ltm.write", tier="file"):
+            try:
+                if self.ltm_file.exists():
+                    data = json.loads(self.ltm_file.read_text())
+                else:
+                    data = {}
+                data[key] = value
+                self.ltm_file.write_text(json.dumps(data, indent=2))
+                return True
+            except Exception as e:
+                print(f"[{self._id}] ERROR writing to LTM: {e}")
+                return False
 
     def read_from_ltm(self, key: str):
         """Retrieve stored value from allocations.json (LTM)."""
-        try:
-            if not self.ltm_file.exists():
+        with tracing.span("ltm.read", tier="file") as span:
+            try:
+                if not self.ltm_file.exists():
+                    return None
+                data = json.loads(self.ltm_file.read_text())
+                value = data.get(key)
+                span.set(hit=value is not None)
+                return value
+            except Exception as e:
+                print(f"[{self._id}] ERROR reading from LTM: {e}")
                 return None
-            data = json.loads(self.ltm_file.read_text())
-            return data.get(key)
-        except Exception as e:
-            print(f"[{self._id}] ERROR reading from LTM: {e}")
-            return None
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
 import json
+import time
 import uuid
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+from communication import codec, protocol
+from monitoring import tracing
 
 class AbstractWorkerAgent(ABC):
     """
@@ -12,6 +16,10 @@ class AbstractWorkerAgent(ABC):
         self._id = agent_id
         self._supervisor_id = supervisor_id
         self._current_task_id = None 
+        self._reply_content_type = protocol.CONTENT_TYPE_JSON
+        # When set, allocation plans are reported in chunks of this many zones
+        # followed by a summary frame instead of one report holding every zone
+        self.report_chunk_size: Optional[int] = None
 
     # --- Abstract Methods (Must be Implemented by Subclasses) ---
 
@@ -47,20 +55,33 @@ class AbstractWorkerAgent(ABC):
 
     # --- Concrete Methods (Shared Communication Protocol) ---
 
-    def handle_incoming_message(self, json_message: str):
-        """Receives and processes an incoming JSON message from the supervisor."""
+    def handle_incoming_message(self, json_message: Union[str, bytes]):
+        """
+        Receives and processes an incoming message from the supervisor.
+        Accepts JSON text or a compact codec frame; the completion report is
+        sent back in the same content type the task arrived in. Returns the
+        final completion report (None if the message carried no task).
+        """
         try:
-            message = json.loads(json_message)
-            msg_type = message.get("type")
-            
-            if msg_type == "task_assignment":
-                task_params = message.get("task", {}).get("parameters", {})
-                self._current_task_id = message.get("message_id")
-                print(f"[{self._id}] received task: {message['task']['name']}")
-                self._execute_task(task_params, self._current_task_id)
-            
-        except json.JSONDecodeError as e:
+            decode_start = time.perf_counter()
+            message = codec.decode_message(json_message)
+            decode_seconds = time.perf_counter() - decode_start
+        except (json.JSONDecodeError, codec.CodecError) as e:
             print(f"[{self._id}] ERROR decoding message: {e}")
+            return None
+
+        msg_type = message.get("type")
+        self._reply_content_type = message.get("content_type") or codec.detect_content_type(json_message)
+        # Continue the sender's trace, if it sent one
+        with tracing.use_context(message.get("trace_id"), message.get("parent_span_id")):
+            with tracing.span("worker.handle_incoming_message", started_at=decode_start, worker=self._id, type=msg_type):
+                tracing.record_span("codec.decode", decode_start, decode_seconds, bytes=len(json_message))
+                if msg_type == "task_assignment":
+                    task_params = message.get("task", {}).get("parameters", {})
+                    self._current_task_id = message.get("message_id")
+                    print(f"[{self._id}] received task: {message['task']['name']}")
+                    return self._execute_task(task_params, self._current_task_id)
+        return None
 
     def _execute_task(self, task_data: dict, related_msg_id: str):
         """Executes the concrete process_task logic and handles result reporting."""
@@ -68,25 +89,64 @@ class AbstractWorkerAgent(ABC):
         results = {}
         
         try:
-            results = self.process_task(task_data)
+            with tracing.span("worker.process_task"):
+                results = self.process_task(task_data)
             status = "SUCCESS"
         except Exception as e:
             results = {"error": str(e), "details": "Task processing failed."}
             print(f"[{self._id}] Task FAILED: {e}")
             
-        self._report_completion(related_msg_id, status, results)
+        return self._report_completion(related_msg_id, status, results)
+
+    def _report_completion(self, related_msg_id: str, status: str, results: dict) -> dict:
+        """Constructs and sends a task completion report, returning the final one."""
+        plan = results.get("allocation_plan")
+        with tracing.span("worker.report_completion", status=status):
+            if status == "SUCCESS" and self.report_chunk_size and isinstance(plan, list):
+                report = self._stream_completion(related_msg_id, results, plan)
+            else:
+                report = self._build_report(protocol.COMPLETION_REPORT, related_msg_id, status, results)
+                self.send_message(self._supervisor_id, report)
+        self._current_task_id = None
+        return report
+
+    def _stream_completion(self, related_msg_id: str, results: dict, plan: list) -> dict:
+        """
+        Sends the allocation plan as partial reports of report_chunk_size zones,
+        each tagged with a sequence number and zone range, then a final
+        completion report carrying everything except the plan.
+        """
+        chunk_size = self.report_chunk_size
+        sequence = 0
+        for start in range(0, len(plan), chunk_size):
+            chunk = plan[start:start + chunk_size]
+            partial = self._build_report(
+                protocol.COMPLETION_REPORT_PARTIAL, related_msg_id, "PARTIAL",
+                {"allocation_plan": chunk},
+                sequence=sequence, zone_range=[start, start + len(chunk)],
+            )
+            self.send_message(self._supervisor_id, partial)
+            sequence += 1
+
+        summary = {k: v for k, v in results.items() if k != "allocation_plan"}
+        summary["stream"] = {"chunks": sequence, "zones": len(plan)}
+        final = self._build_report(protocol.COMPLETION_REPORT, related_msg_id, "SUCCESS", summary, sequence=sequence)
+        self.send_message(self._supervisor_id, final)
+        return final
 
-    def _report_completion(self, related_msg_id: str, status: str, results: dict):
-        """Constructs and sends a task completion report."""
-        report = {
+    def _build_report(self, msg_type: str, related_msg_id: str, status: str, results: dict, **extra) -> dict:
+        trace_id, span_id = tracing.current_context()
+        if trace_id is not None:
+            extra = {"trace_id": trace_id, "parent_span_id": span_id, **extra}
+        return {
             "message_id": str(uuid.uuid4()),
             "sender": self._id,
             "recipient": self._supervisor_id,
-            "type": "completion_report",
+            "type": msg_type,
             "related_message_id": related_msg_id,
             "status": status,
             "results": results,
-            "timestamp": "..." 
+            "timestamp": "...",
+            "content_type": self._reply_content_type,
+            **extra
         }
-        self.send_message(self._supervisor_id, report)
-        self._current_task_id = None
\ No newline at end of file
@@ -0,0 +1,43 @@
+# agents/workers/worker_server.py
+"""
+Runs a DisasterAllocationWorker in its own process behind a socket.
+
+Usage (from AI-Agent-System/):
+    python -m agents.workers.worker_server --address unix:/tmp/worker.sock
+    python -m agents.workers.worker_server --address tcp://127.0.0.1:9000
+
+The supervisor side connects with communication.transport.RemoteWorker.
+"""
+
+import argparse
+
+from communication.transport import serve_worker
+from monitoring import tracing
+from .disaster_worker import DisasterAllocationWorker
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a disaster allocation worker over a socket")
+    parser.add_argument("--address", required=True, help="unix:/path/to.sock or tcp://127.0.0.1:PORT")
+    parser.add_argument("--agent-id", default="Worker_Disaster")
+    parser.add_argument("--supervisor-id", default="Supervisor_Main")
+    parser.add_argument("--fairness-weight", type=float, default=0.6)
+    parser.add_argument("--solver", choices=["auto", "exact", "cbc", "hierarchical"], default="auto")
+    parser.add_argument("--report-chunk-size", type=int, default=None,
+                        help="stream completion reports in chunks of this many zones")
+    parser.add_argument("--trace-file", default=None, help="append trace spans to this JSONL file")
+    args = parser.parse_args(argv)
+
+    if args.trace_file:
+        tracing.configure(args.trace_file)
+
+    worker = DisasterAllocationWorker(args.agent_id, args.supervisor_id, fairness_weight=args.fairness_weight,
+                                      report_chunk_size=args.report_chunk_size, solver=args.solver)
+    server = serve_worker(worker, args.address)
+    server.start()
+    print(f"[{args.agent_id}] Listening on {server.address}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Compact Message Codec
+
+Optional binary encoding for supervisor/worker messages. JSON repeats every
+key name for every zone, so large zone lists are dominated by key text. The
+compact codec keeps the envelope as minified JSON but moves every list of
+records (zones, allocation plans, ...) into columnar tables packed with
+``struct``/``array``.
+
+Frame layout (integers little-endian):
+
+    magic      2s   b"DV"
+    version    B    FORMAT_VERSION
+    flags      B    reserved, 0
+    env_len    I    length of the envelope
+    envelope        minified JSON, record lists replaced by {"$table": n};
+                    user dicts with a "$table" or "$dict" key wrapped as
+                    {"$dict": {...}} so they are never taken for a reference
+    n_tables   I
+    per table:
+        n_rows I, n_cols H
+        per column:
+            name_len H, name (utf-8)
+            kind     B    b"i" int64 | b"f" float64 | b"s" utf-8 | b"j" JSON
+            has_mask B    1 if some rows do not carry the key
+            [mask]        ceil(n_rows / 8) bytes, bit set = key present
+            size     I    payload length, then payload
+
+Decoding is lossless: ints stay ints, floats stay floats, and anything the
+typed columns cannot hold exactly falls back to a JSON column.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Union
+
+from communication import protocol
+
+MAGIC = b"DV"
+FORMAT_VERSION = 1
+TABLE_MARKER = "$table"
+ESCAPE_MARKER = "$dict"
+
+_HEADER = struct.Struct("<2sBBI")
+_U32 = struct.Struct("<I")
+_TABLE = struct.Struct("<IH")
+_KIND = struct.Struct("<BB")
+_U16 = struct.Struct("<H")
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+_SWAP = sys.byteorder != "little"
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be encoded or decoded."""
+
+
+# ----------------------------------------------------------------------
+# PUBLIC API
+# ----------------------------------------------------------------------
+def encode_message(message: Dict[str, Any], content_type: str = protocol.CONTENT_TYPE_JSON) -> bytes:
+    """Serialize a message dict using the requested content type."""
+    if content_type == protocol.CONTENT_TYPE_JSON:
+        return json.dumps(message).encode("utf-8")
+    if content_type == protocol.CONTENT_TYPE_COMPACT:
+        return encode_compact(message)
+    raise CodecError(f"Unsupported content type: {content_type}")
+
+
+def decode_message(data: Union[bytes, bytearray, memoryview, str]) -> Dict[str, Any]:
+    """Deserialize a message, detecting the content type from the payload."""
+    if isinstance(data, str):
+        return json.loads(data)
+    data = bytes(data)
+    if is_compact(data):
+        return decode_compact(data)
+    return json.loads(data)
+
+
+def detect_content_type(data: Union[bytes, bytearray, memoryview, str]) -> str:
+    """Return the content type a payload was encoded with."""
+    if not isinstance(data, str) and is_compact(bytes(data[:2])):
+        return protocol.CONTENT_TYPE_COMPACT
+    return protocol.CONTENT_TYPE_JSON
+
+
+def is_compact(data: bytes) -> bool:
+    return data[:2] == MAGIC
+
+
+def encode_compact(message: Dict[str, Any]) -> bytes:
+    """Encode a message dict as a compact columnar frame."""
+    tables: List[List[Dict[str, Any]]] = []
+    envelope = _extract_tables(
+        {k: v for k, v in message.items() if v is not None},
+        tables,
+    )
+    try:
+        env_bytes = json.dumps(envelope, separators=(",", ":")).encode("utf-8")
+    except (TypeError, ValueError) as e:
+        raise CodecError(f"Envelope is not JSON serializable: {e}") from e
+
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(env_bytes)), env_bytes, _U32.pack(len(tables))]
+    for rows in tables:
+        _pack_table(rows, parts)
+    return b"".join(parts)
+
+
+def decode_compact(data: bytes) -> Dict[str, Any]:
+    """Decode a compact columnar frame back into a message dict."""
+    view = memoryview(data)
+    try:
+        magic, version, _flags, env_len = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise CodecError("Not a compact frame (bad magic)")
+        if version != FORMAT_VERSION:
+            raise CodecError(f"Unsupported compact frame version: {version}")
+        offset = _HEADER.size
+        envelope = json.loads(bytes(view[offset:offset + env_len]))
+        offset += env_len
+
+        (n_tables,) = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        tables = []
+        for _ in range(n_tables):
+            rows, offset = _unpack_table(view, offset)
+            tables.append(rows)
+    except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise CodecError(f"Corrupt compact frame: {e}") from e
+
+    if offset != len(view):
+        raise CodecError("Trailing bytes after compact frame")
+    return _restore_tables(envelope, tables)
+
+
+# ----------------------------------------------------------------------
+# ENVELOPE <-> TABLES
+# ----------------------------------------------------------------------
+def _is_record_list(value: Any) -> bool:
+    return isinstance(value, list) and len(value) > 0 and all(isinstance(v, dict) for v in value)
+
+
+def _extract_tables(value: Any, tables: list) -> Any:
+    """Replace every list of records with a reference into ``tables``."""
+    if _is_record_list(value):
+        tables.append(value)
+        return {TABLE_MARKER: len(tables) - 1}
+    if isinstance(value, dict):
+        items = {k: _extract_tables(v, tables) for k, v in value.items()}
+        if TABLE_MARKER in value or ESCAPE_MARKER in value:
+            return {ESCAPE_MARKER: items}
+        return items
+    if isinstance(value, list):
+        return [_extract_tables(v, tables) for v in value]
+    return value
+
+
+def _restore_tables(value: Any, tables: list) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and ESCAPE_MARKER in value and isinstance(value[ESCAPE_MARKER], dict):
+            return {k: _restore_tables(v, tables) for k, v in value[ESCAPE_MARKER].items()}
+        if len(value) == 1 and TABLE_MARKER in value:
+            index = value[TABLE_MARKER]
+            if type(index) is not int or not 0 <= index < len(tables):
+                raise CodecError(f"Envelope references missing table {index!r}")
+            return tables[index]
+        return {k: _restore_tables(v, tables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_restore_tables(v, tables) for v in value]
+    return value
+
+
+# ----------------------------------------------------------------------
+# COLUMN PACKING
+# ----------------------------------------------------------------------
+def _column_kind(values: list) -> bytes:
+    """Pick the narrowest lossless column kind for the present values."""
+    if all(type(v) is int for v in values):
+        if all(_INT64_MIN <= v <= _INT64_MAX for v in values):
+            return b"i"
+        return b"j"
+    if all(type(v) is float for v in values):
+        return b"f"
+    if all(type(v) is str for v in values):
+        return b"s"
+    return b"j"
+
+
+def _pack_numbers(typecode: str, values: list) -> bytes:
+    arr = array(typecode, values)
+    if _SWAP:
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _unpack_numbers(typecode: str, payload: memoryview) -> list:
+    arr = array(typecode)
+    arr.frombytes(payload)
+    if _SWAP:
+        arr.byteswap()
+    return arr.tolist()
+
+
+def _pack_table(rows: List[Dict[str, Any]], parts: list):
+    names: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            names.setdefault(key, None)
+
+    n_rows = len(rows)
+    parts.append(_TABLE.pack(n_rows, len(names)))
+    for name in names:
+        if not isinstance(name, str):
+            raise CodecError(f"Record keys must be strings, got {name!r}")
+        mask = None
+        values = [row.get(name) for row in rows if name in row]
+        if len(values) != n_rows:
+            mask = bytearray((n_rows + 7) // 8)
+            for i, row in enumerate(rows):
+                if name in row:
+                    mask[i >> 3] |= 1 << (i & 7)
+
+        kind = _column_kind(values)
+        if kind == b"i":
+            payload = _pack_numbers("q", values)
+        elif kind == b"f":
+            payload = _pack_numbers("d", values)
+        elif kind == b"s":
+            encoded = [v.encode("utf-8") for v in values]
+            payload = _pack_numbers("I", [len(v) for v in encoded]) + b"".join(encoded)
+        else:
+            try:
+                payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+            except (TypeError, ValueError) as e:
+                raise CodecError(f"Column {name!r} is not JSON serializable: {e}") from e
+
+        name_bytes = name.encode("utf-8")
+        parts.append(_U16.pack(len(name_bytes)))
+        parts.append(name_bytes)
+        parts.append(_KIND.pack(kind[0], 1 if mask is not None else 0))
+        if mask is not None:
+            parts.append(bytes(mask))
+        parts.append(_U32.pack(len(payload)))
+        parts.append(payload)
+
+
+def _unpack_table(view: memoryview, offset: int):
+    n_rows, n_cols = _TABLE.unpack_from(view, offset)
+    offset += _TABLE.size
+
+    names = []
+    columns = []
+    masks = []
+    for _ in range(n_cols):
+        (name_len,) = _U16.unpack_from(view, offset)
+        offset += _U16.size
+        name = bytes(view[offset:offset + name_len]).decode("utf-8")
+        offset += name_len
+        kind, has_mask = _KIND.unpack_from(view, offset)
+        offset += _KIND.size
+
+        mask = None
+        if has_mask:
+            mask_len = (n_rows + 7) // 8
+            mask = bytes(view[offset:offset + mask_len])
+            if len(mask) != mask_len:
+                raise CodecError("Truncated validity mask")
+            offset += mask_len
+
+        (size,) = _U32.unpack_from(view, offset)
+        offset += _U32.size
+        payload = view[offset:offset + size]
+        if len(payload) != size:
+            raise CodecError("Truncated column payload")
+        offset += size
+
+        if kind == ord("i"):
+            values = _unpack_numbers("q", payload)
+        elif kind == ord("f"):
+            values = _unpack_numbers("d", payload)
+        elif kind == ord("s"):
+            count = n_rows if mask is None else sum(bin(b).count("1") for b in mask)
+            if len(payload) < 4 * count:
+                raise CodecError("Truncated string column")
+            lengths = _unpack_numbers("I", payload[:4 * count])
+            blob = bytes(payload[4 * count:])
+            values = []
+            pos = 0
+            for length in lengths:
+                values.append(blob[pos:pos + length].decode("utf-8"))
+                pos += length
+        elif kind == ord("j"):
+            values = json.loads(bytes(payload))
+        else:
+            raise CodecError(f"Unknown column kind: {kind!r}")
+        present = n_rows if mask is None else sum(bin(b).count("1") for b in mask)
+        if not isinstance(values, list) or len(values) != present:
+            raise CodecError(f"Column {name!r} holds {len(values) if isinstance(values, list) else 'no'} "
+                             f"values for {present} rows")
+
+        names.append(name)
+        columns.append(values)
+        masks.append(mask)
+
+    if all(mask is None for mask in masks):
+        rows = [dict(zip(names, values)) for values in zip(*columns)] if columns else [{} for _ in range(n_rows)]
+        return rows, offset
+
+    rows = [{} for _ in range(n_rows)]
+    for name, values, mask in zip(names, columns, masks):
+        if mask is None:
+            for row, v in zip(rows, values):
+                row[name] = v
+            continue
+        it = iter(values)
+        for i in range(n_rows):
+            if mask[i >> 3] & (1 << (i & 7)):
+                rows[i][name] = next(it)
+    return rows, offset
@@ -1,8 +1,10 @@
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import uuid
 
+from communication import codec, protocol
+
 class Task(BaseModel):
     name: str
     priority: int
@@ -18,6 +20,13 @@ class Message(BaseModel):
     status: Optional[str] = None
     results: Optional[Dict[str, Any]] = None
     timestamp: str
+    content_type: str = protocol.CONTENT_TYPE_JSON
+    # Streaming reports: chunk order and the [start, end) zone slice it covers
+    sequence: Optional[int] = None
+    zone_range: Optional[List[int]] = None
+    # Tracing: trace this message belongs to and the span that sent it
+    trace_id: Optional[str] = None
+    parent_span_id: Optional[str] = None
 
     @staticmethod
     def new(sender: str, recipient: str, msg_type: str, **kwargs):
@@ -29,3 +38,16 @@ class Message(BaseModel):
             timestamp=datetime.utcnow().isoformat(),
             **kwargs
         )
+
+    def encode(self) -> bytes:
+        """Serialize the message using its negotiated content type."""
+        if self.content_type == protocol.CONTENT_TYPE_JSON:
+            return self.json().encode("utf-8")
+        return codec.encode_message(self.dict(), self.content_type)
+
+    @staticmethod
+    def decode(data: Union[bytes, str]) -> "Message":
+        """Parse a JSON or compact payload back into a Message."""
+        message = codec.decode_message(data)
+        message.setdefault("content_type", codec.detect_content_type(data))
+        return Message(**message)
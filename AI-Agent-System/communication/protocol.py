@@ -1,4 +1,10 @@
 # Message type constants
 TASK_ASSIGNMENT = "task_assignment"
 COMPLETION_REPORT = "completion_report"
+COMPLETION_REPORT_PARTIAL = "completion_report_partial"
+TASK_REJECTED = "task_rejected"
 HEALTH_CHECK = "health_check"
+
+# Content types understood by communication.codec
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_COMPACT = "application/x-disaster-columnar"
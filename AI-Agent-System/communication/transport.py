@@ -0,0 +1,471 @@
+"""
+Socket Transport
+
+Length-prefixed framing over Unix-domain or loopback TCP sockets for workers
+that run in a separate process.
+
+Wire format: every frame is ``>IB`` (payload length, flags) followed by the
+payload. A request is a single frame; its response is one or more frames, the
+last of which carries FLAG_END. Because a connection serves requests strictly
+in order, clients may pipeline several requests before reading any response.
+Handlers that return a generator have each frame written as soon as it is
+yielded, so long responses (streamed completion reports) can be consumed
+while they are still being produced.
+
+Addresses:
+    ("127.0.0.1", 9000)        loopback TCP
+    "tcp://127.0.0.1:9000"     loopback TCP
+    "unix:/tmp/worker.sock"    Unix-domain socket (a bare path also works)
+"""
+
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from communication import codec, protocol
+
+FLAG_END = 0x01
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+_FRAME_HEADER = struct.Struct(">IB")
+
+Address = Union[str, Tuple[str, int]]
+Handler = Callable[[bytes], Union[None, bytes, Iterable[bytes]]]
+
+
+class TransportError(Exception):
+    """Raised when a request cannot be delivered or answered."""
+
+
+class ConnectionClosed(TransportError):
+    """The peer closed the connection."""
+
+
+# ----------------------------------------------------------------------
+# ADDRESSES AND FRAMING
+# ----------------------------------------------------------------------
+def parse_address(address: Address):
+    """Return (socket family, sockaddr) for a transport address."""
+    if isinstance(address, tuple):
+        return socket.AF_INET, (address[0], int(address[1]))
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        return socket.AF_INET, (host, int(port))
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        if path.startswith("//"):
+            path = path[2:]
+        return socket.AF_UNIX, path
+    return socket.AF_UNIX, address
+
+
+def send_frame(sock: socket.socket, payload: bytes, flags: int = FLAG_END):
+    if len(payload) > MAX_FRAME_BYTES:
+        raise TransportError(f"Frame of {len(payload)} bytes exceeds limit of {MAX_FRAME_BYTES}")
+    header = _FRAME_HEADER.pack(len(payload), flags)
+    if len(payload) < 65536:
+        sock.sendall(header + payload)
+    else:
+        # Avoid copying large payloads just to prepend the header
+        sock.sendall(header)
+        sock.sendall(payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:], size - received)
+        if n == 0:
+            raise ConnectionClosed("Connection closed by peer")
+        received += n
+    return bytes(buf)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[bytes, int]:
+    """Read one frame; returns (payload, flags)."""
+    length, flags = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise TransportError(f"Incoming frame of {length} bytes exceeds limit of {MAX_FRAME_BYTES}")
+    return (_recv_exact(sock, length) if length else b""), flags
+
+
+def _recv_response(sock: socket.socket) -> List[bytes]:
+    """Read frames up to and including the FLAG_END frame of one response."""
+    frames = []
+    while True:
+        payload, flags = recv_frame(sock)
+        if payload:
+            frames.append(payload)
+        if flags & FLAG_END:
+            return frames
+
+
+# ----------------------------------------------------------------------
+# SERVER
+# ----------------------------------------------------------------------
+class FramedServer:
+    """
+    Threaded server that keeps connections open and answers each request
+    frame with the frames produced by ``handler``.
+    """
+
+    def __init__(self, address: Address, handler: Handler, backlog: int = 64):
+        self.handler = handler
+        self._family, self._sockaddr = parse_address(address)
+        self._backlog = backlog
+        self._listener: Optional[socket.socket] = None
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.connections_accepted = 0
+
+    @property
+    def address(self) -> Address:
+        """Bound address (resolves an ephemeral TCP port)."""
+        if self._family == socket.AF_UNIX:
+            return f"unix:{self._sockaddr}"
+        return self._sockaddr
+
+    def start(self) -> "FramedServer":
+        listener = socket.socket(self._family, socket.SOCK_STREAM)
+        if self._family == socket.AF_UNIX:
+            if os.path.exists(self._sockaddr):
+                os.unlink(self._sockaddr)
+        else:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(self._sockaddr)
+        listener.listen(self._backlog)
+        if self._family != socket.AF_UNIX:
+            self._sockaddr = listener.getsockname()[:2]
+        self._listener = listener
+
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Block until interrupted, starting the server if needed."""
+        if self._listener is None:
+            self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        try:
+            listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        listener.close()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._family == socket.AF_UNIX and os.path.exists(self._sockaddr):
+            os.unlink(self._sockaddr)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while self._listener is not None:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            if self._family != socket.AF_UNIX:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._connections.add(conn)
+                self.connections_accepted += 1
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def _serve_connection(self, conn: socket.socket):
+        try:
+            while True:
+                payload, _ = recv_frame(conn)
+                reply = self.handler(payload)
+                if reply is None:
+                    reply = ()
+                elif isinstance(reply, (bytes, bytearray)):
+                    reply = (bytes(reply),)
+                # One frame of lookahead so the last frame can carry FLAG_END
+                previous = None
+                for frame in reply:
+                    if previous is not None:
+                        send_frame(conn, previous, 0)
+                    previous = frame
+                send_frame(conn, previous or b"", FLAG_END)
+        except (OSError, TransportError):
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+            conn.close()
+
+
+# ----------------------------------------------------------------------
+# CLIENT
+# ----------------------------------------------------------------------
+def _is_dropped(sock: socket.socket) -> bool:
+    """True when an idle connection was closed by the peer (or has unread bytes, which it should not)."""
+    timeout = sock.gettimeout()
+    try:
+        sock.setblocking(False)
+        sock.recv(1, socket.MSG_PEEK)
+        return True
+    except BlockingIOError:
+        return False
+    except OSError:
+        return True
+    finally:
+        try:
+            sock.settimeout(timeout)
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    """
+    Pool of persistent client connections to one server.
+
+    Idle connections the peer has closed (server restarted) are dropped
+    before reuse. A request is re-sent only when connecting or sending fails;
+    once it is written, a failed or timed-out read raises TransportError
+    instead, since the peer may already be executing it.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        max_idle: int = 4,
+        timeout: Optional[float] = 30.0,
+        retries: int = 2,
+        backoff: float = 0.05,
+    ):
+        self._family, self._sockaddr = parse_address(address)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._sockaddr)
+        except OSError:
+            sock.close()
+            raise
+        if self._family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connections_opened += 1
+        return sock
+
+    def _acquire(self) -> socket.socket:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                sock = self._idle.pop()
+            if not _is_dropped(sock):
+                return sock
+            sock.close()
+        return self._connect()
+
+    def _release(self, sock: socket.socket):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(sock)
+                return
+        sock.close()
+
+    def request(self, payload: bytes) -> List[bytes]:
+        """Send one request and return its response frames."""
+        return self.pipeline([payload])[0]
+
+    def stream(self, payload: bytes) -> Iterator[bytes]:
+        """
+        Send one request and yield its response frames as they arrive.
+        The request is retried only while no frame has been yielded yet.
+        """
+        sock = self._send_with_retries([payload])
+        try:
+            while True:
+                frame, flags = recv_frame(sock)
+                if frame:
+                    yield frame
+                if flags & FLAG_END:
+                    break
+        except (OSError, ConnectionClosed) as e:
+            sock.close()
+            raise TransportError(f"Stream from {self._sockaddr} failed: {e}") from e
+        except GeneratorExit:
+            # Abandoned mid-response; the connection cannot be reused
+            sock.close()
+            raise
+        self._release(sock)
+
+    def pipeline(self, payloads: List[bytes]) -> List[List[bytes]]:
+        """
+        Write all requests on one connection before reading any response.
+        Returns the response frames of each request, in request order.
+        """
+        if not payloads:
+            return []
+        sock = self._send_with_retries(payloads)
+        try:
+            responses = [_recv_response(sock) for _ in payloads]
+        except (OSError, ConnectionClosed) as e:
+            sock.close()
+            raise TransportError(f"Request to {self._sockaddr} failed: {e}") from e
+        self._release(sock)
+        return responses
+
+    def _send_with_retries(self, payloads: List[bytes]) -> socket.socket:
+        """Writes every request on one connection, retrying connect / send failures; returns the connection."""
+        failures = 0
+        while True:
+            sock = None
+            try:
+                sock = self._acquire()
+                for payload in payloads:
+                    send_frame(sock, payload)
+                return sock
+            except OSError as e:
+                if sock is not None:
+                    sock.close()
+                failures += 1
+                if failures > self.retries:
+                    raise TransportError(f"Cannot send to {self._sockaddr}: {e}") from e
+                time.sleep(self.backoff * failures)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+
+# ----------------------------------------------------------------------
+# AGENT ADAPTERS
+# ----------------------------------------------------------------------
+class SocketTransport:
+    """Outgoing transport for a worker: sends message dicts to a peer server."""
+
+    def __init__(self, address: Address, **pool_options):
+        self.pool = ConnectionPool(address, **pool_options)
+
+    def send(self, recipient: str, message_obj: dict) -> List[bytes]:
+        content_type = message_obj.get("content_type", protocol.CONTENT_TYPE_JSON)
+        return self.pool.request(codec.encode_message(message_obj, content_type))
+
+    def close(self):
+        self.pool.close()
+
+
+class RemoteWorker:
+    """
+    Supervisor-side proxy for a worker served in another process.
+    Exposes the same ``_id``/``handle_incoming_message`` surface the
+    supervisor uses for in-process workers; completion reports are
+    delivered to ``on_report``.
+    """
+
+    def __init__(self, agent_id: str, address: Address, on_report: Optional[Callable[[dict], None]] = None,
+                 **pool_options):
+        self._id = agent_id
+        self.on_report = on_report
+        self.pool = ConnectionPool(address, **pool_options)
+
+    def handle_incoming_message(self, payload: Union[str, bytes]) -> Optional[dict]:
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        report = None
+        for frame in self.pool.stream(payload):
+            report = codec.decode_message(frame)
+            if self.on_report is not None:
+                self.on_report(report)
+        return report
+
+    def close(self):
+        self.pool.close()
+
+
+class _Outbox:
+    """
+    Hands a served worker's outgoing messages to the connection as reply
+    frames. The queue is bounded so a worker streaming a large plan blocks
+    instead of buffering the whole report in memory.
+    """
+
+    def __init__(self, maxsize: int = 8):
+        self.frames: "queue.Queue" = queue.Queue(maxsize)
+
+    def send(self, recipient: str, message_obj: dict):
+        content_type = message_obj.get("content_type", protocol.CONTENT_TYPE_JSON)
+        self.frames.put(codec.encode_message(message_obj, content_type))
+
+
+_DONE = object()
+
+
+def serve_worker(worker, address: Address) -> FramedServer:
+    """
+    Expose a worker agent over a socket. Each request frame is handed to
+    ``worker.handle_incoming_message``; whatever the worker sends back to its
+    supervisor while handling it is streamed back as the response. Requests
+    are handled one at a time since workers keep per-task state.
+    """
+    outbox = _Outbox()
+    worker.transport = outbox
+    lock = threading.Lock()
+
+    def run(payload: bytes):
+        try:
+            worker.handle_incoming_message(payload)
+        finally:
+            outbox.frames.put(_DONE)
+
+    def handler(payload: bytes) -> Iterator[bytes]:
+        with lock:
+            thread = threading.Thread(target=run, args=(payload,), daemon=True)
+            thread.start()
+            frame = None
+            try:
+                while True:
+                    frame = outbox.frames.get()
+                    if frame is _DONE:
+                        break
+                    yield frame
+            finally:
+                # Client went away mid-stream: let the worker finish
+                while frame is not _DONE:
+                    frame = outbox.frames.get()
+                thread.join()
+
+    return FramedServer(address, handler)
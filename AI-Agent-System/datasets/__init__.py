@@ -0,0 +1,17 @@
+"""
+Datasets module for disaster scenarios.
+
+This module holds the sample scenario file, a seeded generator for
+large synthetic scenarios shaped like datasets/disaster_scenarios.json,
+a streaming reader for scenario files too large to load at once, a
+memory-mappable columnar format with converters to and from JSON, and
+chunked, validated CSV zone ingestion.
+"""
+
+from .generator import ScenarioGenerator, write_columnar, write_json, write_jsonl
+from .reader import ScenarioReader
+from .columnar import ColumnarScenario, columnar_to_json, json_to_columnar, load_columnar
+from .csv_ingest import ZoneTable, read_zones_csv
+
+__all__ = ['ScenarioGenerator', 'ScenarioReader', 'ColumnarScenario', 'write_json', 'write_jsonl', 'write_columnar',
+           'load_columnar', 'json_to_columnar', 'columnar_to_json', 'ZoneTable', 'read_zones_csv']
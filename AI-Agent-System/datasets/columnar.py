@@ -0,0 +1,335 @@
+"""
+Columnar Scenario Format
+
+One scenario per directory: schema.json (header, row count, columns) plus
+one file per zone field. Numeric fields are typed .npy columns that load
+memory-mapped, with no parsing and no copy. Other fields (id, name, hazards,
+...) are JSON values, one per line, read only when asked for.
+
+A numeric field missing from some zones is stored as float64, with NaN for
+the missing rows (``"nullable": true``). A field holding both ints and floats
+is stored as float64 plus a bool column ``<field>.int.npy`` marking the rows
+that were ints (``"int_rows"``), so ``2`` comes back as ``2``, not ``2.0``.
+In a JSON column, an empty line means the zone does not have the field and
+``null`` is an explicit null; both read as None through ``scenario[name]``,
+but iter_zones / to_dict keep the difference. A field with explicit nulls is
+always a JSON column.
+
+Converters go both ways between this format and disaster_scenarios.json-shaped
+files. Both stream: ``json_to_columnar`` reads zones through
+datasets.reader.ScenarioReader, once to infer column types and once to write
+them, so neither side is ever held in memory whole.
+
+The allocator consumes a loaded scenario directly as arrays
+(VolunteerAllocator.allocate_columns), without building per-zone dicts.
+
+Usage (from AI-Agent-System/):
+    python -m datasets.columnar to-columnar datasets/disaster_scenarios.json scenarios_cols/
+    python -m datasets.columnar to-json scenarios_cols/scenario_001 --out scenario_001.json
+
+numpy is imported on first use.
+"""
+
+import argparse
+import json
+import math
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .reader import ScenarioReader
+
+FORMAT = "disaster-columnar"
+# 2: int_rows flag columns, empty JSON lines for missing fields
+VERSION = 2
+INTEGER_DTYPES = ("int8", "int16", "int32", "int64")
+
+
+_MISSING = object()
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def infer_columns(zones: Iterable[Dict]) -> Dict[str, Dict]:
+    """
+    Column spec per zone field, in order of first appearance: integers
+    get the smallest integer dtype holding them, other numbers float64 (with
+    an int_rows flag column when ints and floats mix), and anything else (or
+    numbers mixed with other values, null included) a JSON column.
+    """
+    stats: Dict[str, List] = {}  # name -> [present, numeric, integer, low, high, any int]
+    rows = 0
+    for zone in zones:
+        rows += 1
+        for name, value in zone.items():
+            entry = stats.setdefault(name, [0, True, True, 0, 0, False])
+            entry[0] += 1
+            if entry[1] and _is_number(value):
+                if isinstance(value, float):
+                    entry[2] = False
+                else:
+                    entry[5] = True
+                entry[3] = min(entry[3], value)
+                entry[4] = max(entry[4], value)
+            else:
+                entry[1] = False
+
+    columns = {}
+    for name, (present, numeric, integer, low, high, has_int) in stats.items():
+        # Ints beyond 2**53 only survive in an integer dtype
+        exact = not has_int or max(-low, high) <= 2 ** 53
+        if not numeric or (not exact and (present < rows or not integer)):
+            columns[name] = {"dtype": "json"}
+        elif not integer and has_int:
+            columns[name] = {"dtype": "float64", "int_rows": True}
+            if present < rows:
+                columns[name]["nullable"] = True
+        elif present < rows:
+            columns[name] = {"dtype": "float64", "nullable": True, "integer": integer}
+        elif integer:
+            import numpy as np
+            dtype = next((d for d in INTEGER_DTYPES
+                          if np.iinfo(d).min <= low and high <= np.iinfo(d).max), None)
+            columns[name] = {"dtype": dtype} if dtype else {"dtype": "json"}
+        else:
+            columns[name] = {"dtype": "float64"}
+    return columns
+
+
+def write_zones(directory: str, header: Dict, zones: Iterable[Dict], rows: int, columns: Dict[str, Dict],
+                chunk_size: int = 8192, extra: Optional[Dict] = None) -> Dict:
+    """
+    Writes ``rows`` zones as a columnar scenario directory, buffering at
+    most ``chunk_size`` zones. ``columns`` maps field names to specs as
+    from infer_columns; fields not listed are dropped.
+
+    Returns:
+        The schema written to schema.json (``extra`` keys added to it)
+    """
+    import numpy as np
+
+    os.makedirs(directory, exist_ok=True)
+    columns = {name: dict(spec, file=f"{name}.jsonl" if spec["dtype"] == "json" else f"{name}.npy")
+               for name, spec in columns.items()}
+    for name, spec in columns.items():
+        if spec.get("int_rows"):
+            spec["int_file"] = f"{name}.int.npy"
+    numeric = {name: spec for name, spec in columns.items() if spec["dtype"] != "json"}
+    flagged = [name for name, spec in numeric.items() if spec.get("int_rows")]
+    files, flag_files, written = {}, {}, 0
+
+    def open_npy(path, dtype):
+        f = open(path, "wb")
+        np.lib.format.write_array_header_1_0(f, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": (rows,),
+        })
+        return f
+
+    try:
+        for name, spec in columns.items():
+            path = os.path.join(directory, spec["file"])
+            if name in numeric:
+                files[name] = open_npy(path, spec["dtype"])
+            else:
+                files[name] = open(path, "w", encoding="utf-8")
+        for name in flagged:
+            flag_files[name] = open_npy(os.path.join(directory, columns[name]["int_file"]), "bool")
+
+        buffers = {name: [] for name in columns}
+        flags = {name: [] for name in flagged}
+
+        def flush():
+            for name, values in buffers.items():
+                if name in numeric:
+                    np.asarray(values, dtype=numeric[name]["dtype"]).tofile(files[name])
+                else:
+                    # Empty line: the zone does not have the field; "null": it is null
+                    files[name].write("".join(("" if v is _MISSING else json.dumps(v)) + "\n" for v in values))
+                values.clear()
+            for name, values in flags.items():
+                np.asarray(values, dtype=bool).tofile(flag_files[name])
+                values.clear()
+
+        for zone in zones:
+            for name, values in buffers.items():
+                value = zone.get(name, _MISSING)
+                if name in numeric:
+                    value = math.nan if value is _MISSING else value
+                values.append(value)
+            for name, values in flags.items():
+                values.append(type(zone.get(name)) is int)
+            written += 1
+            if written % chunk_size == 0:
+                flush()
+        flush()
+    finally:
+        for f in (*files.values(), *flag_files.values()):
+            f.close()
+    if written != rows:
+        raise ValueError(f"Expected {rows} zones, got {written}")
+
+    schema = {"format": FORMAT, "version": VERSION, "rows": rows, "scenario": header, "columns": columns,
+              **(extra or {})}
+    with open(os.path.join(directory, "schema.json"), "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+    return schema
+
+
+class ColumnarScenario:
+    """
+    A columnar scenario directory. ``scenario[name]`` is a numpy array for
+    numeric fields (memory-mapped unless mmap=False) and a list of JSON
+    values otherwise; columns load on first access.
+    """
+
+    def __init__(self, directory: str, mmap: bool = True):
+        with open(os.path.join(directory, "schema.json"), encoding="utf-8") as f:
+            schema = json.load(f)
+        if schema.get("format") != FORMAT:
+            raise ValueError(f"{directory} is not a {FORMAT} directory")
+        if schema.get("version", 1) > VERSION:
+            raise ValueError(f"{directory} is format version {schema['version']}; this reader knows up to {VERSION}")
+        self.directory = directory
+        self.mmap = mmap
+        self.schema = schema
+        self.header: Dict = schema["scenario"]
+        self.rows: int = schema["rows"]
+        self.columns: Dict[str, Dict] = schema["columns"]
+        self._loaded: Dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str):
+        if name not in self._loaded:
+            spec = self.columns[name]
+            path = os.path.join(self.directory, spec["file"])
+            if spec["dtype"] == "json":
+                with open(path, encoding="utf-8") as f:
+                    self._loaded[name] = [json.loads(line) if line.strip() else None for line in f]
+            else:
+                import numpy as np
+                # An empty column cannot be mapped
+                self._loaded[name] = np.load(path, mmap_mode="r" if self.mmap and self.rows else None)
+        return self._loaded[name]
+
+    def numeric_columns(self) -> List[str]:
+        return [name for name, spec in self.columns.items() if spec["dtype"] != "json"]
+
+    def iter_zones(self, chunk_size: int = 8192) -> Iterator[Dict]:
+        """Zones rebuilt as dicts (fields in column order), reading ``chunk_size`` rows at a time."""
+        import numpy as np
+
+        text = {name: open(os.path.join(self.directory, spec["file"]), encoding="utf-8")
+                for name, spec in self.columns.items() if spec["dtype"] == "json"}
+        try:
+            for start in range(0, self.rows, chunk_size):
+                stop = min(start + chunk_size, self.rows)
+                values = {}
+                for name, spec in self.columns.items():
+                    if name in text:
+                        lines = (text[name].readline() for _ in range(start, stop))
+                        values[name] = [json.loads(line) if line.strip() else _MISSING for line in lines]
+                        continue
+                    chunk = np.asarray(self[name][start:stop]).tolist()
+                    if spec.get("int_rows"):
+                        ints = self._int_rows(name)[start:stop].tolist()
+                        chunk = [int(v) if is_int else v for v, is_int in zip(chunk, ints)]
+                    elif spec.get("integer"):
+                        chunk = [v if math.isnan(v) else int(v) for v in chunk]
+                    if spec.get("nullable"):
+                        chunk = [_MISSING if isinstance(v, float) and math.isnan(v) else v for v in chunk]
+                    values[name] = chunk
+                for row in zip(*values.values()):
+                    yield {name: value for name, value in zip(values, row) if value is not _MISSING}
+        finally:
+            for f in text.values():
+                f.close()
+
+    def _int_rows(self, name: str):
+        """Bool column: rows of a mixed int/float field that hold ints."""
+        key = name + ".int"
+        if key not in self._loaded:
+            import numpy as np
+            path = os.path.join(self.directory, self.columns[name]["int_file"])
+            self._loaded[key] = np.load(path, mmap_mode="r" if self.mmap and self.rows else None)
+        return self._loaded[key]
+
+    def to_dict(self) -> Dict:
+        """The full scenario, as in disaster_scenarios.json."""
+        return {**self.header, "zones": list(self.iter_zones())}
+
+
+def load_columnar(directory: str, mmap: bool = True) -> ColumnarScenario:
+    """Opens a columnar scenario directory (no column is read until used)."""
+    return ColumnarScenario(directory, mmap)
+
+
+def json_to_columnar(source: str, directory: str, scenarios: Optional[List[Union[str, int]]] = None,
+                     chunk_size: int = 8192) -> List[str]:
+    """
+    Converts scenarios of a JSON / JSONL scenario file (all by default; else
+    the given scenario_ids or positions) into ``directory/<scenario_id>``.
+
+    Returns:
+        The scenario directories written, in order
+    """
+    reader = ScenarioReader(source, chunk_size=chunk_size)
+    keys = scenarios if scenarios is not None else list(range(len(reader)))
+    written = []
+    for key in keys:
+        header, rows = reader.header(key), reader.zone_count(key)
+        target = os.path.join(directory, str(header.get("scenario_id") or key))
+        columns = infer_columns(reader.iter_zones(key))
+        extra = {"metadata": reader.metadata} if reader.metadata is not None else None
+        write_zones(target, header, reader.iter_zones(key), rows, columns, chunk_size, extra)
+        written.append(target)
+    return written
+
+
+def columnar_to_json(directories: List[str], path: str):
+    """
+    Writes columnar scenario directories as one disaster_scenarios.json-shaped
+    file, streaming zones (metadata from the first directory that has any).
+    """
+    metadata = None
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"scenarios": [')
+        for s, directory in enumerate(directories):
+            scenario = ColumnarScenario(directory)
+            metadata = metadata if metadata is not None else scenario.schema.get("metadata")
+            header = json.dumps(scenario.header)
+            f.write(("," if s else "") + "\n" + (header[:-1] + ", " if scenario.header else "{") + '"zones": [')
+            for i, zone in enumerate(scenario.iter_zones()):
+                f.write(("," if i else "") + "\n" + json.dumps(zone))
+            f.write("\n]}")
+        f.write("\n]" + (', "metadata": ' + json.dumps(metadata) if metadata is not None else "") + "}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert scenarios between JSON and the columnar format")
+    commands = parser.add_subparsers(dest="command", required=True)
+    to_columnar = commands.add_parser("to-columnar", help="JSON / JSONL scenario file -> one directory per scenario")
+    to_columnar.add_argument("source")
+    to_columnar.add_argument("directory")
+    to_columnar.add_argument("--scenario", action="append", help="scenario_id to convert (repeatable; default all)")
+    to_json = commands.add_parser("to-json", help="columnar scenario directories -> one JSON file")
+    to_json.add_argument("directories", nargs="+")
+    to_json.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "to-columnar":
+        for directory in json_to_columnar(args.source, args.directory, args.scenario):
+            print(directory)
+    else:
+        columnar_to_json(args.directories, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+CSV Zone Ingestion
+
+Reads zone tables from CSV in chunks (pandas), validates each chunk with
+column-wide checks, and keeps the valid rows as numpy columns that
+VolunteerAllocator.allocate_columns solves directly, without per-zone dicts.
+
+Checks:
+- required columns: ``id`` (or ``zone`` / ``zone_id``) and ``severity``;
+  a file without them is rejected outright (ValueError)
+- per row: id present and not repeated, numeric fields parse as numbers,
+  severity present and within ``severity_range`` (default SEVERITY_RANGE,
+  the allocator's documented 1-10 scale; None skips it), capacity /
+  required_volunteers / resources_available not negative,
+  min_resources_per_volunteer positive
+
+A row failing any check is left out, and each failure is reported with its
+data row number (1 = the first row after the header), column, raw value and
+reason. Empty optional cells mean "field not given", as a missing key does
+for dict zones.
+
+Usage:
+    table = read_zones_csv("zones.csv")
+    table.errors          # [{row, column, value, error}, ...]
+    VolunteerAllocator().allocate_columns(table, 5000)   # a CSV carries no budget
+
+    # Severities on another scale (sample_data.csv goes up to 20)
+    read_zones_csv("sample_data.csv", severity_range=(1, 20))
+
+pandas and numpy are imported on first use.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SEVERITY_RANGE = (1, 10)
+ALIASES = {"zone": "id", "zone_id": "id"}
+REQUIRED_COLUMNS = ("id", "severity")
+NUMERIC_COLUMNS = ("severity", "required_volunteers", "capacity", "resources_available",
+                   "min_resources_per_volunteer", "latitude", "longitude", "estimated_victims")
+NON_NEGATIVE_COLUMNS = ("required_volunteers", "capacity", "resources_available")
+# Errors kept per table (all are counted)
+MAX_ERRORS = 1000
+
+
+def _header(path: str) -> Dict[str, str]:
+    """File column name -> zone field, for the columns this module reads."""
+    import pandas as pd
+
+    fields = {}
+    for name in pd.read_csv(path, nrows=0, skipinitialspace=True).columns:
+        field = ALIASES.get(name.strip().lower(), name.strip().lower())
+        if field in ("id",) + NUMERIC_COLUMNS and field not in fields.values():
+            fields[name] = field
+    missing = [field for field in REQUIRED_COLUMNS if field not in fields.values()]
+    if missing:
+        raise ValueError(f"{path} is missing required column(s): {', '.join(missing)}")
+    return fields
+
+
+def _checks(raw, values: Dict, severity_range: Optional[Tuple[float, float]]) -> List[Tuple[str, object, str]]:
+    """(column, bad-row mask, reason) for one chunk; ``raw`` holds the cells as read."""
+    checks = []
+    for field, parsed in values.items():
+        # Text in a numeric column: parses to NaN although the cell was not empty
+        checks.append((field, parsed.isna() & raw[field].notna(), "not a number"))
+    severity = values["severity"]
+    checks.append(("severity", raw["severity"].isna(), "missing"))
+    if severity_range is not None:
+        low, high = severity_range
+        checks.append(("severity", (severity < low) | (severity > high), f"outside {low}-{high}"))
+    for field in NON_NEGATIVE_COLUMNS:
+        if field in values:
+            checks.append((field, values[field] < 0, "negative"))
+    if "min_resources_per_volunteer" in values:
+        checks.append(("min_resources_per_volunteer", values["min_resources_per_volunteer"] <= 0, "not positive"))
+    return checks
+
+
+def iter_zone_chunks(path: str, chunk_size: int = 50000,
+                     severity_range: Optional[Tuple[float, float]] = SEVERITY_RANGE) -> Iterator[Tuple[Dict, List[Dict]]]:
+    """
+    Yields (columns, errors) per chunk of ``chunk_size`` rows: the valid rows
+    as numpy arrays ({"id": object array, numeric fields: float64 with NaN
+    for empty cells}) and the chunk's row errors. Ids are checked for
+    repeats across chunks.
+    """
+    import numpy as np
+    import pandas as pd
+
+    fields = _header(path)
+    id_column = next(name for name, field in fields.items() if field == "id")
+    seen = set()
+    start = 0
+    for chunk in pd.read_csv(path, usecols=list(fields), dtype={id_column: str}, chunksize=chunk_size,
+                             skipinitialspace=True):
+        raw = chunk.rename(columns=fields)
+        values = {field: pd.to_numeric(raw[field], errors="coerce") for field in fields.values() if field != "id"}
+        ids = raw["id"].str.strip()
+        id_values = ids.to_numpy(dtype=object)
+        # Set lookups cost O(chunk); Series.isin(seen) would convert all earlier ids every chunk
+        earlier = pd.Series([value in seen for value in id_values], index=ids.index, dtype=bool)
+        repeated = ids.duplicated() | earlier
+        checks = [("id", ids.isna() | (ids == ""), "missing"), ("id", repeated & ids.notna(), "duplicate")]
+        checks += _checks(raw, values, severity_range)
+
+        bad = np.zeros(len(raw), dtype=bool)
+        errors = []
+        for field, mask, reason in checks:
+            mask = mask.to_numpy(dtype=bool)
+            bad |= mask
+            for i in np.flatnonzero(mask):
+                cell = raw[field].iloc[i]
+                errors.append({"row": start + int(i) + 1, "column": field,
+                               "value": None if pd.isna(cell) else str(cell), "error": reason})
+        errors.sort(key=lambda error: error["row"])
+
+        good = ~bad
+        columns = {"id": id_values[good]}
+        seen.update(columns["id"])
+        columns.update({field: parsed.to_numpy(dtype=float)[good] for field, parsed in values.items()})
+        start += len(raw)
+        yield columns, errors
+
+
+class ZoneTable:
+    """
+    Valid zones of a CSV file as numpy columns (``table[field]``), plus
+    row errors. Passes to VolunteerAllocator.allocate_columns as is.
+    """
+
+    def __init__(self, columns: Dict, errors: List[Dict], rows_read: int, error_counts: Dict[str, int]):
+        self.columns = columns
+        self.errors = errors
+        self.rows_read = rows_read
+        self.error_counts = error_counts  # "column: reason" -> count, also past MAX_ERRORS
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    @property
+    def rows_rejected(self) -> int:
+        return self.rows_read - len(self)
+
+    def report(self) -> Dict:
+        """Ingestion summary: rows read / valid / rejected, error counts by column and reason."""
+        error_count = sum(self.error_counts.values())
+        return {"rows_read": self.rows_read, "rows_valid": len(self), "rows_rejected": self.rows_rejected,
+                "error_count": error_count, "errors_by_kind": dict(self.error_counts),
+                "errors_truncated": error_count > len(self.errors)}
+
+
+def read_zones_csv(path: str, chunk_size: int = 50000, max_errors: Optional[int] = MAX_ERRORS,
+                   severity_range: Optional[Tuple[float, float]] = SEVERITY_RANGE) -> ZoneTable:
+    """
+    Reads and validates a zone CSV chunk by chunk (see iter_zone_chunks).
+
+    Args:
+        max_errors: Row errors kept in ``errors`` (None: all)
+        severity_range: Inclusive (low, high) for severity; None accepts any number
+    """
+    import numpy as np
+
+    parts: Dict[str, List] = {}
+    errors, error_counts, rows_read = [], {}, 0
+    for columns, chunk_errors in iter_zone_chunks(path, chunk_size, severity_range):
+        for field, values in columns.items():
+            parts.setdefault(field, []).append(values)
+        for error in chunk_errors:
+            kind = f"{error['column']}: {error['error']}"
+            error_counts[kind] = error_counts.get(kind, 0) + 1
+        rows_read += len(columns["id"]) + len({error["row"] for error in chunk_errors})
+        if max_errors is None or len(errors) < max_errors:
+            errors.extend(chunk_errors[:None if max_errors is None else max_errors - len(errors)])
+    columns = {field: np.concatenate(values) for field, values in parts.items()}
+    if not columns:  # header only
+        columns = {field: np.empty(0, dtype=object if field == "id" else float) for field in _header(path).values()}
+    return ZoneTable(columns, errors, rows_read, error_counts)
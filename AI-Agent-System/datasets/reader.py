@@ -0,0 +1,337 @@
+"""
+Streaming Scenario Reader
+
+Reads scenario files of any size (disaster_scenarios.json-shaped JSON, or the
+generator's JSONL records) one scenario or one chunk of zones at a time,
+without loading the file.
+
+The first read scans the file once and writes a side index next to it
+(``<file>.index.json``): each scenario's byte offset, zone count and header
+(every field but ``zones``). After that, headers come from the index and
+a scenario is read by seeking straight to it, by ``scenario_id`` or position.
+The index records the file's size and modification time and is rebuilt when
+either changes. If it cannot be written (read-only directory), it is kept in
+memory for the reader's lifetime.
+
+Memory is bounded by one chunk of zones (``chunk_size``) plus one read block,
+unless a whole scenario is asked for.
+
+Usage (from AI-Agent-System/):
+    reader = ScenarioReader("datasets/disaster_scenarios.json")
+    for zones in reader.zone_chunks("scenario_001"):
+        ...
+    scenario = reader.scenario(0)  # full scenario dict, as from json.load
+"""
+
+import codecs
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Union
+
+INDEX_VERSION = 1
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _byte_length(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+class _JsonStream:
+    """Pull parser over a binary file: whole values via raw_decode, containers by hand."""
+
+    def __init__(self, f, block_size: int):
+        self.f = f
+        self.block_size = block_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.offset = f.tell()  # byte offset of buffer[0]
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(self.block_size)
+        self.eof = not data
+        self.offset += _byte_length(self.buffer[:self.pos])
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(data, final=self.eof)
+        self.pos = 0
+        return not self.eof
+
+    def tell(self) -> int:
+        """Byte offset of the next unread character."""
+        return self.offset + _byte_length(self.buffer[:self.pos])
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of scenario file")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at byte {self.tell()}, found {self.buffer[self.pos]!r}")
+        self.pos += 1
+
+    def next_item(self, close: str) -> bool:
+        """After an item of an array / object: True if another follows."""
+        char = self.peek()
+        self.pos += 1
+        if char == ",":
+            return True
+        if char != close:
+            raise ValueError(f"Expected ',' or {close!r} at byte {self.tell() - 1}, found {char!r}")
+        return False
+
+    def empty(self, close: str) -> bool:
+        """Right after an opening bracket: True (and consumed) if the container is empty."""
+        if self.peek() == close:
+            self.pos += 1
+            return True
+        return False
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self.buffer) and self._fill():
+                continue  # a number may go on in the next block
+            self.pos = end
+            return value
+
+    def key(self) -> str:
+        key = self.value()
+        self.expect(":")
+        return key
+
+
+def _json_scenario(stream: _JsonStream, chunk_size: int):
+    """Generator over one scenario object's zone chunks; returns (header, zone count)."""
+    header, count = {}, 0
+    stream.expect("{")
+    if stream.empty("}"):
+        return header, count
+    while True:
+        key = stream.key()
+        if key == "zones":
+            stream.expect("[")
+            if not stream.empty("]"):
+                chunk = []
+                while True:
+                    chunk.append(stream.value())
+                    if len(chunk) >= chunk_size:
+                        count += len(chunk)
+                        yield chunk
+                        chunk = []
+                    if not stream.next_item("]"):
+                        break
+                if chunk:
+                    count += len(chunk)
+                    yield chunk
+        else:
+            header[key] = stream.value()
+        if not stream.next_item("}"):
+            return header, count
+
+
+def _jsonl_scenario(f, chunk_size: int):
+    """Generator over the zone records after a scenario record; returns (header, zone count)."""
+    header = json.loads(f.readline())
+    header.pop("record", None)
+    count, chunk = 0, []
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line.strip():
+            if not line:
+                break
+            continue
+        record = json.loads(line)
+        if record.pop("record", "zone") != "zone":
+            f.seek(position)  # the next scenario
+            break
+        record.pop("scenario_id", None)
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            count += len(chunk)
+            yield chunk
+            chunk = []
+    if chunk:
+        count += len(chunk)
+        yield chunk
+    return header, count
+
+
+def _drain(scenario) -> tuple:
+    """Runs a scenario generator to its end, dropping the zones."""
+    while True:
+        try:
+            next(scenario)
+        except StopIteration as stop:
+            return stop.value
+
+
+class ScenarioReader:
+    """
+    Scenarios of one file, read on demand.
+
+    Scenarios are addressed by ``scenario_id`` or by position (int).
+    """
+
+    def __init__(self, path: str, chunk_size: int = 10000, index_path: Optional[str] = None,
+                 block_size: int = 1 << 20):
+        """
+        Args:
+            path: Scenario file; ``.jsonl`` files are read as generator
+                records, anything else as disaster_scenarios.json-shaped JSON
+            chunk_size: Most zones held at once by zone_chunks
+            index_path: Side index (default ``<path>.index.json``)
+            block_size: Bytes read from the file at a time
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.index_path = index_path or path + ".index.json"
+        self.block_size = block_size
+        self.jsonl = path.endswith(".jsonl")
+        self._index: Optional[Dict] = None
+        self.index_built = False  # True when this reader scanned the file
+
+    # ------------------------------------------------------------------
+    # INDEX
+    # ------------------------------------------------------------------
+    def _source(self) -> Dict:
+        stat = os.stat(self.path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @property
+    def index(self) -> Dict:
+        """The side index, loaded or built on first use."""
+        source = self._source()
+        if self._index is not None and self._index["source"] == source:
+            return self._index
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and index.get("source") == source:
+                self._index = index
+                return index
+        except (OSError, ValueError):
+            pass
+        self._index = self._build_index(source)
+        try:
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+        except OSError:
+            pass  # read-only location: keep the index in memory
+        return self._index
+
+    def _build_index(self, source: Dict) -> Dict:
+        """One streaming pass over the file."""
+        entries, metadata = [], None
+        with open(self.path, "rb") as f:
+            if self.jsonl:
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    if not line.strip():
+                        continue
+                    f.seek(offset)
+                    header, count = _drain(_jsonl_scenario(f, self.chunk_size))
+                    entries.append(self._entry(header, offset, count))
+            else:
+                stream = _JsonStream(f, self.block_size)
+                stream.expect("{")
+                while not stream.empty("}"):
+                    key = stream.key()
+                    if key == "scenarios":
+                        stream.expect("[")
+                        if not stream.empty("]"):
+                            while True:
+                                offset = stream.tell()
+                                header, count = _drain(_json_scenario(stream, self.chunk_size))
+                                entries.append(self._entry(header, offset, count))
+                                if not stream.next_item("]"):
+                                    break
+                    else:
+                        value = stream.value()
+                        if key == "metadata":
+                            metadata = value
+                    if not stream.next_item("}"):
+                        break
+        self.index_built = True
+        return {"version": INDEX_VERSION, "source": source, "scenarios": entries, "metadata": metadata}
+
+    @staticmethod
+    def _entry(header: Dict, offset: int, count: int) -> Dict:
+        return {"scenario_id": header.get("scenario_id"), "offset": offset, "zone_count": count,
+                "header": header}
+
+    def _locate(self, key: Union[str, int]) -> Dict:
+        entries = self.index["scenarios"]
+        if isinstance(key, int):
+            if not -len(entries) <= key < len(entries):
+                raise KeyError(f"No scenario at position {key} ({len(entries)} scenarios)")
+            return entries[key]
+        for entry in entries:
+            if entry["scenario_id"] == key:
+                return entry
+        raise KeyError(f"Unknown scenario_id {key!r}")
+
+    # ------------------------------------------------------------------
+    # ACCESS
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.index["scenarios"])
+
+    def ids(self) -> List[Optional[str]]:
+        return [entry["scenario_id"] for entry in self.index["scenarios"]]
+
+    @property
+    def metadata(self) -> Optional[Dict]:
+        """The file's top-level ``metadata`` (JSON files only)."""
+        return self.index["metadata"]
+
+    def header(self, key: Union[str, int]) -> Dict:
+        """Scenario fields other than ``zones``, without reading the file."""
+        return dict(self._locate(key)["header"])
+
+    def zone_count(self, key: Union[str, int]) -> int:
+        """Number of zones in the scenario, without reading the file."""
+        return self._locate(key)["zone_count"]
+
+    def zone_chunks(self, key: Union[str, int]) -> Iterator[List[Dict]]:
+        """Yields the scenario's zones in lists of at most ``chunk_size``."""
+        entry = self._locate(key)
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            if self.jsonl:
+                yield from _jsonl_scenario(f, self.chunk_size)
+            else:
+                yield from _json_scenario(_JsonStream(f, self.block_size), self.chunk_size)
+
+    def iter_zones(self, key: Union[str, int]) -> Iterator[Dict]:
+        """Yields the scenario's zones one at a time."""
+        for chunk in self.zone_chunks(key):
+            yield from chunk
+
+    def scenario(self, key: Union[str, int]) -> Dict:
+        """One full scenario (header and zone list), as json.load would give it."""
+        entry = self._locate(key)
+        zones = [zone for chunk in self.zone_chunks(key) for zone in chunk]
+        return {**entry["header"], "zones": zones}
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Full scenarios, one at a time."""
+        for position in range(len(self)):
+            yield self.scenario(position)
@@ -0,0 +1,11 @@
+"""
+Monitoring module for the agent runtime.
+
+This module provides low-overhead metrics (counters, gauges and histograms)
+with JSON and Prometheus text exporters, and end-to-end trace spans.
+"""
+
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry
+from . import tracing
+
+__all__ = ['Counter', 'Gauge', 'Histogram', 'MetricsRegistry', 'tracing']
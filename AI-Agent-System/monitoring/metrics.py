@@ -0,0 +1,259 @@
+"""
+Runtime Metrics
+
+Low-overhead counters, gauges and log-bucketed histograms for the agent
+runtime, exportable as JSON or Prometheus text format to a local file or a
+local HTTP endpoint.
+
+Histograms use fixed geometric buckets, so recording is a bisect plus an
+increment and memory does not grow with the number of observations.
+Quantiles are reported as the upper bound of the containing bucket (relative
+error bounded by the bucket growth factor, 5% by default).
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+
+class Histogram:
+    """
+    Geometric-bucket histogram. Buckets span [min_value, max_value] with
+    each bound ``growth`` times the previous one; values outside the range
+    land in the first or overflow bucket.
+    """
+
+    def __init__(self, min_value: float = 1e-6, max_value: float = 1e4, growth: float = 1.05):
+        bounds = []
+        bound = min_value
+        while bound < max_value:
+            bounds.append(bound)
+            bound *= growth
+        bounds.append(max_value)
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 when empty)."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self._counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                upper = self._bounds[index] if index < len(self._bounds) else self.max
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        result = {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+        }
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}"] = round(self.quantile(q), 6)
+        return result
+
+
+class MetricsRegistry:
+    """Named, labelled metric series with JSON and Prometheus exporters."""
+
+    def __init__(self):
+        self._series: Dict[str, Dict[LabelKey, object]] = {}
+        self._types: Dict[str, str] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._server = None  # http.server.ThreadingHTTPServer while serving
+        self._collectors: List[Callable[[], None]] = []
+
+    def _get(self, kind: str, factory, name: str, help_text: str, labels: Dict[str, object]):
+        key = _label_key(labels)
+        series = self._series.get(name)
+        if series is not None:
+            metric = series.get(key)
+            if metric is not None:
+                return metric
+        with self._lock:
+            if self._types.setdefault(name, kind) != kind:
+                raise ValueError(f"Metric {name!r} already registered as {self._types[name]}")
+            if help_text:
+                self._help.setdefault(name, help_text)
+            series = self._series.setdefault(name, {})
+            return series.setdefault(key, factory())
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._get("counter", Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str = "", **labels) -> Gauge:
+        return self._get("gauge", Gauge, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = "", **labels) -> Histogram:
+        return self._get("summary", Histogram, name, help_text, labels)
+
+    def add_collector(self, callback: Callable[[], None]):
+        """Registers a callback run before every export, e.g. to refresh derived gauges."""
+        self._collectors.append(callback)
+
+    def series(self, name: str) -> List[Tuple[Dict[str, str], object]]:
+        """All (labels, metric) pairs registered under ``name``."""
+        return [(dict(key), metric) for key, metric in list(self._series.get(name, {}).items())]
+
+    # ------------------------------------------------------------------
+    # EXPORT
+    # ------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """JSON-serializable view of every series."""
+        self._collect()
+        result = {}
+        for name in sorted(self._series):
+            entries = []
+            for labels, metric in self.series(name):
+                if isinstance(metric, Histogram):
+                    entries.append({"labels": labels, **metric.summary()})
+                else:
+                    entries.append({"labels": labels, "value": metric.value})
+            result[name] = entries
+        return result
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (histograms exported as summaries)."""
+        self._collect()
+        lines = []
+        for name in sorted(self._series):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {self._types[name]}")
+            for labels, metric in self.series(name):
+                if isinstance(metric, Histogram):
+                    for q in QUANTILES:
+                        lines.append(f"{name}{_format_labels(labels, quantile=q)} {metric.quantile(q):.6g}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {metric.sum:.6g}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {metric.value:.6g}")
+        return "\n".join(lines) + "\n"
+
+    def _collect(self):
+        for callback in self._collectors:
+            callback()
+
+    def export(self, path: str, fmt: str = "json"):
+        """Atomically write the metrics to ``path`` as "json" or "prometheus"."""
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9100) -> Tuple[str, int]:
+        """
+        Serve /metrics (Prometheus) and /metrics.json on a local HTTP endpoint
+        from a background thread. Returns the bound (host, port).
+        """
+        # Imported here: http.server is a large import most processes never need
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = registry.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[:2]
+
+    def stop_serving(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _format_labels(labels: Dict[str, str], **extra) -> str:
+    items = list(labels.items()) + [(k, str(v)) for k, v in extra.items()]
+    if not items:
+        return ""
+    pairs = (f'{k}="{_escape(v)}"' for k, v in items)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,263 @@
+"""
+End-to-End Tracing
+
+Lightweight spans for following one task through the supervisor, the
+message codec, the worker, its LTM and the optimizer. A trace id (and the
+id of the span that sent it) travels in ``Message`` so a worker, in this
+process or another, continues the supervisor's trace.
+
+Tracing is off until ``configure(path)`` is called or AGENT_TRACE_FILE is
+set; while off, ``span()`` returns a shared no-op context manager. Finished
+spans are appended to a JSONL file, one span per line:
+
+    {"trace_id", "span_id", "parent_id", "name", "start", "duration", "attrs", "pid"}
+
+``summarize`` (or ``python -m monitoring.tracing trace.jsonl``) prints a
+flame-style breakdown of each task.
+"""
+
+import argparse
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# perf_counter() + this offset = Unix time; spans time with perf_counter
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+_context: contextvars.ContextVar = contextvars.ContextVar("trace_context", default=(None, None))
+_exporter = None
+
+
+def _new_id(nbytes: int = 8) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class JsonlExporter:
+    """Appends finished spans to a JSONL file (safe across threads)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict):
+        line = json.dumps(span, default=str) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def configure(path: Optional[str] = None, exporter=None):
+    """Enables tracing to a JSONL file (or any object with export(span)); no arguments disables it."""
+    global _exporter
+    _exporter = exporter if exporter is not None else (JsonlExporter(path) if path else None)
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def current_context() -> Tuple[Optional[str], Optional[str]]:
+    """(trace_id, span_id) of the active span, or (None, None)."""
+    return _context.get()
+
+
+class Span:
+    """An open span; ``set(**attrs)`` adds attributes before it ends."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "attrs")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attrs: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.start = time.perf_counter()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _SpanScope:
+    """Context manager that activates a span and exports it on exit."""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _context.set((self.span.trace_id, self.span.span_id))
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _context.reset(self._token)
+        if exc_type is not None:
+            self.span.attrs["error"] = repr(exc)
+        _emit(self.span, time.perf_counter() - self.span.start)
+        return False
+
+
+def span(name: str, started_at: Optional[float] = None, **attrs):
+    """
+    Opens a span as a child of the active one (or as the root of a new
+    trace). Use as ``with span("ltm.read"):``. ``started_at`` (a
+    perf_counter() value) backdates the start, e.g. to include work done
+    before the trace context was known.
+    """
+    if _exporter is None:
+        return _NOOP
+    trace_id, parent_id = _context.get()
+    opened = Span(name, trace_id or _new_id(16), parent_id, attrs)
+    if started_at is not None:
+        opened.start = started_at
+    return _SpanScope(opened)
+
+
+@contextmanager
+def use_context(trace_id: Optional[str], parent_id: Optional[str]):
+    """Continues a trace received in a message (no-op when the message had none)."""
+    if trace_id is None:
+        yield
+        return
+    token = _context.set((trace_id, parent_id))
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def record_span(name: str, start: float, duration: float, **attrs):
+    """Records an already-finished child of the active span; ``start`` is a perf_counter() value."""
+    if _exporter is None:
+        return
+    trace_id, parent_id = _context.get()
+    if trace_id is None:
+        return
+    finished = Span(name, trace_id, parent_id, attrs)
+    finished.start = start
+    _emit(finished, duration)
+
+
+def record_phases(phases: Dict[str, float], start: float, prefix: str = ""):
+    """Records consecutive phases (name -> seconds) starting at ``start`` as child spans."""
+    if _exporter is None:
+        return
+    for name, seconds in phases.items():
+        record_span(prefix + name, start, seconds)
+        start += seconds
+
+
+def _emit(finished: Span, duration: float):
+    exporter = _exporter
+    if exporter is None:
+        return
+    exporter.export({
+        "trace_id": finished.trace_id,
+        "span_id": finished.span_id,
+        "parent_id": finished.parent_id,
+        "name": finished.name,
+        "start": round(finished.start + _EPOCH_OFFSET, 6),
+        "duration": round(duration, 6),
+        "attrs": finished.attrs,
+        "pid": os.getpid(),
+    })
+
+
+if os.environ.get("AGENT_TRACE_FILE"):
+    configure(os.environ["AGENT_TRACE_FILE"])
+
+
+# ----------------------------------------------------------------------
+# SUMMARIZER
+# ----------------------------------------------------------------------
+def load_spans(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(spans: Iterable[Dict], trace_id: Optional[str] = None, width: int = 30) -> str:
+    """
+    Flame-style text breakdown per trace: each span indented under its
+    parent with total time, self time (not covered by children) and a bar
+    proportional to its share of the trace, followed by self time
+    aggregated by span name.
+    """
+    traces: Dict[str, List[Dict]] = defaultdict(list)
+    for s in spans:
+        if trace_id is None or s["trace_id"] == trace_id:
+            traces[s["trace_id"]].append(s)
+
+    lines = []
+    for tid, members in traces.items():
+        ids = {s["span_id"] for s in members}
+        children: Dict[Optional[str], List[Dict]] = defaultdict(list)
+        for s in members:
+            children[s["parent_id"] if s["parent_id"] in ids else None].append(s)
+        for group in children.values():
+            group.sort(key=lambda s: s["start"])
+
+        roots = children[None]
+        total = sum(s["duration"] for s in roots) or 1e-12
+        lines.append(f"Trace {tid} ({', '.join(s['name'] for s in roots)}) {1000 * total:.2f} ms")
+        lines.append(f"   {'Span':<44} {'Total':>10} {'Self':>10} {'%':>6}")
+        by_name: Dict[str, float] = defaultdict(float)
+
+        def walk(node, depth):
+            child_time = sum(c["duration"] for c in children[node["span_id"]])
+            own = max(0.0, node["duration"] - child_time)
+            by_name[node["name"]] += own
+            share = node["duration"] / total
+            label = ("  " * depth + node["name"])[:44]
+            bar = "█" * max(1, int(round(share * width))) if share > 0 else ""
+            lines.append(f"   {label:<44} {1000 * node['duration']:>8.2f}ms {1000 * own:>8.2f}ms "
+                         f"{100 * share:>5.1f}% {bar}")
+            for child in children[node["span_id"]]:
+                walk(child, depth + 1)
+
+        for root in roots:
+            walk(root, 0)
+
+        lines.append("   Self time by span:")
+        for name, own in sorted(by_name.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"      {name:<41} {1000 * own:>8.2f}ms {100 * own / total:>5.1f}%")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a JSONL trace file")
+    parser.add_argument("path")
+    parser.add_argument("--trace-id", default=None, help="only this trace")
+    parser.add_argument("--last", type=int, default=None, help="only the last N traces")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.path)
+    if args.last:
+        order = list(dict.fromkeys(s["trace_id"] for s in sorted(spans, key=lambda s: s["start"])))
+        keep = set(order[-args.last:])
+        spans = [s for s in spans if s["trace_id"] in keep]
+    print(summarize(spans, args.trace_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,22 @@ Optimization module for disaster resource allocation.
 
 This module provides mathematical optimization models using linear/integer programming
 to allocate volunteers and resources across disaster zones optimally.
+
+Submodules load on first use, so importing the package (or only
+optimization.profiling) does not pull in the allocator.
 """
 
-from .volunteer_allocator import VolunteerAllocator
+import importlib
+
+__all__ = ['VolunteerAllocator', 'budget_curve', 'depots', 'fairness', 'hierarchical', 'multiperiod', 'profiling',
+           'proximity', 'roster', 'scenarios', 'sensitivity', 'separable', 'strategy', 'team_assignment']
+
 
-__all__ = ['VolunteerAllocator']
+def __getattr__(name):
+    if name == 'VolunteerAllocator':
+        from .volunteer_allocator import VolunteerAllocator
+        return VolunteerAllocator
+    if name in ('budget_curve', 'depots', 'fairness', 'hierarchical', 'multiperiod', 'profiling', 'proximity',
+                'roster', 'scenarios', 'sensitivity', 'separable', 'strategy', 'team_assignment'):
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,124 @@
+"""
+Budget Curve
+
+The allocator's optimal objective for every volunteer budget at once. With
+zone bounds that do not depend on the budget, the separable model's optimum
+(see optimization.separable) gives every zone its lower bound and then fills
+zones in descending severity, so growing the budget fills the same zones in
+the same order. The objective is therefore piecewise linear and concave in
+the budget: one segment per zone, with the zone's severity as its slope.
+
+One stable sort (O(n log n)) builds the curve; the objective, marginal value
+and partly filled zone for any budget are then found by bisection
+(O(log n)), as is a single zone's allocation.
+
+Fairness minimums grow with the budget (``fairness_weight``), which breaks
+concavity. To sweep a plan's budget with fairness, pass
+``bounds=zone_bounds(zones, reference_budget, fairness_weight)``: the curve
+then holds those minimums fixed and starts at their sum.
+"""
+
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from .separable import zone_bounds
+
+
+class BudgetCurve:
+    """
+    Objective versus budget for one set of zones, from ``min_budget`` (the
+    sum of the lower bounds) up to ``max_budget``.
+
+    Attributes:
+        breakpoints: [{budget, objective_value, zone_id, severity}, ...], one
+            per filled zone: where the segment filling that zone ends
+        feasible: False when some zone's lower bound exceeds its upper bound
+            or the lower bounds exceed max_budget
+    """
+
+    def __init__(self, zones: List[Dict], max_budget: int,
+                 bounds: Optional[Tuple[List[int], List[int]]] = None):
+        self.lower, upper = bounds or zone_bounds(zones, max_budget)
+        self.zone_ids = [zone['id'] for zone in zones]
+        self.max_budget = max_budget
+        self.min_budget = sum(self.lower)
+        self.base_value = sum(zone['severity'] * lo for zone, lo in zip(zones, self.lower))
+        self.feasible = all(lo <= hi for lo, hi in zip(self.lower, upper)) and self.min_budget <= max_budget
+
+        # Same fill order as solve_separable: stable, descending severity
+        order = sorted((i for i, zone in enumerate(zones) if zone['severity'] > 0 and upper[i] > self.lower[i]),
+                       key=lambda i: zones[i]['severity'], reverse=True)
+        room = [upper[i] - self.lower[i] for i in order]
+        ends = list(accumulate(room, initial=self.min_budget))[1:]
+        cut = bisect_left(ends, max_budget)  # segments past max_budget are never reached
+        self.order = order[:cut + 1]
+        self.ends = ends[:cut + 1]
+        if self.ends and self.ends[-1] > max_budget:
+            self.ends[-1] = max_budget
+        self.slopes = [zones[i]['severity'] for i in self.order]
+        starts = [self.min_budget] + self.ends[:-1]
+        self.values = list(accumulate(((end - start) * slope for start, end, slope
+                                       in zip(starts, self.ends, self.slopes)), initial=self.base_value))[1:]
+        self.position = {i: p for p, i in enumerate(self.order)}
+        self.breakpoints = [
+            {"budget": end, "objective_value": value, "zone_id": self.zone_ids[i], "severity": slope}
+            for end, value, i, slope in zip(self.ends, self.values, self.order, self.slopes)
+        ]
+
+    def _locate(self, budget: int) -> Tuple[int, int]:
+        """(segment being filled at ``budget``, volunteers already in it)."""
+        budget = min(budget, self.max_budget)
+        p = bisect_left(self.ends, budget)
+        start = self.ends[p - 1] if p > 0 else self.min_budget
+        return p, budget - start
+
+    def _check(self, budget: int):
+        if not self.feasible or budget < self.min_budget:
+            raise ValueError(f"Budget {budget} is infeasible: the lower bounds need {self.min_budget}")
+
+    def objective(self, budget: int) -> float:
+        """Optimal objective at ``budget`` (flat past the last segment)."""
+        self._check(budget)
+        p, filled = self._locate(budget)
+        if p >= len(self.ends):
+            return self.values[-1] if self.values else self.base_value
+        return (self.values[p - 1] if p > 0 else self.base_value) + self.slopes[p] * filled
+
+    def marginal_value(self, budget: int) -> float:
+        """Objective gained by the next volunteer at ``budget`` (0 once every zone is full)."""
+        self._check(budget)
+        p, _ = self._locate(budget + 1)
+        return self.slopes[p] if p < len(self.slopes) and budget < self.max_budget else 0.0
+
+    def partial_zone(self, budget: int) -> Optional[str]:
+        """Zone partly filled at ``budget`` (None at a breakpoint or past the last one)."""
+        self._check(budget)
+        p, filled = self._locate(budget)
+        partial = p < len(self.order) and 0 < filled and min(budget, self.max_budget) < self.ends[p]
+        return self.zone_ids[self.order[p]] if partial else None
+
+    def allocated(self, budget: int, zone_index: int) -> int:
+        """Volunteers for zone ``zone_index`` (position in ``zones``) at ``budget``."""
+        self._check(budget)
+        p, filled = self._locate(budget)
+        position = self.position.get(zone_index)
+        lower = self.lower[zone_index]
+        if position is None or position > p:
+            return lower
+        if position < p:
+            start = self.ends[position - 1] if position > 0 else self.min_budget
+            return lower + self.ends[position] - start
+        return lower + filled
+
+    def allocations(self, budget: int) -> List[int]:
+        """The optimal plan at ``budget``, in zone order (O(n))."""
+        self._check(budget)
+        p, filled = self._locate(budget)
+        allocations = list(self.lower)
+        start = self.min_budget
+        for position, end in enumerate(self.ends[:p + 1]):
+            i = self.order[position]
+            allocations[i] += filled if position == p else end - start
+            start = end
+        return allocations
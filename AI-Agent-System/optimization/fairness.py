@@ -0,0 +1,145 @@
+"""
+Fairness Metrics
+
+One-pass, mergeable fairness statistics over per-zone allocations, for whole
+plans, numpy batches or zone results arriving in chunks:
+
+- mean, variance, standard deviation and coefficient of variation (Welford's
+  update per zone; batches and accumulators combine with Chan's formula, so
+  no pass ever re-reads earlier zones)
+- Gini coefficient, exact from a histogram of allocation values (allocations
+  are whole volunteers, so the histogram stays small)
+- Jain's index, (sum x)^2 / (n * sum x^2) = 1 / (1 + cv^2)
+- severity-weighted and minimum satisfaction, where a zone's satisfaction is
+  allocated / required_volunteers capped at 100% (zones without a
+  requirement are left out)
+
+numpy is imported only by add_batch.
+"""
+
+import math
+from typing import Dict, Iterable, Optional, Sequence
+
+
+class FairnessAccumulator:
+    """
+    Accumulates fairness statistics zone by zone (``add``), batch by batch
+    (``add_batch``) or plan entry by plan entry (``add_plan``); ``merge``
+    combines accumulators filled separately, ``metrics`` reads them out.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.histogram: Dict[float, int] = {}
+        self.severity_total = 0.0
+        self.weighted_satisfaction = 0.0
+        self.min_satisfaction = math.inf
+
+    def add(self, allocated: float, severity: float = 0.0, required: float = 0.0):
+        """One zone."""
+        self.count += 1
+        delta = allocated - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (allocated - self.mean)
+        self.histogram[allocated] = self.histogram.get(allocated, 0) + 1
+        if required > 0:
+            satisfaction = min(allocated / required, 1.0)
+            self.severity_total += severity
+            self.weighted_satisfaction += severity * satisfaction
+            self.min_satisfaction = min(self.min_satisfaction, satisfaction)
+
+    def add_plan(self, plan: Iterable[Dict]):
+        """Allocation plan entries (allocated or assigned_volunteers, severity, optional required)."""
+        for entry in plan:
+            self.add(entry.get("allocated", entry.get("assigned_volunteers", 0)),
+                     entry.get("severity", 0), entry.get("required") or 0)
+
+    def add_batch(self, allocated: Sequence[float], severity: Optional[Sequence[float]] = None,
+                  required: Optional[Sequence[float]] = None):
+        """A batch of zones as arrays, vectorized."""
+        import numpy as np
+
+        allocated = np.asarray(allocated, dtype=float)
+        if not len(allocated):
+            return
+        batch = FairnessAccumulator()
+        batch.count = len(allocated)
+        batch.mean = float(allocated.mean())
+        batch.m2 = float(((allocated - batch.mean) ** 2).sum())
+        values, counts = np.unique(allocated, return_counts=True)
+        batch.histogram = dict(zip(values.tolist(), counts.tolist()))  # 2.0 and 2 are one key
+        if required is not None:
+            required = np.asarray(required, dtype=float)
+            severity = np.zeros(len(allocated)) if severity is None else np.asarray(severity, dtype=float)
+            rated = required > 0
+            if rated.any():
+                satisfaction = np.minimum(allocated[rated] / required[rated], 1.0)
+                batch.severity_total = float(severity[rated].sum())
+                batch.weighted_satisfaction = float(severity[rated] @ satisfaction)
+                batch.min_satisfaction = float(satisfaction.min())
+        self.merge(batch)
+
+    def merge(self, other: "FairnessAccumulator") -> "FairnessAccumulator":
+        """Adds another accumulator's zones to this one (returns self)."""
+        if other.count:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.count = count
+            for value, n in other.histogram.items():
+                self.histogram[value] = self.histogram.get(value, 0) + n
+            self.severity_total += other.severity_total
+            self.weighted_satisfaction += other.weighted_satisfaction
+            self.min_satisfaction = min(self.min_satisfaction, other.min_satisfaction)
+        return self
+
+    def gini(self) -> float:
+        """Gini coefficient of the allocations (0 = all equal)."""
+        total = self.mean * self.count
+        if self.count == 0 or total <= 0:
+            return 0.0
+        # Sorted ranks a+1..a+c of a value held by c zones contribute
+        # value * sum(2i - n - 1) = value * c * (2a + c - n)
+        below, weighted = 0, 0.0
+        for value in sorted(self.histogram):
+            n = self.histogram[value]
+            weighted += value * n * (2 * below + n - self.count)
+            below += n
+        return weighted / (self.count * total)
+
+    def metrics(self) -> Dict:
+        """Fairness metrics, rounded for reports."""
+        variance = self.m2 / self.count if self.count else 0.0
+        std_deviation = math.sqrt(max(variance, 0.0))
+        mean = self.mean if self.count else 0.0
+        return {
+            "zones": self.count,
+            "mean_allocation": round(mean, 2),
+            "variance": round(variance, 2),
+            "std_deviation": round(std_deviation, 2),
+            "coefficient_of_variation": round(std_deviation / mean * 100, 2) if mean > 0 else 0,
+            "gini": round(self.gini(), 4),
+            "jain_index": round(mean * mean / (mean * mean + variance), 4) if mean > 0 else 1.0,
+            "severity_weighted_satisfaction_pct": (
+                round(self.weighted_satisfaction / self.severity_total * 100, 1) if self.severity_total > 0 else None),
+            "min_satisfaction_pct": (
+                round(self.min_satisfaction * 100, 1) if self.min_satisfaction != math.inf else None),
+        }
+
+
+def fairness_metrics(allocated: Sequence[float], severity: Optional[Sequence[float]] = None,
+                     required: Optional[Sequence[float]] = None) -> Dict:
+    """Fairness metrics of one set of per-zone allocations (lists, or numpy arrays in one batch)."""
+    accumulator = FairnessAccumulator()
+    if hasattr(allocated, "dtype"):
+        accumulator.add_batch(allocated, severity, required)
+        return accumulator.metrics()
+    severity = severity if severity is not None else [0.0] * len(allocated)
+    required = required if required is not None else [0.0] * len(allocated)
+    for x, s, r in zip(allocated, severity, required):
+        accumulator.add(x, s, r)
+    return accumulator.metrics()
+
@@ -0,0 +1,161 @@
+"""
+Rolling-Horizon Multi-Period Planning
+
+Splits a scenario's ``duration_hours`` into shifts and plans them one at a
+time. Each shift is the allocator's model (see optimization.separable) over
+the volunteers who are not resting, warm-started from the previous shift:
+volunteers already in a zone stay there (their count is a lower bound on
+the zone) unless that makes the shift infeasible.
+
+Fatigue is tracked per cohort: a volunteer works at most
+``max_consecutive_shifts`` shifts in a row and then rests for
+``rest_shifts`` shifts; a shift without an assignment also counts as rest.
+Released volunteers are redeployed least-tired first.
+
+The state carried between shifts is only per-zone cohort counts, so every
+shift costs the same O(n log n) however long the horizon is, and shift t
+depends only on shifts before it: extending the horizon leaves earlier
+shifts unchanged, which lets callers cache them by period.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .separable import feasible, solve_separable, zone_bounds
+
+SHIFT_HOURS = 8
+MAX_CONSECUTIVE_SHIFTS = 2
+REST_SHIFTS = 1
+
+
+class RollingHorizonPlanner:
+    """
+    Plans shifts over a horizon. ``step`` plans one shift from a carried
+    state; ``plan`` runs every shift of ``duration_hours``.
+    """
+
+    def __init__(self, fairness_weight: float = 0.0, shift_hours: float = SHIFT_HOURS,
+                 max_consecutive_shifts: int = MAX_CONSECUTIVE_SHIFTS, rest_shifts: int = REST_SHIFTS):
+        if shift_hours <= 0 or max_consecutive_shifts < 1 or rest_shifts < 0:
+            raise ValueError("shift_hours must be > 0, max_consecutive_shifts >= 1 and rest_shifts >= 0")
+        self.fairness_weight = fairness_weight
+        self.shift_hours = shift_hours
+        self.max_consecutive_shifts = max_consecutive_shifts
+        self.rest_shifts = rest_shifts
+
+    def params(self) -> Dict:
+        """Planner settings; part of any cache key for a shift."""
+        return {"fairness_weight": self.fairness_weight, "shift_hours": self.shift_hours,
+                "max_consecutive_shifts": self.max_consecutive_shifts, "rest_shifts": self.rest_shifts}
+
+    def periods(self, duration_hours: float) -> int:
+        return max(1, math.ceil(duration_hours / self.shift_hours))
+
+    def initial_state(self, total_volunteers: int) -> Dict:
+        """
+        Carried state (JSON-serializable): ``working`` maps zone_id to counts
+        by consecutive shifts worked (index 0 = one shift), ``resting`` counts
+        by shifts of rest left (index 0 = back next shift), ``idle`` the rest.
+        """
+        return {"working": {}, "resting": [0] * self.rest_shifts, "idle": total_volunteers}
+
+    def plan(self, zones: List[Dict], total_volunteers: int, duration_hours: float) -> Dict:
+        """Every shift of the horizon; returns {"timeline": [...], "state": final state}."""
+        state = self.initial_state(total_volunteers)
+        timeline = []
+        for period in range(self.periods(duration_hours)):
+            record, state = self.step(zones, period, state)
+            timeline.append(record)
+        return {"timeline": timeline, "state": state}
+
+    def step(self, zones: List[Dict], period: int, state: Dict) -> Tuple[Dict, Dict]:
+        """
+        Plans shift ``period`` from ``state``.
+
+        Returns:
+            (record, next_state): record holds period, start_hour / end_hour,
+            allocation_plan ([{zone_id, assigned_volunteers, carried_over,
+            fresh}]), available / resting / idle counts, objective_value,
+            warm_started, solver_status and solve_time_seconds.
+        """
+        start_time = time.perf_counter()
+        working = {zone_id: list(ages) for zone_id, ages in state["working"].items()}
+        resting = list(state["resting"])
+        available = state["idle"] + sum(sum(ages) for ages in working.values())
+
+        # Warm start: keep volunteers where they are, unless that cannot be made feasible
+        carry = [sum(working.get(zone["id"], ())) for zone in zones]
+        lower, upper = zone_bounds(zones, available, self.fairness_weight)
+        warm = ([max(lo, min(c, hi)) for lo, hi, c in zip(lower, upper, carry)], upper)
+        warm_started = feasible(warm, available)
+        allocations, objective, status = solve_separable(
+            zones, available, self.fairness_weight, warm if warm_started else (lower, upper))
+
+        # Keep carried volunteers (least tired first); release the rest into the pool
+        m = self.max_consecutive_shifts
+        pool = [state["idle"]] + [0] * (m - 1)  # counts by consecutive shifts worked so far
+        kept_ages, fresh_needed = [], []
+        for zone, allocated in zip(zones, allocations):
+            ages = working.pop(zone["id"], [])
+            kept = [0] * len(ages)
+            left = allocated
+            for age, count in enumerate(ages):
+                kept[age] = min(count, left)
+                left -= kept[age]
+                pool[age + 1] += count - kept[age]
+            kept_ages.append(kept)
+            fresh_needed.append(left)
+        for ages in working.values():  # zones no longer in the plan
+            for age, count in enumerate(ages):
+                pool[age + 1] += count
+
+        next_working, tired, plan = {}, 0, []
+        for zone, kept, fresh, allocated in zip(zones, kept_ages, fresh_needed, allocations):
+            # Cohorts after this shift, indexed by consecutive shifts worked - 1
+            cohorts = [0] * m
+            for age, count in enumerate(kept):
+                cohorts[age + 1] += count
+            left = fresh
+            for age in range(len(pool)):
+                take = min(pool[age], left)
+                if take:
+                    pool[age] -= take
+                    left -= take
+                    cohorts[age] += take
+            tired += cohorts[m - 1]
+            ages = cohorts[:m - 1]
+            if any(ages):
+                next_working[zone["id"]] = ages
+            plan.append({"zone_id": zone["id"], "assigned_volunteers": allocated,
+                         "carried_over": sum(kept), "fresh": fresh})
+
+        # Unassigned volunteers rest this shift; fatigued ones start resting
+        idle = sum(pool) + (resting.pop(0) if resting else 0)
+        if self.rest_shifts:
+            resting.append(tired)
+        else:
+            idle += tired
+        next_state = {"working": next_working, "resting": resting, "idle": idle}
+
+        record = {
+            "period": period,
+            "start_hour": period * self.shift_hours,
+            "end_hour": (period + 1) * self.shift_hours,
+            "allocation_plan": plan,
+            "available": available,
+            "resting": sum(state["resting"]),
+            "idle": available - sum(allocations),
+            "objective_value": round(objective, 2),
+            "warm_started": warm_started,
+            "solver_status": status,
+            "solve_time_seconds": round(time.perf_counter() - start_time, 6),
+        }
+        return record, next_state
+
+
+def state_volunteers(state: Optional[Dict]) -> int:
+    """Volunteers accounted for in a carried state (for consistency checks)."""
+    if not state:
+        return 0
+    return state["idle"] + sum(state["resting"]) + sum(sum(ages) for ages in state["working"].values())
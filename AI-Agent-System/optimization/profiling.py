@@ -0,0 +1,191 @@
+"""
+Allocation Profiling Hooks
+
+Phase timings (build, solve, extract, metrics) are always recorded by
+VolunteerAllocator.allocate; they cost a handful of perf_counter() calls.
+Heavier capture is opt-in, per call (``allocate(..., profile=...)``) or
+globally (``configure(...)`` or the ALLOCATOR_PROFILE environment variable):
+
+- "cprofile": cProfile of the whole call, summarized as the top functions
+  by cumulative time
+- "tracemalloc": peak traced memory per phase
+- "solver": CBC's own wall time parsed from its log, separating the solve
+  from subprocess startup and model file I/O
+
+Each profiled call produces a record that is returned in the result
+metadata and passed to the configured sink (any callable taking a dict).
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, Optional
+
+CAPTURES = ("cprofile", "tracemalloc", "solver")
+
+# Number of functions kept in the cProfile summary
+TOP_FUNCTIONS = 15
+
+_CBC_WALL = re.compile(r"Total time \(CPU seconds\):\s*[\d.]+\s*\(Wallclock seconds\):\s*([\d.]+)")
+
+# e.g. ALLOCATOR_PROFILE=cprofile,tracemalloc (unknown names are ignored)
+_default_capture = frozenset(
+    c.strip() for c in os.environ.get("ALLOCATOR_PROFILE", "").split(",") if c.strip() in CAPTURES
+)
+_sink: Optional[Callable[[Dict], None]] = None
+
+
+def configure(capture: Optional[Iterable[str]] = None, sink: Optional[Callable[[Dict], None]] = None):
+    """Sets the global capture set (None = off) and the record sink."""
+    global _default_capture, _sink
+    _default_capture = _validate(capture or ())
+    _sink = sink
+
+
+def _validate(capture: Iterable[str]) -> frozenset:
+    if isinstance(capture, str):
+        capture = [capture]
+    capture = frozenset(capture)
+    unknown = capture - set(CAPTURES)
+    if unknown:
+        raise ValueError(f"Unknown profile capture(s) {sorted(unknown)}; expected any of {CAPTURES}")
+    return capture
+
+
+class JsonlSink:
+    """Sink that appends each record as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record: Dict):
+        line = json.dumps(record, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class PhaseProfiler:
+    """
+    Collects phase timings for one allocate call and, when requested, the
+    heavier captures. Use ``mark(phase)`` at the end of each phase.
+    """
+
+    def __init__(self, capture: Optional[Iterable[str]] = None):
+        self.capture = _default_capture if capture is None else _validate(capture)
+        self.timings: Dict[str, float] = {}
+        self.memory_peaks_mb: Dict[str, float] = {}
+        self.solver_log_path: Optional[str] = None
+        self._profiler = None  # cProfile.Profile when capturing
+        self._owns_tracemalloc = False
+        self.started = self._last = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.capture)
+
+    def start(self):
+        if "tracemalloc" in self.capture:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            self._reset_peak()
+        if "cprofile" in self.capture:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self.started = self._last = time.perf_counter()
+        return self
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.timings[phase] = round(now - self._last, 6)
+        if "tracemalloc" in self.capture:
+            self.memory_peaks_mb[phase] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3)
+            self._reset_peak()
+        self._last = time.perf_counter()
+
+    def transfer(self, seconds: float, source: str, target: str):
+        """
+        Moves ``seconds`` of a marked phase's time to another, for a split
+        only the callee measured (e.g. the model build inside a solver call).
+        Memory peaks stay with the phase they were marked in.
+        """
+        seconds = min(seconds, self.timings.get(source, 0.0))
+        self.timings[source] = round(self.timings[source] - seconds, 6)
+        self.timings[target] = round(self.timings.get(target, 0.0) + seconds, 6)
+
+    def _reset_peak(self):
+        """Starts a new peak; tracemalloc.reset_peak is Python 3.9+."""
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        elif self._owns_tracemalloc:
+            # Restarting clears the peak (and the traces, which are ours)
+            tracemalloc.stop()
+            tracemalloc.start()
+        # else: someone else's tracing; peaks then run from when they started it
+
+    def solver_log(self, tmp_dir: str) -> Optional[str]:
+        """Path for CBC's log when solver capture is on, else None."""
+        if "solver" in self.capture:
+            self.solver_log_path = os.path.join(tmp_dir, f"cbc_{os.getpid()}_{threading.get_ident()}.log")
+        return self.solver_log_path
+
+    def stop(self):
+        """Stops any running capture (safe to call more than once)."""
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def finish(self, **context) -> Optional[Dict]:
+        """Stops capture, emits the record to the sink and returns it (None when disabled)."""
+        self.stop()
+
+        if not self.enabled and _sink is None:
+            return None
+
+        record = {"timings": dict(self.timings), **context}
+        if self.memory_peaks_mb:
+            record["memory_peak_mb"] = dict(self.memory_peaks_mb)
+        if self._profiler is not None:
+            record["cprofile_top"] = _top_functions(self._profiler)
+        if self.solver_log_path:
+            record["solver"] = self._solver_split()
+        if _sink is not None:
+            _sink(record)
+        return record if self.enabled else None
+
+    def _solver_split(self) -> Dict:
+        """CBC's own wall time vs. the rest of the solve phase (subprocess, MPS/solution I/O)."""
+        try:
+            with open(self.solver_log_path, encoding="utf-8", errors="replace") as f:
+                match = _CBC_WALL.search(f.read())
+            os.remove(self.solver_log_path)
+        except OSError:
+            match = None
+        if not match:
+            return {"cbc_wall_seconds": None, "overhead_seconds": None}
+        cbc = float(match.group(1))
+        return {"cbc_wall_seconds": cbc, "overhead_seconds": round(max(0.0, self.timings.get("solve", 0) - cbc), 6)}
+
+
+def _top_functions(profiler, limit: int = TOP_FUNCTIONS):
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": calls,
+            "total_seconds": round(tottime, 6),
+            "cumulative_seconds": round(cumtime, 6),
+        })
+    rows.sort(key=lambda r: r["cumulative_seconds"], reverse=True)
+    return rows[:limit]
@@ -0,0 +1,282 @@
+"""
+Volunteer Roster Matching
+
+Turns the allocator's zone counts into named assignments from a roster of
+individual volunteers (volunteer_id, skills, latitude / longitude, optional
+available flag and availability window).
+
+Only compatible pairs become edges: a volunteer is linked to the
+``candidates`` nearest zones within ``max_km`` of home (KD-tree, see
+optimization.proximity.StagingIndex), and only where one of their skills
+covers a zone need (hazards / resources_needed; same keywords as
+optimization.team_assignment), or the zone lists no needs. Memory is
+proportional to the number of edges, never volunteers x zones.
+
+Each edge is worth
+
+    severity_z * (BASE_WEIGHT + fit) - cost_per_km * distance_km
+
+where fit is the share of the zone's needs the volunteer's skills cover.
+Matching is a sparse b-matching (each volunteer at most once, each zone up
+to its allocated count), solved in two steps:
+
+1. Greedy over edges in descending weight, in rounds: zones left short
+   (their nearby volunteers went to closer zones) then link to their
+   nearest volunteers still free, until they fill or none is in range
+2. Augmenting paths in the greedy matching's residual graph (a max-flow,
+   scipy.sparse.csgraph), so the fill is maximum: no zone is left short
+   while a compatible volunteer could be moved to make room
+
+scipy and numpy are imported on first use.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from .proximity import COST_PER_KM, StagingIndex
+from .team_assignment import BASE_WEIGHT, specialty_keywords
+
+# Nearest zones considered per volunteer
+CANDIDATES = 8
+# Farthest a volunteer is sent from home
+MAX_KM = 50.0
+# Zones left short look at this many times the candidates among free volunteers
+WIDEN = 4
+
+
+def volunteer_available(volunteer: Dict, hour: Optional[float] = None) -> bool:
+    """False when flagged unavailable or, given an hour, outside the availability window."""
+    if not volunteer.get("available", True):
+        return False
+    window = volunteer.get("availability")
+    return hour is None or not window or window[0] <= hour < window[1]
+
+
+def _fit_table(zones: List[Dict], combos: List[frozenset]) -> List[List[float]]:
+    """fit[z][c]: share of zone z's needs that skill combination c covers (None: zone lists no needs)."""
+    skills = sorted(set().union(*combos)) if combos else []
+    keywords = [specialty_keywords(skill) for skill in skills]
+    bit = {skill: 1 << i for i, skill in enumerate(skills)}
+    combo_masks = [sum(bit[skill] for skill in combo) for combo in combos]
+    covers: Dict[str, int] = {}  # need text -> mask of covering skills
+
+    table = []
+    for zone in zones:
+        needs = list(zone.get("hazards", ())) + list(zone.get("resources_needed", ()))
+        if not needs:
+            table.append(None)
+            continue
+        masks = []
+        for need in needs:
+            mask = covers.get(need)
+            if mask is None:
+                text = need.lower()
+                mask = covers[need] = sum(1 << i for i, words in enumerate(keywords)
+                                          if any(w in text for w in words))
+            masks.append(mask)
+        table.append([sum(1 for m in masks if m & combo) / len(masks) for combo in combo_masks])
+    return table
+
+
+def _deferred_acceptance(edge_volunteer, edge_zone, weight, capacity, n_volunteers):
+    """
+    Greedy b-matching by weight (each volunteer once, zone z up to
+    capacity[z]); returns the chosen-edge mask. Run as volunteer-proposing
+    deferred acceptance: both sides rank edges by the same weight, so the
+    stable matching is the greedy one, and each round is a few vectorized
+    sorts instead of a Python loop over every edge.
+    """
+    import numpy as np
+
+    n_edges = len(weight)
+    order = np.lexsort((-weight, edge_volunteer))  # each volunteer's edges, best first
+    zone_rank = np.empty(n_edges, dtype=np.int64)  # position in (zone, best first) order
+    zone_rank[np.lexsort((-weight, edge_zone))] = np.arange(n_edges)
+    first = np.searchsorted(edge_volunteer[order], np.arange(n_volunteers))
+    degree = np.bincount(edge_volunteer, minlength=n_volunteers)
+    choice = np.zeros(n_volunteers, dtype=np.int64)
+    held = np.empty(0, dtype=np.int64)  # accepted edges (positions in order)
+    proposing = np.flatnonzero(degree > 0)
+    while len(proposing):
+        pool = np.concatenate([held, first[proposing] + choice[proposing]])
+        edges = order[pool]
+        by_zone = np.argsort(zone_rank[edges])
+        pool, edges = pool[by_zone], edges[by_zone]
+        zone_of = edge_zone[edges]
+        rank = np.arange(len(pool)) - np.searchsorted(zone_of, zone_of)
+        accepted = rank < capacity[zone_of]
+        held = pool[accepted]
+        rejected = edge_volunteer[edges[~accepted]]
+        choice[rejected] += 1
+        proposing = rejected[choice[rejected] < degree[rejected]]
+    chosen = np.zeros(n_edges, dtype=bool)
+    chosen[order[held]] = True
+    return chosen
+
+
+def match_roster(zones: List[Dict], roster: List[Dict], allocation_plan: List[Dict],
+                 hour: Optional[float] = None, cost_per_km: float = COST_PER_KM,
+                 max_km: float = MAX_KM, candidates: int = CANDIDATES) -> Dict:
+    """
+    Named volunteer assignments filling the plan's zone counts.
+
+    Args:
+        zones: Zone dictionaries (id, severity, latitude, longitude, optional
+               hazards / resources_needed)
+        roster: Volunteers with volunteer_id, skills, latitude, longitude and
+                optional available (bool) / availability ([start, end) hours)
+        allocation_plan: Allocator output; each entry's zone_id and allocated
+                         (or assigned_volunteers) is the zone's count
+        hour: Only volunteers whose availability window covers this hour
+
+    Returns:
+        Dictionary containing:
+            - assignments: [{volunteer_id, zone_id, distance_km, fit}], zone order
+            - unfilled_zones: [{zone_id, requested, filled}] for zones left short
+            - requested / filled: Slots in the plan and slots filled
+            - fill_rate: filled / requested
+            - unassigned_volunteers: Available volunteers left over
+            - edges: Compatible volunteer-zone pairs considered
+            - augmented: Assignments gained by augmenting paths (after widening)
+            - mean_distance_km, objective_value (sum of edge weights)
+            - solve_time_seconds, solver_status ("MaxFill": the fill is
+              maximum, the weight is greedy and not proven optimal; or "Empty")
+    """
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import maximum_flow
+
+    start_time = time.time()
+    counts = {entry["zone_id"]: int(entry.get("allocated", entry.get("assigned_volunteers", 0)))
+              for entry in allocation_plan}
+    zones = [zone for zone in zones if counts.get(zone["id"], 0) > 0]
+    requested = sum(counts[zone["id"]] for zone in zones)
+    volunteers = [v for v in roster if volunteer_available(v, hour)]
+    n_zones, n_volunteers = len(zones), len(volunteers)
+
+    def report(assignments, unfilled, filled, edges, augmented, travel, objective, status):
+        return {
+            "assignments": assignments,
+            "unfilled_zones": unfilled,
+            "requested": requested,
+            "filled": filled,
+            "fill_rate": round(filled / requested, 4) if requested else 0,
+            "unassigned_volunteers": n_volunteers - filled,
+            "edges": edges,
+            "augmented": augmented,
+            "mean_distance_km": round(travel / filled, 3) if filled else 0,
+            "objective_value": round(objective, 2),
+            "solve_time_seconds": round(time.time() - start_time, 4),
+            "solver_status": status,
+        }
+
+    if not zones or not volunteers:
+        unfilled = [{"zone_id": zone["id"], "requested": counts[zone["id"]], "filled": 0} for zone in zones]
+        return report([], unfilled, 0, 0, 0, 0.0, 0.0, "Empty")
+
+    # Volunteers, skill combinations and per-combination zone fits
+    lat = np.array([v["latitude"] for v in volunteers], dtype=float)
+    lon = np.array([v["longitude"] for v in volunteers], dtype=float)
+    zone_lat = np.array([zone["latitude"] for zone in zones], dtype=float)
+    zone_lon = np.array([zone["longitude"] for zone in zones], dtype=float)
+    combo_index: Dict[frozenset, int] = {}
+    volunteer_combo = np.array([combo_index.setdefault(frozenset(v.get("skills", ())), len(combo_index))
+                                for v in volunteers], dtype=np.int64)
+    table = _fit_table(zones, list(combo_index))
+    open_zone = np.array([row is None for row in table])
+    fit_matrix = np.array([row if row is not None else [0.0] * len(combo_index) for row in table])
+    severity = np.array([zone["severity"] for zone in zones], dtype=float)
+
+    def link(volunteer_mask, zone_mask, from_zones):
+        """
+        Edges (volunteer, zone, km, weight) within max_km: each volunteer's
+        nearest compatible zones, or each zone's nearest compatible volunteers.
+        """
+        parts = []
+        for combo in range(len(combo_index)):
+            members = np.flatnonzero(volunteer_mask & (volunteer_combo == combo))
+            compatible = np.flatnonzero(zone_mask & ((fit_matrix[:, combo] > 0) | open_zone))
+            if not len(members) or not len(compatible):
+                continue
+            if from_zones:
+                km, nearest = StagingIndex([volunteers[v] for v in members]).nearest(
+                    zone_lat[compatible], zone_lon[compatible], WIDEN * candidates)
+                volunteer, zone = members[nearest], np.repeat(compatible, km.shape[1]).reshape(km.shape)
+            else:
+                km, nearest = StagingIndex([zones[z] for z in compatible]).nearest(lat[members], lon[members],
+                                                                                  candidates)
+                volunteer, zone = np.repeat(members, km.shape[1]).reshape(km.shape), compatible[nearest]
+            keep = km <= max_km
+            parts.append((volunteer[keep], zone[keep], km[keep]))
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        volunteer, zone, km = (np.concatenate(column) for column in zip(*parts))
+        fit = fit_matrix[zone, volunteer_combo[volunteer]]
+        return volunteer, zone, km, severity[zone] * (BASE_WEIGHT + fit) - cost_per_km * km
+
+    # 1. Greedy by weight over each volunteer's nearest compatible zones. Zones
+    # left short (their nearby volunteers went to closer zones) stay open for
+    # another round, in which volunteers still free link to the nearest zones
+    # still short, until they fill or nobody within max_km is left.
+    capacity = np.array([counts[zone["id"]] for zone in zones], dtype=np.int64)
+    matched_zone = np.full(n_volunteers, -1, dtype=np.int64)
+    columns = []
+    while True:
+        free, short = matched_zone < 0, capacity > 0
+        if not free.any() or not short.any():
+            break
+        edge_volunteer, edge_zone, edge_km, weight = link(free, short, from_zones=bool(columns))
+        chosen = _deferred_acceptance(edge_volunteer, edge_zone, weight, capacity, n_volunteers)
+        columns.append((edge_volunteer, edge_zone, edge_km, weight, chosen))
+        if not chosen.any():
+            break
+        matched_zone[edge_volunteer[chosen]] = edge_zone[chosen]
+        capacity -= np.bincount(edge_zone[chosen], minlength=n_zones)
+    if columns:
+        edge_volunteer, edge_zone, edge_km, weight, chosen = (np.concatenate(column) for column in zip(*columns))
+    else:
+        edge_volunteer = edge_zone = np.empty(0, dtype=np.int64)
+        edge_km, weight, chosen = np.empty(0), np.empty(0), np.empty(0, dtype=bool)
+    n_edges = len(weight)
+
+    # 2. Augmenting paths: max-flow over the greedy matching's residual graph
+    source, sink = n_volunteers + n_zones, n_volunteers + n_zones + 1
+    free = np.flatnonzero(matched_zone < 0)
+    short = np.flatnonzero(capacity > 0)
+    augmented = 0
+    if len(free) and len(short) and n_edges:
+        rows = np.concatenate([np.full(len(free), source), edge_volunteer[~chosen],
+                               n_volunteers + edge_zone[chosen], n_volunteers + short])
+        cols = np.concatenate([free, n_volunteers + edge_zone[~chosen], edge_volunteer[chosen],
+                               np.full(len(short), sink)])
+        caps = np.concatenate([np.ones(len(free) + n_edges), capacity[short]]).astype(np.int32)
+        graph = csr_matrix((caps, (rows, cols)), shape=(sink + 1, sink + 1))
+        result = maximum_flow(graph, source, sink, method="dinic")
+        augmented = int(result.flow_value)
+        if augmented:
+            flow = result.flow.tocoo()
+            moved = flow.data > 0
+            u, w = flow.row[moved], flow.col[moved]
+            dropped = (u >= n_volunteers) & (u < source) & (w < n_volunteers)
+            added = (u < n_volunteers) & (w >= n_volunteers) & (w < source)
+            matched_zone[w[dropped]] = -1
+            matched_zone[u[added]] = w[added] - n_volunteers
+
+    # Assignments in zone order, with the matched edge's distance and fit
+    members = np.flatnonzero(matched_zone >= 0)
+    members = members[np.argsort(matched_zone[members], kind="stable")]
+    edge_key = edge_zone * n_volunteers + edge_volunteer  # a pair linked in two rounds has equal edges
+    key_order = np.argsort(edge_key)
+    matched = key_order[np.searchsorted(edge_key, matched_zone[members] * n_volunteers + members,
+                                        sorter=key_order)]
+    fit = fit_matrix[edge_zone[matched], volunteer_combo[members]]
+    assignments = [
+        {"volunteer_id": volunteers[v]["volunteer_id"], "zone_id": zones[z]["id"], "distance_km": km, "fit": f}
+        for v, z, km, f in zip(members.tolist(), edge_zone[matched].tolist(),
+                               np.round(edge_km[matched], 3).tolist(), np.round(fit, 3).tolist())
+    ]
+    filled = np.bincount(matched_zone[members], minlength=n_zones)
+    unfilled = [{"zone_id": zone["id"], "requested": counts[zone["id"]], "filled": int(filled[z])}
+                for z, zone in enumerate(zones) if filled[z] < counts[zone["id"]]]
+    return report(assignments, unfilled, len(assignments), n_edges, augmented, float(edge_km[matched].sum()),
+                  float(weight[matched].sum()), "MaxFill")
@@ -0,0 +1,253 @@
+"""
+Multi-Scenario Allocation
+
+Commits volunteers to zones before it is known which of several candidate
+scenarios will unfold. Scenarios share zone ids; a scenario values the x_z
+volunteers committed to zone z as
+
+    severity_{s,z} * min(x_z, upper_{s,z})
+
+where upper is the zone's cap in that scenario (capacity / required
+volunteers and resource coupling; see optimization.separable.zone_bounds).
+Zones a scenario does not list are worth nothing in it.
+
+Modes:
+
+- "expected": maximize the weighted sum of scenario values
+- "robust":   maximize the worst scenario value
+
+Solved by scenario decomposition rather than as one model over all
+scenarios:
+
+1. Subproblems, one per scenario and independent, so they run in parallel
+   (processes, see ``workers``): each prices its zones into a concave
+   per-zone value curve and solves its own perfect-information plan.
+2. A master problem merges the curves under scenario weights and fills the
+   budget greedily; with fixed weights this is exact, so "expected" needs a
+   single pass. For "robust", the master reweights scenarios towards the
+   worst-off one (multiplicative weights) and averages its plans; every
+   pass also yields an upper bound on the robust optimum, and iteration
+   stops once the best plan is within ``tolerance`` of it. A plan still
+   short of that after ``max_iterations`` is reported as STATUS_FEASIBLE.
+
+Each pass is O(n * S log(n * S)) for n zones and S scenarios, so solve time
+grows roughly linearly with the number of scenarios.
+
+The commit's fairness minimum (``fairness_weight``) is taken over the
+expected severity of each zone. numpy is imported on first use.
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from .separable import STATUS_FEASIBLE, STATUS_INFEASIBLE, STATUS_OPTIMAL, solve_separable, zone_bounds
+
+MODES = ("expected", "robust")
+# Below this many zones across all scenarios, subproblems run in-process:
+# starting worker processes costs more than it saves
+PARALLEL_MIN_ZONES = 20000
+MAX_ITERATIONS = 200
+TOLERANCE = 0.005
+# Multiplicative-weights step on scenario values relative to the bound
+STEP = 10.0
+
+
+def _scenario_curve(zones: List[Dict], total_volunteers: int, fairness_weight: float) -> Dict:
+    """Subproblem: a scenario's zone caps and its perfect-information optimum."""
+    _, upper = zone_bounds(zones, total_volunteers)
+    _, optimum, _ = solve_separable(zones, total_volunteers, fairness_weight)
+    return {"ids": [zone["id"] for zone in zones], "severity": [zone["severity"] for zone in zones],
+            "upper": upper, "optimum": optimum}
+
+
+def solve_scenarios(scenarios: Sequence[Dict], total_volunteers: int, fairness_weight: float = 0.0,
+                    mode: str = "expected", weights: Optional[Sequence[float]] = None,
+                    workers: Optional[int] = None, tolerance: float = TOLERANCE,
+                    max_iterations: int = MAX_ITERATIONS) -> Dict:
+    """
+    One commitment of ``total_volunteers`` across a set of scenarios.
+
+    Args:
+        scenarios: Dicts with "zones" (allocator zone dicts), optional
+            "scenario_id" and "weight" (default 1)
+        weights: Overrides the scenarios' weights (normalized; "expected" only)
+        workers: Processes for the subproblems (default: one per scenario, up
+            to the CPU count; small instances always run in-process)
+        tolerance: Relative gap at which "robust" stops iterating
+        max_iterations: Passes "robust" makes before giving up on the tolerance
+
+    Returns:
+        Dictionary with mode, allocation_plan ([{zone_id, allocated,
+        expected_severity, expected_required}]), remaining_volunteers, objective_value (expected
+        or worst-case value), expected_value, worst_case_value, bound (upper
+        bound on the objective) and gap, scenarios ([{scenario_id, weight,
+        value, optimum, regret}]), iterations, workers, solver_status
+        (STATUS_FEASIBLE for a robust plan not within ``tolerance`` of the
+        bound) and subproblem / master / solve times in seconds.
+    """
+    import numpy as np
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {list(MODES)}")
+    if not scenarios:
+        raise ValueError("At least one scenario is required")
+    start_time = time.perf_counter()
+
+    weights = [scenario.get("weight", 1.0) for scenario in scenarios] if weights is None else list(weights)
+    if len(weights) != len(scenarios) or any(w < 0 for w in weights) or sum(weights) <= 0:
+        raise ValueError("Need one non-negative weight per scenario, not all zero")
+    probability = np.array(weights, dtype=float) / sum(weights)
+
+    # 1. Subproblems
+    n_scenarios = len(scenarios)
+    if workers is None:
+        workers = min(n_scenarios, os.cpu_count() or 1)
+    if sum(len(scenario["zones"]) for scenario in scenarios) < PARALLEL_MIN_ZONES:
+        workers = 1
+    args = ([scenario["zones"] for scenario in scenarios], [total_volunteers] * n_scenarios,
+            [fairness_weight] * n_scenarios)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            curves = list(pool.map(_scenario_curve, *args))
+    else:
+        curves = list(map(_scenario_curve, *args))
+    subproblem_time = time.perf_counter() - start_time
+
+    # 2. Master: merge the curves into zone segments
+    zone_index: Dict[str, int] = {}
+    entry_zone, entry_scenario, entry_severity, entry_upper = [], [], [], []
+    for s, curve in enumerate(curves):
+        for zone_id, severity, upper in zip(curve["ids"], curve["severity"], curve["upper"]):
+            z = zone_index.setdefault(zone_id, len(zone_index))
+            if severity > 0 and upper > 0:
+                entry_zone.append(z)
+                entry_scenario.append(s)
+                entry_severity.append(severity)
+                entry_upper.append(upper)
+    zone_ids = list(zone_index)
+    n_zones = len(zone_ids)
+    entry_zone = np.array(entry_zone, dtype=np.int64)
+    entry_scenario = np.array(entry_scenario, dtype=np.int64)
+    entry_severity = np.array(entry_severity, dtype=float)
+    entry_upper = np.array(entry_upper, dtype=np.int64)
+
+    # Probability-weighted required_volunteers (0 in scenarios without the zone), for fairness reporting
+    expected_required = np.zeros(n_zones)
+    for s, scenario in enumerate(scenarios):
+        for zone in scenario["zones"]:
+            if zone["id"] in zone_index:
+                expected_required[zone_index[zone["id"]]] += probability[s] * zone.get("required_volunteers", 0)
+
+    cap = np.zeros(n_zones, dtype=np.int64)
+    np.maximum.at(cap, entry_zone, entry_upper)
+    expected_severity = np.bincount(entry_zone, weights=probability[entry_scenario] * entry_severity,
+                                    minlength=n_zones)
+    lower, _ = zone_bounds([{"id": zone_id, "severity": severity}
+                            for zone_id, severity in zip(zone_ids, expected_severity)],
+                           total_volunteers, fairness_weight)
+    lower = np.minimum(np.array(lower, dtype=np.int64), cap)
+    status = STATUS_OPTIMAL if lower.sum() <= total_volunteers else STATUS_INFEASIBLE
+    budget = max(0, total_volunteers - int(lower.sum()))
+
+    # Segment k of a zone covers (next smaller cap, cap_k] and is worth the
+    # weighted severity of every scenario whose cap reaches it
+    order = np.lexsort((-entry_upper, entry_zone))
+    seg_zone, seg_scenario = entry_zone[order], entry_scenario[order]
+    seg_severity, seg_upper = entry_severity[order], entry_upper[order]
+    last = np.append(seg_zone[1:] != seg_zone[:-1], True)
+    first = np.roll(last, 1)
+    below = np.where(last, 0, np.roll(seg_upper, -1))
+    seg_length = np.maximum(0, seg_upper - np.maximum(below, lower[seg_zone]))
+    group = np.cumsum(first) - 1
+    first_positions = np.flatnonzero(first)
+
+    def best_response(scenario_weights):
+        contribution = scenario_weights[seg_scenario] * seg_severity
+        running = np.cumsum(contribution)
+        slope = running - (running - contribution)[first_positions][group]
+        candidates = np.flatnonzero((seg_length > 0) & (slope > 0))
+        candidates = candidates[np.argsort(-slope[candidates], kind="stable")]
+        lengths = seg_length[candidates]
+        taken = np.clip(budget - (np.cumsum(lengths) - lengths), 0, lengths)
+        return lower + np.bincount(seg_zone[candidates], weights=taken, minlength=n_zones).astype(np.int64)
+
+    def scenario_values(x):
+        return np.bincount(entry_scenario, weights=entry_severity * np.minimum(x[entry_zone], entry_upper),
+                           minlength=n_scenarios)
+
+    if mode == "expected":
+        allocations = best_response(probability)
+        values = scenario_values(allocations)
+        bound = float(probability @ values)
+        iterations = 1
+    else:
+        # Multiplicative weights on the scenarios; the averaged plan
+        # converges to the robust optimum, each pass bounds it from above
+        adversary = np.full(n_scenarios, 1.0 / n_scenarios)
+        plan_sum = np.zeros(n_zones)
+        allocations, best, bound, iterations = lower, -math.inf, math.inf, 0
+        for iterations in range(1, max_iterations + 1):
+            x = best_response(adversary)
+            values = scenario_values(x)
+            bound = min(bound, float(adversary @ values))
+            plan_sum += x
+            for candidate in (x, _round_plan(plan_sum / iterations, total_volunteers)):
+                worst = scenario_values(candidate).min()
+                if worst > best:
+                    best, allocations = worst, candidate
+            if bound - best <= tolerance * abs(bound):
+                break
+            adversary = adversary * np.exp(-STEP * values / max(bound, 1e-9))
+            adversary /= adversary.sum()
+        else:
+            # Cap reached with the best plan still outside the tolerance
+            if status == STATUS_OPTIMAL:
+                status = STATUS_FEASIBLE
+        values = scenario_values(allocations)
+
+    expected_value = float(probability @ values)
+    worst_case_value = float(values.min())
+    objective = expected_value if mode == "expected" else worst_case_value
+    plan = [{"zone_id": zone_id, "allocated": int(allocated), "expected_severity": round(float(severity), 3),
+             "expected_required": round(float(required), 3)}
+            for zone_id, allocated, severity, required in zip(zone_ids, allocations, expected_severity,
+                                                              expected_required)]
+    end_time = time.perf_counter()
+    return {
+        "mode": mode,
+        "allocation_plan": plan,
+        "remaining_volunteers": total_volunteers - int(allocations.sum()),
+        "objective_value": round(objective, 2),
+        "expected_value": round(expected_value, 2),
+        "worst_case_value": round(worst_case_value, 2),
+        "bound": round(bound, 2),
+        "gap": round((bound - objective) / bound, 6) if bound > 0 else 0.0,
+        "scenarios": [
+            {"scenario_id": scenario.get("scenario_id", f"S{s + 1}"), "weight": round(float(probability[s]), 6),
+             "value": round(float(values[s]), 2), "optimum": round(curves[s]["optimum"], 2),
+             "regret": round(curves[s]["optimum"] - float(values[s]), 2)}
+            for s, scenario in enumerate(scenarios)
+        ],
+        "iterations": iterations,
+        "workers": workers,
+        "solver_status": status,
+        "subproblem_seconds": round(subproblem_time, 6),
+        "master_seconds": round(end_time - start_time - subproblem_time, 6),
+        "solve_time_seconds": round(end_time - start_time, 6),
+    }
+
+
+def _round_plan(plan, total_volunteers: int):
+    """Integer plan from an average of integer plans: floors, then the largest remainders."""
+    import numpy as np
+
+    floors = np.floor(plan + 1e-9).astype(np.int64)
+    fraction = plan - floors
+    extra = min(total_volunteers, int(math.floor(plan.sum() + 1e-9))) - int(floors.sum())
+    if extra > 0:
+        top = np.argsort(-fraction, kind="stable")[:extra]
+        floors[top[fraction[top] > 1e-9]] += 1
+    return floors
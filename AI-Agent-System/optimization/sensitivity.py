@@ -0,0 +1,211 @@
+"""
+Sensitivity Analysis
+
+What-if answers for the allocator's separable model (see
+optimization.separable) without re-solving. ``analyze`` summarizes a solved
+plan; ``budget_change`` and ``bound_change`` answer from the summary alone.
+
+The optimal plan fills every zone to its lower bound and hands out the rest of
+the budget in descending severity, so its value depends only on the totals
+per severity level: the sum of the zones' lower bounds and of their upper
+bounds. The report keeps those ``levels``; a query adjusts them and repeats
+the fill over the levels, in O(levels) rather than O(zones).
+
+The shadow price of the budget is the severity of the level the next
+volunteer would go to, and ``release_price`` what the last one is worth;
+both hold over ``budget_range``. Fairness minimums grow with the budget
+(``fairness_weight``), so the report also lists every minimum that changes
+within ``STEP_WINDOW`` of the budget. Budget answers inside that window are
+exact; beyond it the other minimums are held fixed and the answer says so.
+
+A zone's ``reduced_cost`` is the value of loosening its binding bound by one
+volunteer: severity minus the shadow price (positive at a binding upper
+bound, negative at a binding minimum).
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .separable import _EPS, zone_bounds
+
+# Budget changes (as a share of the budget, at least MIN_WINDOW volunteers)
+# whose fairness-minimum steps are recorded, i.e. answered exactly
+STEP_WINDOW = 0.1
+MIN_WINDOW = 100
+
+
+def _binding(zone: Dict, total_volunteers: int, allocated: int, lower: int, upper: int,
+             marginal: bool) -> Optional[str]:
+    """Name of the constraint that holds the zone where it is."""
+    if marginal:
+        return "budget"
+    if allocated >= upper and zone['severity'] > 0:
+        limit = zone.get('capacity', zone.get('required_volunteers', total_volunteers))
+        if upper < math.floor(limit + _EPS):
+            return "resources"
+        if 'capacity' in zone:
+            return "capacity"
+        return "required" if 'required_volunteers' in zone else None
+    if allocated <= lower:
+        return "fairness" if lower > 0 else "nonnegativity"
+    return None
+
+
+def _fill(levels: Dict[float, List[int]], budget: int) -> Optional[float]:
+    """Optimal value over severity levels {severity: [lower, upper]}; None when infeasible."""
+    if any(lo > hi for lo, hi in levels.values()):
+        return None
+    left = budget - sum(lo for lo, _ in levels.values())
+    if left < 0:
+        return None
+    value = sum(severity * lo for severity, (lo, _) in levels.items())
+    for severity in sorted(levels, reverse=True):
+        if left <= 0 or severity <= 0:
+            break
+        lo, hi = levels[severity]
+        extra = min(hi - lo, left)
+        value += severity * extra
+        left -= extra
+    return value
+
+
+def analyze(zones: List[Dict], allocations: Sequence[int], total_volunteers: int, fairness_weight: float = 0.0,
+            bounds: Optional[Tuple[List[int], List[int]]] = None) -> Dict:
+    """
+    Sensitivity summary of an optimal plan (JSON-serializable).
+
+    Returns:
+        Dictionary containing:
+            - budget, remaining_volunteers, objective_value
+            - shadow_price: Value of one more volunteer (0 if some are unused)
+            - release_price: Value lost with one volunteer fewer
+            - budget_range: [low, high] budgets over which both prices hold
+              at the current minimums (high None: unbounded)
+            - exact_range: [low, high] budgets answered exactly
+            - marginal_zones: Zones partly filled at the shadow price
+            - levels: [[severity, sum of lower bounds, sum of upper bounds], ...]
+            - fairness_steps: [[budget, severity, change, overflow], ...]
+              fairness minimums changing by +1 / -1 within exact_range
+              (overflow: the new minimum exceeds the zone's upper bound)
+            - zones: {zone_id: {binding, reduced_cost, allocated, lower, upper}}
+    """
+    lower, upper = bounds or zone_bounds(zones, total_volunteers, fairness_weight)
+    remaining = total_volunteers - sum(allocations)
+
+    levels: Dict[float, List[int]] = {}
+    grow, shrink = {}, {}  # room left / volunteers above the minimum, per severity
+    for zone, allocated, lo, hi in zip(zones, allocations, lower, upper):
+        severity = zone['severity']
+        level = levels.setdefault(severity, [0, 0])
+        level[0] += lo
+        level[1] += hi
+        if severity > 0 and hi > allocated:
+            grow[severity] = grow.get(severity, 0) + hi - allocated
+        if allocated > lo:
+            shrink[severity] = shrink.get(severity, 0) + allocated - lo
+    if remaining > 0:
+        shrink[0] = shrink.get(0, 0) + remaining
+    top = max(grow) if grow and remaining <= 0 else None
+    bottom = min(shrink) if shrink else None
+    shadow_price = top if top is not None else 0.0
+
+    # Fairness minimums that change within the window (zone_bounds' rounding)
+    window = max(MIN_WINDOW, math.ceil(STEP_WINDOW * total_volunteers))
+    total_severity = sum(zone['severity'] for zone in zones)
+    steps = []
+    if fairness_weight > 0 and total_severity > 0:
+        for zone, lo, hi in zip(zones, lower, upper):
+            rate = zone['severity'] / total_severity * fairness_weight  # minimum per volunteer of budget
+            if rate <= 0 or lo > math.ceil(rate * total_volunteers - _EPS):
+                continue  # minimum set by resources, not fairness
+            # Budgets at which ceil(rate * budget - eps) reaches lo + 1, lo + 2, ... and lo - 1, ...
+            level = lo + 1
+            while (budget := math.floor((level - 1 + _EPS) / rate) + 1) <= total_volunteers + window:
+                steps.append([budget, zone['severity'], 1, level > hi])
+                level += 1
+            level = lo
+            while level > 0 and (budget := math.floor((level - 1 + _EPS) / rate)) >= total_volunteers - window:
+                steps.append([budget, zone['severity'], -1, False])
+                level -= 1
+    steps.sort()
+
+    zone_report = {}
+    for zone, allocated, lo, hi in zip(zones, allocations, lower, upper):
+        marginal = zone['severity'] == top and lo < allocated < hi
+        binding = _binding(zone, total_volunteers, allocated, lo, hi, marginal)
+        zone_report[zone['id']] = {
+            "binding": binding,
+            "reduced_cost": 0.0 if binding in (None, "budget") else round(zone['severity'] - shadow_price, 6),
+            "allocated": allocated, "lower": lo, "upper": hi,
+        }
+
+    return {
+        "budget": total_volunteers,
+        "remaining_volunteers": remaining,
+        "objective_value": sum(zone['severity'] * a for zone, a in zip(zones, allocations)),
+        "shadow_price": shadow_price,
+        "release_price": bottom,
+        "budget_range": [total_volunteers - (shrink[bottom] if bottom is not None else 0),
+                         total_volunteers + grow[top] if top is not None else None],
+        "exact_range": ([max(0, total_volunteers - window), total_volunteers + window] if fairness_weight > 0
+                        else [0, None]),
+        "marginal_zones": [zid for zid, z in zone_report.items() if z["binding"] == "budget"],
+        "levels": [[severity, lo, hi] for severity, (lo, hi) in sorted(levels.items(), reverse=True)],
+        "fairness_steps": steps,
+        "zones": zone_report,
+    }
+
+
+def _answer(report: Dict, value: Optional[float]) -> Dict:
+    if value is None:
+        return {"objective_change": None, "objective_value": None, "feasible": False}
+    return {"objective_change": round(value - report["objective_value"], 6),
+            "objective_value": round(value, 6), "feasible": True}
+
+
+def budget_change(report: Dict, delta: int) -> Dict:
+    """
+    Objective after changing the budget by ``delta`` volunteers.
+
+    Returns:
+        Dictionary with budget, objective_change, objective_value (None when
+        infeasible), marginal_value (per volunteer), feasible, and exact
+        (False beyond exact_range, where other fairness minimums are held fixed)
+    """
+    budget = report["budget"] + delta
+    levels = {severity: [lo, hi] for severity, lo, hi in report["levels"]}
+    overflow = False
+    for step_budget, severity, change, exceeds in report["fairness_steps"]:
+        if (change > 0 and report["budget"] < step_budget <= budget) or \
+                (change < 0 and budget <= step_budget < report["budget"]):
+            levels[severity][0] += change
+            overflow = overflow or exceeds
+
+    answer = _answer(report, None if overflow else _fill(levels, budget))
+    low, high = sorted((report["budget"], budget))
+    exact_low, exact_high = report["exact_range"]
+    return {
+        "budget": budget,
+        **answer,
+        "marginal_value": (round(answer["objective_change"] / delta, 6) + 0.0 if delta and answer["feasible"]
+                           else None if delta else report["shadow_price"]),
+        "exact": exact_low <= low and (exact_high is None or high <= exact_high),
+    }
+
+
+def bound_change(report: Dict, zone: Dict, **changes) -> Dict:
+    """
+    Objective after changing one zone's capacity, required_volunteers,
+    resources_available or min_resources_per_volunteer (keyword arguments,
+    new values) at the same budget. Exact: other zones' bounds are unchanged.
+
+    Returns:
+        Dictionary with zone_id, upper (the zone's new upper bound),
+        objective_change, objective_value (None when infeasible) and feasible
+    """
+    info = report["zones"][zone['id']]
+    _, (new_upper,) = zone_bounds([{**zone, **changes}], report["budget"])
+    levels = {severity: [lo, hi] for severity, lo, hi in report["levels"]}
+    levels[zone['severity']][1] += new_upper - info["upper"]
+    value = _fill(levels, report["budget"]) if new_upper >= info["lower"] else None
+    return {"zone_id": zone['id'], "upper": new_upper, **_answer(report, value)}
@@ -0,0 +1,161 @@
+"""
+Exact Separable Solver
+
+The allocator's integer program is separable: apart from the shared
+volunteer budget, every constraint bounds a single zone's x_z (the fairness
+minimum from below; capacity / required volunteers and resource coupling
+from above), and every volunteer costs one unit of budget. Giving each zone
+its lower bound and then handing out the remaining budget in descending
+severity, up to each zone's upper bound, is therefore an optimal integer
+solution.
+
+This runs in O(n log n) without building a model or starting CBC, and
+imports nothing from PuLP. The column variants (column_bounds,
+solve_columns) do the same over numpy arrays, one per zone field, for inputs
+never held as per-zone dicts; numpy is imported on first use.
+"""
+
+import math
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Same codes as pulp.LpStatusOptimal / pulp.LpStatusInfeasible
+STATUS_OPTIMAL = 1
+STATUS_INFEASIBLE = -1
+# Every constraint holds but the plan is not proven optimal (heuristic or
+# rounded solvers); same code as pulp.LpSolutionIntegerFeasible
+STATUS_FEASIBLE = 2
+
+# Slack when rounding float bounds to integers (CBC's integrality tolerance is ~1e-7)
+_EPS = 1e-6
+
+
+def zone_bounds(zones: List[Dict], total_volunteers: int,
+                fairness_weight: float = 0.0) -> Tuple[List[int], List[int]]:
+    """
+    Integer (lower, upper) bounds per zone, as implied by the allocator's
+    constraints (see VolunteerAllocator.allocate for the zone fields).
+    """
+    total_severity = sum(zone['severity'] for zone in zones)
+    reserved = total_volunteers * fairness_weight if fairness_weight > 0 and total_severity > 0 else 0
+
+    lower, upper = [], []
+    for zone in zones:
+        lo = 0.0
+        hi = float(zone.get('capacity', zone.get('required_volunteers', total_volunteers)))
+        if reserved:
+            lo = max(lo, (zone['severity'] / total_severity) * reserved)
+        if 'resources_available' in zone and 'min_resources_per_volunteer' in zone:
+            per_volunteer = zone['min_resources_per_volunteer']
+            resources = zone['resources_available']
+            if per_volunteer > 0:
+                hi = min(hi, resources / per_volunteer)
+            elif per_volunteer < 0:
+                lo = max(lo, resources / per_volunteer)
+            elif resources < 0:
+                hi = -1.0  # 0 <= resources cannot hold
+        lower.append(math.ceil(lo - _EPS))
+        upper.append(math.floor(hi + _EPS))
+    return lower, upper
+
+
+def feasible(bounds: Tuple[List[int], List[int]], total_volunteers: int) -> bool:
+    """True when every zone's lower bound fits under its upper bound and all fit the budget."""
+    lower, upper = bounds
+    return all(lo <= hi for lo, hi in zip(lower, upper)) and sum(lower) <= total_volunteers
+
+
+def solve_separable(zones: List[Dict], total_volunteers: int, fairness_weight: float = 0.0,
+                    bounds: Optional[Tuple[List[int], List[int]]] = None) -> Tuple[List[int], float, int]:
+    """
+    Optimal integer allocation for the allocator's model.
+
+    Args:
+        bounds: Precomputed zone_bounds(...) for the same arguments
+
+    Returns:
+        (allocations, objective, status): allocations are in zone order;
+        status is STATUS_OPTIMAL, or STATUS_INFEASIBLE when the lower bounds
+        exceed a zone's upper bound or the budget (allocations are then the
+        lower bounds clipped to the upper bounds).
+    """
+    lower, upper = bounds or zone_bounds(zones, total_volunteers, fairness_weight)
+    if not feasible((lower, upper), total_volunteers):
+        allocations = [max(0, min(lo, hi)) for lo, hi in zip(lower, upper)]
+        return allocations, _objective(zones, allocations), STATUS_INFEASIBLE
+
+    allocations = list(lower)
+    remaining = total_volunteers - sum(lower)
+    # Stable sort: equal severities are filled in input order
+    order = sorted((i for i, zone in enumerate(zones) if zone['severity'] > 0),
+                   key=lambda i: zones[i]['severity'], reverse=True)
+    for i in order:
+        if remaining <= 0:
+            break
+        extra = min(upper[i] - allocations[i], remaining)
+        allocations[i] += extra
+        remaining -= extra
+    return allocations, _objective(zones, allocations), STATUS_OPTIMAL
+
+
+def column_bounds(columns: Mapping, total_volunteers: int, fairness_weight: float = 0.0):
+    """
+    zone_bounds over field columns (``columns[name]`` an array per zone
+    field, NaN where a zone lacks the field): the same bounds, as int64
+    arrays, computed with the same floating-point operations.
+    """
+    import numpy as np
+
+    def field(name):
+        return np.asarray(columns[name], dtype=float) if name in columns else None
+
+    severity = np.asarray(columns['severity'])
+    total_severity = severity.sum()
+    reserved = total_volunteers * fairness_weight if fairness_weight > 0 and total_severity > 0 else 0
+
+    hi = np.full(len(severity), float(total_volunteers))
+    for name in ('required_volunteers', 'capacity'):  # capacity first, as in zone.get(...)
+        values = field(name)
+        if values is not None:
+            hi = np.where(np.isnan(values), hi, values)
+    lo = np.zeros(len(severity))
+    if reserved:
+        lo = np.maximum(lo, (severity / total_severity) * reserved)
+    resources, per_volunteer = field('resources_available'), field('min_resources_per_volunteer')
+    if resources is not None and per_volunteer is not None:
+        coupled = ~(np.isnan(resources) | np.isnan(per_volunteer))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = resources / per_volunteer
+        hi = np.where(coupled & (per_volunteer > 0), np.minimum(hi, ratio), hi)
+        lo = np.where(coupled & (per_volunteer < 0), np.maximum(lo, ratio), lo)
+        hi = np.where(coupled & (per_volunteer == 0) & (resources < 0), -1.0, hi)
+    return np.ceil(lo - _EPS).astype(np.int64), np.floor(hi + _EPS).astype(np.int64)
+
+
+def solve_columns(columns: Mapping, total_volunteers: int, fairness_weight: float = 0.0, bounds=None):
+    """
+    solve_separable over field columns (see column_bounds), vectorized.
+
+    Returns:
+        (allocations, objective, status), allocations an int64 array in row order
+    """
+    import numpy as np
+
+    severity = np.asarray(columns['severity'])
+    lower, upper = bounds if bounds is not None else column_bounds(columns, total_volunteers, fairness_weight)
+    if (lower > upper).any() or lower.sum() > total_volunteers:
+        allocations = np.maximum(0, np.minimum(lower, upper))
+        return allocations, float(severity @ allocations), STATUS_INFEASIBLE
+
+    # Same fill as solve_separable: stable, descending severity, each zone up to its room
+    order = np.flatnonzero(severity > 0)
+    order = order[np.argsort(-severity[order], kind='stable')]
+    room = (upper - lower)[order]
+    before = np.cumsum(room) - room
+    allocations = lower.copy()
+    allocations[order] += np.clip(total_volunteers - lower.sum() - before, 0, room)
+    return allocations, float(severity @ allocations), STATUS_OPTIMAL
+
+
+def _objective(zones: List[Dict], allocations: List[int]) -> float:
+    return sum(zone['severity'] * allocated for zone, allocated in zip(zones, allocations))
+
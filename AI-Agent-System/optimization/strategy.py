@@ -0,0 +1,68 @@
+"""
+Solver Strategy Table
+
+Maps problem size to the solver VolunteerAllocator uses with
+``solver="auto"``. Tables are produced by tests/benchmark_pareto.py and
+loaded per allocator (``strategy_table=...``) or globally (``configure(...)``
+or the ALLOCATOR_STRATEGY_TABLE environment variable, a JSON file path).
+
+Table format (rows sorted by max_zones; a zone count above the last row
+uses the last row's solver):
+
+    {"recommendations": [{"max_zones": 100, "solver": "exact"},
+                         {"max_zones": 10000, "solver": "cbc"}]}
+
+Without a table, "auto" keeps its built-in rule (exact, CBC for
+infeasible instances).
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Union
+
+# Solvers a table may recommend (VolunteerAllocator.SOLVERS minus "auto")
+TABLE_SOLVERS = ("exact", "cbc")
+
+_default_table: Optional[List[Dict]] = None
+
+
+def load_table(source: Union[str, Dict, List[Dict]]) -> List[Dict]:
+    """
+    Validated recommendation rows from a JSON file path, a report dict
+    (with a "recommendations" key) or a list of rows.
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            source = json.load(f)
+    rows = source["recommendations"] if isinstance(source, dict) else source
+    table = []
+    for row in rows:
+        if row.get("solver") not in TABLE_SOLVERS:
+            raise ValueError(f"Unknown solver {row.get('solver')!r} in strategy table; expected one of {TABLE_SOLVERS}")
+        table.append({"max_zones": int(row["max_zones"]), "solver": row["solver"]})
+    table.sort(key=lambda row: row["max_zones"])
+    return table
+
+
+def configure(source: Union[str, Dict, List[Dict], None]):
+    """Sets the global strategy table (None = built-in auto rule)."""
+    global _default_table
+    _default_table = load_table(source) if source is not None else None
+
+
+def default_table() -> Optional[List[Dict]]:
+    return _default_table
+
+
+def choose(table: Optional[List[Dict]], zones: int) -> Optional[str]:
+    """Recommended solver for ``zones`` zones, or None when there is no table."""
+    if not table:
+        return None
+    for row in table:
+        if zones <= row["max_zones"]:
+            return row["solver"]
+    return table[-1]["solver"]
+
+
+if os.environ.get("ALLOCATOR_STRATEGY_TABLE"):
+    configure(os.environ["ALLOCATOR_STRATEGY_TABLE"])
@@ -3,13 +3,44 @@ Volunteer Allocation Optimizer
 
 Mathematical optimization model for allocating volunteers across disaster zones.
 Uses linear/integer programming to maximize impact while respecting constraints.
+
+PuLP is imported only when the CBC solver runs; the exact separable solver
+(optimization.separable) needs no solver stack.
 """
 
-from pulp import LpProblem, LpMaximize, LpVariable, LpInteger, lpSum, value, PULP_CBC_CMD
-from typing import List, Dict
+from typing import List, Dict, Iterable, Mapping, Optional, Tuple
+import tempfile
 import time
 from datetime import datetime
 
+from monitoring import tracing
+from .profiling import PhaseProfiler
+from .separable import STATUS_OPTIMAL, feasible, solve_columns, solve_separable, zone_bounds
+from . import depots as depot_model, hierarchical, proximity, scenarios, sensitivity, strategy
+from .budget_curve import BudgetCurve
+from .fairness import FairnessAccumulator, fairness_metrics
+
+# "exact": separable greedy solver (optimal for this model, no PuLP)
+# "cbc":   integer program solved by CBC through PuLP
+# "auto":  the strategy table's pick for the zone count when one is loaded
+#          (optimization.strategy), else exact; either way, falling back to
+#          CBC when the exact solver reports infeasible
+# "hierarchical": the exact model solved region by region, in parallel for
+#          large inputs (optimization.hierarchical)
+SOLVERS = ("auto", "exact", "cbc", "hierarchical")
+# allocate(..., staging_points=...) always uses the travel-cost solver
+# (optimization.proximity), reported as solver "proximity"; likewise
+# allocate(..., depots=...) the shared-depot model (optimization.depots),
+# reported as solver "depots"
+# Result "model_type" for each solver that can produce a plan
+MODEL_TYPES = {
+    "exact": "Separable Greedy",
+    "cbc": "Integer Program",
+    "hierarchical": "Regional Decomposition",
+    "proximity": "Travel-Cost Greedy",
+    "depots": "LP Relaxation with Rounding",
+}
+
 
 class VolunteerAllocator:
     """
@@ -23,7 +54,9 @@ class VolunteerAllocator:
     - Integer decision variables (Phase 6)
     """
     
-    def __init__(self, fairness_weight: float = 0.0):
+    def __init__(self, fairness_weight: float = 0.0, solver: str = "auto", strategy_table=None,
+                 cost_per_km: float = proximity.COST_PER_KM, candidates: int = proximity.CANDIDATES,
+                 region_key: str = "region", workers: Optional[int] = None):
         """
         Initialize the allocator.
         
@@ -32,14 +65,35 @@ class VolunteerAllocator:
                            When > 0, ensures each zone gets minimum baseline allocation
                            proportional to severity before optimizing remainder.
                            Recommended: 0.6 (balanced fairness + severity priority).
+            solver: "auto", "exact", "cbc" or "hierarchical" (see SOLVERS)
+            strategy_table: Recommended-solver table for "auto" (path, report dict
+                           or rows; see optimization.strategy). Defaults to the
+                           globally configured table, if any.
+            cost_per_km: Objective penalty per volunteer-km when allocating from
+                        staging points (severity units)
+            candidates: Nearest staging points considered per zone
+            region_key: Zone field naming its region (solver="hierarchical")
+            workers: Processes for the region solves (solver="hierarchical";
+                    None = one per region, up to the CPU count)
         """
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver {solver!r}; expected one of {list(SOLVERS)}")
         self.fairness_weight = fairness_weight
+        self.solver = solver
+        self.strategy_table = strategy.load_table(strategy_table) if strategy_table is not None else None
+        self.cost_per_km = cost_per_km
+        self.candidates = candidates
+        self.region_key = region_key
+        self.workers = workers
         self.model_version = "0.2.0"  # Updated for simplified fairness
     
     def allocate(
         self,
         zones: List[Dict],
-        total_volunteers: int
+        total_volunteers: int,
+        profile: Optional[Iterable[str]] = None,
+        staging_points: Optional[List[Dict]] = None,
+        depots: Optional[List[Dict]] = None
     ) -> Dict:
         """
         Solve optimal volunteer allocation problem.
@@ -52,7 +106,19 @@ class VolunteerAllocator:
                 - capacity: Max volunteers zone can hold (int) [Phase 3]
                 - resources_available: Total resource units (int) [Phase 4]
                 - min_resources_per_volunteer: Resource ratio (float) [Phase 4]
+                - latitude / longitude: Zone location (only with staging_points)
+                - depot / resources_needed: Shared depot and units per
+                  volunteer by resource type (only with depots)
             total_volunteers: Total volunteers available to allocate (int)
+            profile: Extra capture for this call, any of "cprofile",
+                "tracemalloc", "solver" (None = global setting, see
+                optimization.profiling.configure)
+            staging_points: Where volunteers start (id, latitude, longitude,
+                volunteers). When given, travel distance is penalized and each
+                plan entry lists its sources (see optimization.proximity)
+            depots: Shared depots (id, supplies by resource type) the zones
+                draw from; couples zones through each depot's stock (see
+                optimization.depots). Not combined with staging_points
             
         Returns:
             Dictionary with:
@@ -60,13 +126,235 @@ class VolunteerAllocator:
                 - remaining_volunteers: Unallocated volunteers
                 - objective_value: Optimal objective function value
                 - solve_time_seconds: Time to solve (seconds)
-                - model_type: "Integer Program" or "Linear Program"
+                - phase_timings_seconds: Model build / solve / extract / metrics split
+                - profile: Capture summary (only when profiling is enabled)
+                - model_type: How the plan was solved, per solver (see MODEL_TYPES)
+                - solver: "exact", "cbc", "hierarchical", "proximity" or "depots" (the one that
+                  produced the plan)
+                - fairness_metrics: Spread (variance, CV, Gini, Jain's index) and
+                  satisfaction of the plan (see optimization.fairness)
+                - travel: Volunteer-km totals (only with staging_points)
+                - decomposition: Regions, bound, gap and stage times (only hierarchical)
+                - depots: Per depot and resource supply, use and shadow price,
+                  LP bound and gap, build / solve times (only with depots)
+                - sensitivity: Shadow prices, binding constraints and ranges for
+                  what-if queries (optimal plans without staging_points or
+                  depots; see optimization.sensitivity)
                 - timestamp: ISO format timestamp
         """
-        
+        with tracing.span("optimizer.allocate", zones=len(zones)):
+            profiler = PhaseProfiler(profile).start()
+            try:
+                result = self._allocate(zones, total_volunteers, profiler, staging_points, depots)
+            finally:
+                profiler.stop()
+            tracing.record_phases(profiler.timings, profiler.started, prefix="allocate.")
+            return result
+
+    def allocate_scenarios(self, scenario_set: List[Dict], total_volunteers: int, mode: str = "expected",
+                           weights: Optional[List[float]] = None, workers: Optional[int] = None) -> Dict:
+        """
+        One commitment of volunteers across candidate scenarios (each with
+        "zones" and optional "scenario_id" / "weight"), maximizing the
+        expected or, with mode="robust", the worst-case value. Solved by
+        scenario decomposition; see optimization.scenarios.solve_scenarios
+        for the result keys.
+        """
+        with tracing.span("optimizer.allocate_scenarios", scenarios=len(scenario_set), mode=mode):
+            result = scenarios.solve_scenarios(scenario_set, total_volunteers, self.fairness_weight, mode,
+                                               weights, workers)
+            result["timestamp"] = datetime.utcnow().isoformat()
+            result["fairness_weight"] = self.fairness_weight
+            return result
+
+    def allocate_columns(self, columns: Mapping, total_volunteers: Optional[int] = None) -> Dict:
+        """
+        Exact allocation for zones given as field columns rather than dicts:
+        a columnar scenario (datasets.columnar.ColumnarScenario, columns
+        memory-mapped) or any mapping of zone field -> numpy array (NaN where
+        a zone lacks a field). No per-zone dict or plan entry is built.
+
+        Args:
+            total_volunteers: Defaults to the scenario's available_volunteers;
+                required for inputs without a header (e.g. a CSV ZoneTable)
+
+        Returns:
+            Dictionary with allocations (int64 array in row order),
+            remaining_volunteers, objective_value, solve_time_seconds,
+            model_type ("Separable Greedy"), solver ("exact"), solver_status, fairness_weight,
+            fairness_metrics and timestamp
+        """
+        if total_volunteers is None:
+            header = getattr(columns, "header", None) or {}
+            if "available_volunteers" not in header:
+                raise ValueError("total_volunteers is required: the columns carry no available_volunteers header")
+            total_volunteers = header["available_volunteers"]
+        with tracing.span("optimizer.allocate_columns", zones=len(columns['severity'])):
+            start_time = time.time()
+            allocations, objective, status = solve_columns(columns, total_volunteers, self.fairness_weight)
+            solve_time = time.time() - start_time
+            required = columns['required_volunteers'] if 'required_volunteers' in columns else None
+            return {
+                "allocations": allocations,
+                "remaining_volunteers": total_volunteers - int(allocations.sum()),
+                "objective_value": round(objective, 2),
+                "solve_time_seconds": round(solve_time, 4),
+                "model_type": MODEL_TYPES["exact"],
+                "solver": "exact",
+                "solver_status": status,
+                "fairness_weight": self.fairness_weight,
+                "fairness_metrics": fairness_metrics(allocations, columns['severity'], required),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+    def budget_curve(self, zones: List[Dict], max_volunteers: int) -> BudgetCurve:
+        """
+        Optimal objective for every budget up to ``max_volunteers`` in one
+        pass (see optimization.budget_curve). With fairness_weight > 0 the
+        fairness minimums are those of ``max_volunteers``, held fixed along
+        the curve.
+        """
+        with tracing.span("optimizer.budget_curve", zones=len(zones)):
+            bounds = zone_bounds(zones, max_volunteers, self.fairness_weight) if self.fairness_weight > 0 else None
+            return BudgetCurve(zones, max_volunteers, bounds)
+
+    def _allocate(self, zones: List[Dict], total_volunteers: int, profiler: PhaseProfiler,
+                  staging_points: Optional[List[Dict]] = None, depots: Optional[List[Dict]] = None) -> Dict:
         # Start timing
         start_time = time.time()
         
+        solver = self.solver
+        sources = decomposition = depot_report = None
+        if staging_points is not None and depots is not None:
+            raise ValueError("staging_points and depots cannot be combined")
+        if staging_points is not None:
+            solver = "proximity"
+        elif depots is not None:
+            solver = "depots"
+        elif solver == "auto":
+            table = self.strategy_table if self.strategy_table is not None else strategy.default_table()
+            solver = strategy.choose(table, len(zones)) or "exact"
+        if solver != "cbc":
+            # Apart from CBC's, every solver's model starts from the zone bounds
+            bounds = zone_bounds(zones, total_volunteers, self.fairness_weight)
+        if solver == "exact" and self.solver == "auto" and not feasible(bounds, total_volunteers):
+            # Let CBC solve (and report on) infeasible instances, as before the exact path existed
+            solver = "cbc"
+        if solver != "cbc":
+            profiler.mark("build")
+        if solver == "proximity":
+            allocations, objective, status, sources = proximity.solve_proximity(
+                zones, staging_points, total_volunteers, self.fairness_weight, self.cost_per_km, self.candidates,
+                bounds)
+        elif solver == "depots":
+            allocations, objective, status, depot_report = depot_model.solve_depots(
+                zones, depots, total_volunteers, self.fairness_weight, bounds)
+        elif solver == "exact":
+            allocations, objective, status = solve_separable(zones, total_volunteers, self.fairness_weight, bounds)
+        elif solver == "hierarchical":
+            allocations, objective, status, decomposition = hierarchical.solve_hierarchical(
+                zones, total_volunteers, self.fairness_weight, self.region_key, self.workers, bounds=bounds)
+        else:
+            allocations, objective, status = self._solve_cbc(zones, total_volunteers, profiler)
+        
+        # Calculate solve time
+        solve_time = time.time() - start_time
+        
+        # Extract results
+        profiler.mark("solve")
+        if depot_report is not None:
+            # The depot rows are built inside solve_depots, which times the build itself
+            profiler.transfer(depot_report["build_seconds"], "solve", "build")
+        allocation_plan = []
+        fairness = FairnessAccumulator()
+        for i, (zone, allocated) in enumerate(zip(zones, allocations)):
+            
+            # Calculate satisfaction percentage
+            satisfaction = 0
+            if zone.get('required_volunteers', 0) > 0:
+                satisfaction = (allocated / zone['required_volunteers']) * 100
+            
+            # Calculate capacity usage percentage
+            capacity_used = 0
+            if 'capacity' in zone and zone['capacity'] > 0:
+                capacity_used = (allocated / zone['capacity']) * 100
+            
+            # Calculate resource usage
+            resources_used = 0
+            resources_used_pct = 0
+            if 'min_resources_per_volunteer' in zone:
+                resources_used = allocated * zone['min_resources_per_volunteer']
+                if 'resources_available' in zone and zone['resources_available'] > 0:
+                    resources_used_pct = (resources_used / zone['resources_available']) * 100
+            
+            allocation_plan.append({
+                "zone_id": zone['id'],
+                "severity": zone['severity'],
+                "required": zone.get('required_volunteers', 0),
+                "capacity": zone.get('capacity', None),
+                "allocated": allocated,
+                "satisfaction_pct": round(satisfaction, 1),
+                "capacity_used_pct": round(capacity_used, 1) if 'capacity' in zone else None,
+                "resources_used": round(resources_used, 1) if 'min_resources_per_volunteer' in zone else None,
+                "resources_used_pct": round(resources_used_pct, 1) if 'resources_available' in zone else None
+            })
+            if sources is not None:
+                allocation_plan[-1]["sources"] = sources[i]
+            # Fairness statistics in the same pass (see optimization.fairness)
+            fairness.add(allocated, zone['severity'], zone.get('required_volunteers', 0))
+        
+        profiler.mark("extract")
+        
+        # Calculate totals
+        total_allocated = sum(allocations)
+        fairness_metrics = fairness.metrics()
+        sensitivity_report = None
+        if solver not in ("proximity", "depots") and status == STATUS_OPTIMAL:
+            if solver == "cbc":
+                bounds = zone_bounds(zones, total_volunteers, self.fairness_weight)
+            sensitivity_report = sensitivity.analyze(zones, allocations, total_volunteers, self.fairness_weight,
+                                                     bounds)
+        
+        profiler.mark("metrics")
+        profile_record = profiler.finish(zones=len(zones), total_volunteers=total_volunteers)
+        
+        # Build result dictionary
+        result = {
+            "allocation_plan": allocation_plan,
+            "remaining_volunteers": total_volunteers - total_allocated,
+            "objective_value": round(objective, 2),
+            "solve_time_seconds": round(solve_time, 4),
+            "phase_timings_seconds": profiler.timings,
+            "model_type": MODEL_TYPES[solver],
+            "solver": solver,
+            "timestamp": datetime.utcnow().isoformat(),
+            "fairness_weight": self.fairness_weight,
+            "fairness_metrics": fairness_metrics,
+            "solver_status": status
+        }
+        if sources is not None:
+            volunteer_km = sum(s["volunteers"] * s["distance_km"] for entry in sources for s in entry)
+            result["travel"] = {
+                "cost_per_km": self.cost_per_km,
+                "volunteer_km": round(volunteer_km, 2),
+                "mean_distance_km": round(volunteer_km / total_allocated, 3) if total_allocated else 0,
+            }
+        if decomposition is not None:
+            result["decomposition"] = decomposition
+        if depot_report is not None:
+            result["depots"] = depot_report
+        if sensitivity_report is not None:
+            result["sensitivity"] = sensitivity_report
+        if profile_record is not None:
+            result["profile"] = profile_record
+        
+        return result
+    
+    def _solve_cbc(self, zones: List[Dict], total_volunteers: int,
+                   profiler: PhaseProfiler) -> Tuple[List[int], float, int]:
+        """Builds the integer program and solves it with CBC; marks "build" before solving."""
+        from pulp import LpProblem, LpMaximize, LpVariable, LpInteger, lpSum, value, PULP_CBC_CMD
+
         # Create the optimization problem
         prob = LpProblem("Disaster_Volunteer_Allocation", LpMaximize)
         
@@ -128,80 +416,13 @@ class VolunteerAllocator:
                 ), f"Resource_Coupling_{zone_id}"
         
         # Solve the problem
-        prob.solve(PULP_CBC_CMD(msg=0))  # msg=0 suppresses solver output
-        
-        # Calculate solve time
-        solve_time = time.time() - start_time
+        profiler.mark("build")
+        # msg=0 suppresses solver output; the log is only written when profiling the solver
+        prob.solve(PULP_CBC_CMD(msg=0, logPath=profiler.solver_log(tempfile.gettempdir())))
         
-        # Extract results
-        allocation_plan = []
-        for zone in zones:
-            allocated = int(value(x[zone['id']]))
-            
-            # Calculate satisfaction percentage
-            satisfaction = 0
-            if zone.get('required_volunteers', 0) > 0:
-                satisfaction = (allocated / zone['required_volunteers']) * 100
-            
-            # Calculate capacity usage percentage
-            capacity_used = 0
-            if 'capacity' in zone and zone['capacity'] > 0:
-                capacity_used = (allocated / zone['capacity']) * 100
-            
-            # Calculate resource usage
-            resources_used = 0
-            resources_used_pct = 0
-            if 'min_resources_per_volunteer' in zone:
-                resources_used = allocated * zone['min_resources_per_volunteer']
-                if 'resources_available' in zone and zone['resources_available'] > 0:
-                    resources_used_pct = (resources_used / zone['resources_available']) * 100
-            
-            allocation_plan.append({
-                "zone_id": zone['id'],
-                "severity": zone['severity'],
-                "required": zone.get('required_volunteers', 0),
-                "capacity": zone.get('capacity', None),
-                "allocated": allocated,
-                "satisfaction_pct": round(satisfaction, 1),
-                "capacity_used_pct": round(capacity_used, 1) if 'capacity' in zone else None,
-                "resources_used": round(resources_used, 1) if 'min_resources_per_volunteer' in zone else None,
-                "resources_used_pct": round(resources_used_pct, 1) if 'resources_available' in zone else None
-            })
-        
-        # Calculate totals
-        total_allocated = sum(entry['allocated'] for entry in allocation_plan)
-        
-        # Calculate fairness metrics
-        allocations = [entry['allocated'] for entry in allocation_plan]
-        if len(allocations) > 0:
-            mean_allocation = sum(allocations) / len(allocations)
-            variance = sum((a - mean_allocation) ** 2 for a in allocations) / len(allocations)
-            std_deviation = variance ** 0.5
-        else:
-            mean_allocation = 0
-            variance = 0
-            std_deviation = 0
-        
-        # Build result dictionary
-        result = {
-            "allocation_plan": allocation_plan,
-            "remaining_volunteers": total_volunteers - total_allocated,
-            "objective_value": round(value(prob.objective), 2),
-            "solve_time_seconds": round(solve_time, 4),
-            "model_type": "Integer Program",
-            "timestamp": datetime.utcnow().isoformat(),
-            "fairness_weight": self.fairness_weight,
-            "fairness_metrics": {
-                "mean_allocation": round(mean_allocation, 2),
-                "variance": round(variance, 2),
-                "std_deviation": round(std_deviation, 2),
-                "coefficient_of_variation": round(std_deviation / mean_allocation * 100, 2) if mean_allocation > 0 else 0
-            },
-            "solver_status": prob.status
-        }
-        
-        return result
-    
+        allocations = [int(value(x[zone['id']])) for zone in zones]
+        return allocations, value(prob.objective), prob.status
+
     def get_model_info(self) -> Dict:
         """
         Get information about the optimization model.
@@ -212,11 +433,14 @@ class VolunteerAllocator:
         return {
             "version": self.model_version,
             "fairness_weight": self.fairness_weight,
+            "solver": self.solver,
+            "cost_per_km": self.cost_per_km,
             "features": {
                 "severity_optimization": True,
                 "capacity_constraints": True,       # Per-zone maximum volunteer limits
                 "resource_coupling": True,          # Equipment availability constraints
                 "fairness_penalty": self.fairness_weight > 0,  # Proportional minimum allocation guarantee
-                "integer_variables": True           # Whole volunteer allocation
+                "integer_variables": True,          # Whole volunteer allocation
+                "shared_depots": True               # Multi-resource depot coupling (allocate(depots=...))
             }
         }
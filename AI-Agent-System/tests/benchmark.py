@@ -14,6 +14,7 @@ Scenarios:
 - Small (4 zones, 40 volunteers)
 - Medium (10 zones, 100 volunteers)
 - Large (50 zones, 500 volunteers)
+- National (40,000 zones in 8 regions, hierarchical solver)
 - Realistic disaster situations
 """
 
@@ -22,6 +23,8 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from optimization.volunteer_allocator import VolunteerAllocator
+from optimization.fairness import fairness_metrics
+from datasets.generator import ScenarioGenerator
 import time
 import statistics
 
@@ -68,24 +71,24 @@ def greedy_allocation(zones, total_volunteers):
     # Calculate objective (severity-weighted allocation)
     objective = sum(zone['severity'] * allocations[zone['id']] for zone in zones)
     
-    # Calculate fairness metrics
-    alloc_values = list(allocations.values())
-    mean_alloc = sum(alloc_values) / len(alloc_values) if alloc_values else 0
-    variance = sum((a - mean_alloc) ** 2 for a in alloc_values) / len(alloc_values) if alloc_values else 0
+    # Calculate fairness metrics (same definitions as the optimizer's)
+    fairness = fairness_metrics([allocations[zone['id']] for zone in zones], [zone['severity'] for zone in zones],
+                                [zone.get('required_volunteers', 0) for zone in zones])
     
     solve_time = time.time() - start_time
     
     return {
         'allocations': allocations,
         'objective': objective,
-        'variance': variance,
+        'variance': fairness['variance'],
+        'fairness': fairness,
         'solve_time': solve_time,
         'remaining': available,
         'constraint_violations': constraint_violations
     }
 
 
-def run_benchmark(scenario_name, zones, total_volunteers, fairness_weight=0.6):
+def run_benchmark(scenario_name, zones, total_volunteers, fairness_weight=0.6, solver="auto"):
     """
     Run both algorithms and compare results.
     """
@@ -98,7 +101,7 @@ def run_benchmark(scenario_name, zones, total_volunteers, fairness_weight=0.6):
     greedy_result = greedy_allocation(zones, total_volunteers)
     
     # Run optimization engine
-    optimizer = VolunteerAllocator(fairness_weight=fairness_weight)
+    optimizer = VolunteerAllocator(fairness_weight=fairness_weight, solver=solver)
     opt_result = optimizer.allocate(zones, total_volunteers)
     
     # Transform optimizer result for comparison
@@ -112,6 +115,7 @@ def run_benchmark(scenario_name, zones, total_volunteers, fairness_weight=0.6):
     print(f"   Solve Time: {greedy_result['solve_time']:.4f}s")
     print(f"   Objective: {greedy_result['objective']:.2f}")
     print(f"   Variance: {greedy_result['variance']:.2f}")
+    print(f"   Gini / Jain: {greedy_result['fairness']['gini']:.3f} / {greedy_result['fairness']['jain_index']:.3f}")
     print(f"   Remaining: {greedy_result['remaining']}")
     if greedy_result['constraint_violations']:
         print(f"   ⚠️  Constraint Violations: {len(greedy_result['constraint_violations'])}")
@@ -120,7 +124,13 @@ def run_benchmark(scenario_name, zones, total_volunteers, fairness_weight=0.6):
     print(f"   Solve Time: {opt_result['solve_time_seconds']:.4f}s")
     print(f"   Objective: {opt_result['objective_value']:.2f}")
     print(f"   Variance: {opt_result['fairness_metrics']['variance']:.2f}")
+    print(f"   Gini / Jain: {opt_result['fairness_metrics']['gini']:.3f} / "
+          f"{opt_result['fairness_metrics']['jain_index']:.3f}")
     print(f"   Remaining: {opt_result['remaining_volunteers']}")
+    if 'decomposition' in opt_result:
+        decomposition = opt_result['decomposition']
+        print(f"   Regions: {decomposition['regions']} (gap {decomposition['gap']:.4f}, "
+              f"{decomposition['optimality']} optimal)")
     
     # Calculate improvements
     obj_improvement = ((opt_result['objective_value'] - greedy_result['objective']) / greedy_result['objective']) * 100
@@ -202,6 +212,14 @@ def main():
         for i in range(50)
     ]
     results.append(run_benchmark("Large (National Emergency)", zones_large, 500))
+
+    # Scenario 3b: National scale, one generated region per affected state
+    zones_national = []
+    for r in range(8):
+        for zone in ScenarioGenerator(seed=r, bottleneck_rate=0.0).zones(5000):
+            zone["id"], zone["region"] = f"R{r + 1}-{zone['id']}", f"R{r + 1}"
+            zones_national.append(zone)
+    results.append(run_benchmark("National (Hierarchical)", zones_national, 200000, solver="hierarchical"))
     
     # Scenario 4: Realistic - Earthquake disaster
     zones_earthquake = [
@@ -0,0 +1,111 @@
+"""
+Codec Benchmark: JSON vs Compact Columnar Messages
+
+Measures payload size and encode/decode time of a task_assignment message
+carrying dataset-shaped zones (id, name, coordinates, severity, capacity,
+resources, hazards) at 10, 1k and 100k zones.
+
+Usage:
+    python benchmark_codec.py [--sizes 10 1000 100000] [--repeats 5]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import statistics
+import time
+
+from communication import codec, protocol
+from communication.models import Message, Task
+
+
+def make_zones(count):
+    return [
+        {
+            "id": f"Z{i+1}",
+            "name": f"Zone {i+1}",
+            "latitude": 40.0 + (i % 1000) * 0.001,
+            "longitude": -74.0 - (i // 1000) * 0.001,
+            "severity": 10 - (i % 10),
+            "required_volunteers": 5 + (i % 7),
+            "capacity": 15 + (i % 10),
+            "resources_available": 100 - (i % 30),
+            "min_resources_per_volunteer": 3 + (i % 3),
+            "hazards": ["Flooding", "Debris", "Power outage"][: 1 + (i % 3)]
+        }
+        for i in range(count)
+    ]
+
+
+def time_call(fn, repeats):
+    """Median wall time of ``fn`` over ``repeats`` runs."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run_size(num_zones, repeats):
+    msg = Message.new(
+        sender="Supervisor_Main",
+        recipient="Worker_Disaster",
+        msg_type=protocol.TASK_ASSIGNMENT,
+        task=Task(name="allocate_resources", priority=1,
+                  parameters={"zones": make_zones(num_zones), "available_volunteers": num_zones * 5}),
+    )
+    envelope = msg.dict()
+
+    json_bytes = codec.encode_message(envelope, protocol.CONTENT_TYPE_JSON)
+    compact_bytes = codec.encode_message(envelope, protocol.CONTENT_TYPE_COMPACT)
+    # The compact envelope omits null fields; Message.decode restores them
+    assert Message.decode(compact_bytes) == Message.decode(json_bytes)
+
+    return {
+        "zones": num_zones,
+        "json_bytes": len(json_bytes),
+        "compact_bytes": len(compact_bytes),
+        "json_encode": time_call(lambda: codec.encode_message(envelope, protocol.CONTENT_TYPE_JSON), repeats),
+        "compact_encode": time_call(lambda: codec.encode_message(envelope, protocol.CONTENT_TYPE_COMPACT), repeats),
+        "json_decode": time_call(lambda: codec.decode_message(json_bytes), repeats),
+        "compact_decode": time_call(lambda: codec.decode_message(compact_bytes), repeats),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark JSON vs compact message codec")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("CODEC BENCHMARK: JSON VS COMPACT COLUMNAR")
+    print("=" * 70)
+
+    results = [run_size(n, args.repeats) for n in args.sizes]
+
+    print("\n📦 Payload Size:\n")
+    print(f"   {'Zones':>8} | {'JSON':>12} | {'Compact':>12} | {'Ratio':>6}")
+    print(f"   {'-'*8}-+-{'-'*12}-+-{'-'*12}-+-{'-'*6}")
+    for r in results:
+        ratio = r['compact_bytes'] / r['json_bytes']
+        print(f"   {r['zones']:>8} | {r['json_bytes']:>10} B | {r['compact_bytes']:>10} B | {ratio:>6.2f}")
+
+    print("\n⏱️  Encode / Decode Time (median):\n")
+    print(f"   {'Zones':>8} | {'JSON enc':>10} | {'Cmp enc':>10} | {'JSON dec':>10} | {'Cmp dec':>10}")
+    print(f"   {'-'*8}-+-{'-'*10}-+-{'-'*10}-+-{'-'*10}-+-{'-'*10}")
+    for r in results:
+        print(f"   {r['zones']:>8} | {r['json_encode']:>9.4f}s | {r['compact_encode']:>9.4f}s | "
+              f"{r['json_decode']:>9.4f}s | {r['compact_decode']:>9.4f}s")
+
+    print("\n" + "=" * 70)
+    print("CODEC BENCHMARK COMPLETE ✅")
+    print("=" * 70)
+    return results
+
+
+if __name__ == "__main__":
+    main()
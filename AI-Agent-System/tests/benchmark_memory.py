@@ -0,0 +1,283 @@
+"""
+Memory Footprint Benchmark
+
+Measures the memory cost of the allocation and caching paths at several
+zone counts and LTM sizes:
+
+1. allocate          - VolunteerAllocator.allocate
+2. process_task      - DisasterAllocationWorker.process_task (LTM miss: read, solve, write)
+3. ltm_write         - write_to_ltm into an LTM file already holding N entries
+4. ltm_read          - read_from_ltm from the same file
+5. roundtrip_json    - task_assignment Message encode + decode, JSON
+6. roundtrip_compact - the same with the compact codec
+
+For every call it records:
+- peak_mb:       tracemalloc peak above the pre-call level
+- retained_mb:   traced memory still held after the call (result dropped, gc run)
+- rss_peak_mb:   sampled process RSS peak above the pre-call RSS
+- rss_retained_mb: RSS growth left after the call
+
+Budgets (MB, per metric and path) fail the run with exit status 1 when any
+row exceeds them. Defaults are in BUDGETS; override with
+``--budget path.metric=MB`` (repeatable) or ``--budget-file budgets.json``
+shaped like BUDGETS.
+
+Usage:
+    python benchmark_memory.py [--sizes 100 1000 10000] [--ltm-entries 0 10]
+                               [--budget allocate.peak_mb=150] [--budget-file budgets.json]
+                               [--out memory_results.json]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import tempfile
+import threading
+import tracemalloc
+from datetime import datetime
+
+from agents.workers.disaster_worker import DisasterAllocationWorker
+from communication import protocol
+from communication.models import Message, Task
+from datasets.generator import ScenarioGenerator
+from optimization.volunteer_allocator import VolunteerAllocator
+
+PATHS = ["allocate", "process_task", "ltm_write", "ltm_read", "roundtrip_json", "roundtrip_compact"]
+METRICS = ["peak_mb", "retained_mb", "rss_peak_mb", "rss_retained_mb"]
+
+# Default budgets (MB), sized for the default scales with headroom
+BUDGETS = {
+    "allocate": {"peak_mb": 150, "retained_mb": 5},
+    "process_task": {"peak_mb": 400, "retained_mb": 10, "rss_peak_mb": 600},
+    "ltm_write": {"peak_mb": 400, "retained_mb": 5},
+    "ltm_read": {"peak_mb": 250, "retained_mb": 5},
+    "roundtrip_json": {"peak_mb": 100, "retained_mb": 5},
+    "roundtrip_compact": {"peak_mb": 100, "retained_mb": 5},
+}
+
+MB = 1024 * 1024
+
+
+# ----------------------------------------------------------------------
+# MEASUREMENT
+# ----------------------------------------------------------------------
+def rss_bytes():
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RssSampler:
+    """Samples RSS on a background thread and keeps the maximum."""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            current = rss_bytes()
+            if current is not None and current > self.peak:
+                self.peak = current
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if self.peak is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.peak is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, rss_bytes())
+        return False
+
+
+def measure(fn):
+    """Runs ``fn`` once (discarding its result) and returns the four metrics in MB."""
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    traced_before, _ = tracemalloc.get_traced_memory()
+    with RssSampler() as sampler:
+        fn()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    traced_after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_bytes()
+
+    def mb(nbytes):
+        return round(nbytes / MB, 3) if nbytes is not None else None
+
+    return {
+        "peak_mb": mb(traced_peak - traced_before),
+        "retained_mb": mb(max(0, traced_after - traced_before)),
+        "rss_peak_mb": mb(sampler.peak - rss_before) if rss_before is not None else None,
+        "rss_retained_mb": mb(max(0, rss_after - rss_before)) if rss_before is not None else None,
+    }
+
+
+# ----------------------------------------------------------------------
+# PATHS
+# ----------------------------------------------------------------------
+def prefill_ltm(worker, zones, entries):
+    """Writes ``entries`` realistic cache entries (full task keys, full plans) in one pass."""
+    plan = [{"zone_id": z["id"], "assigned_volunteers": 1, "severity": z["severity"]} for z in zones]
+    data = {}
+    for i in range(entries):
+        key = json.dumps({"zones": zones, "available_volunteers": 10 ** 6 + i,
+                          "fairness_weight": worker.optimizer.fairness_weight}, sort_keys=True)
+        data[key] = {"allocation_plan": plan, "remaining_volunteers": 0}
+    worker.ltm_file.write_text(json.dumps(data, indent=2))
+
+
+def task_message(zones, volunteers, content_type):
+    return Message.new(
+        sender="Supervisor_Main",
+        recipient="Worker_Disaster",
+        msg_type=protocol.TASK_ASSIGNMENT,
+        task=Task(name="allocate_resources", priority=1,
+                  parameters={"zones": zones, "available_volunteers": volunteers}),
+        content_type=content_type,
+    )
+
+
+def run_scale(num_zones, ltm_entries, worker_id):
+    """Measures every path for one (zones, LTM entries) scale."""
+    generator = ScenarioGenerator(seed=0)
+    scenario = generator.scenario(0, num_zones)
+    zones, volunteers = scenario["zones"], scenario["available_volunteers"]
+    allocator = VolunteerAllocator(fairness_weight=0.6)
+    allocator.allocate(zones[:10], 50)  # warm imports and solver paths outside the measurement
+
+    worker = DisasterAllocationWorker(worker_id, "Supervisor_Main")
+    prefill_ltm(worker, zones, ltm_entries)
+    task = {"zones": zones, "available_volunteers": volunteers}
+    value = {"allocation_plan": [{"zone_id": z["id"], "assigned_volunteers": 1, "severity": z["severity"]}
+                                 for z in zones], "remaining_volunteers": 0}
+    key = json.dumps({**task, "fairness_weight": 0.6}, sort_keys=True)
+
+    calls = {
+        "allocate": lambda: allocator.allocate(zones, volunteers),
+        "process_task": lambda: worker.process_task(task),
+        "ltm_write": lambda: worker.write_to_ltm(key + "#write", value),
+        "ltm_read": lambda: worker.read_from_ltm(key),
+        "roundtrip_json": lambda: Message.decode(
+            task_message(zones, volunteers, protocol.CONTENT_TYPE_JSON).encode()),
+        "roundtrip_compact": lambda: Message.decode(
+            task_message(zones, volunteers, protocol.CONTENT_TYPE_COMPACT).encode()),
+    }
+    rows = []
+    for path in PATHS:
+        rows.append({"path": path, "zones": num_zones, "ltm_entries": ltm_entries, **measure(calls[path])})
+    return rows
+
+
+# ----------------------------------------------------------------------
+# BUDGETS
+# ----------------------------------------------------------------------
+def load_budgets(budget_file, overrides):
+    """BUDGETS, updated from ``budget_file`` and then ``path.metric=MB`` overrides."""
+    budgets = {path: dict(limits) for path, limits in BUDGETS.items()}
+    if budget_file:
+        with open(budget_file, encoding="utf-8") as f:
+            for path, limits in json.load(f).items():
+                budgets.setdefault(path, {}).update(limits)
+    for item in overrides:
+        name, _, limit = item.partition("=")
+        path, _, metric = name.partition(".")
+        if path not in PATHS or metric not in METRICS or not limit:
+            raise ValueError(f"Bad budget {item!r}; expected path.metric=MB with path in {PATHS} "
+                             f"and metric in {METRICS}")
+        budgets.setdefault(path, {})[metric] = float(limit)
+    return budgets
+
+
+def check_budgets(rows, budgets):
+    """Rows exceeding a budget: (path, zones, ltm_entries, metric, measured, limit)."""
+    violations = []
+    for row in rows:
+        for metric, limit in budgets.get(row["path"], {}).items():
+            measured = row.get(metric)
+            if measured is not None and measured > limit:
+                violations.append((row["path"], row["zones"], row["ltm_entries"], metric, measured, limit))
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory footprint benchmark with budgets")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ltm-entries", type=int, nargs="+", default=[0, 10],
+                        help="cache entries already in the LTM file")
+    parser.add_argument("--budget", action="append", default=[], metavar="PATH.METRIC=MB")
+    parser.add_argument("--budget-file", default=None)
+    parser.add_argument("--out", default=None, help="write results and budgets as JSON")
+    args = parser.parse_args(argv)
+    try:
+        budgets = load_budgets(args.budget_file, args.budget)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("=" * 70)
+    print("MEMORY FOOTPRINT BENCHMARK")
+    print("=" * 70)
+
+    rows = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        os.chdir(tmp)  # keep LTM files out of the repository
+        try:
+            for n in args.sizes:
+                for entries in args.ltm_entries:
+                    with contextlib.redirect_stdout(devnull):
+                        rows.extend(run_scale(n, entries, f"Worker_Memory_{n}_{entries}"))
+        finally:
+            os.chdir(cwd)
+
+    def fmt(v):
+        return f"{v:>8.2f}" if v is not None else f"{'n/a':>8}"
+
+    print(f"\n   {'Path':<18} | {'Zones':>6} | {'LTM':>4} | {'Peak MB':>8} | {'Kept MB':>8} | "
+          f"{'RSS pk':>8} | {'RSS kept':>8}")
+    print(f"   {'-'*18}-+-{'-'*6}-+-{'-'*4}-+-{'-'*8}-+-{'-'*8}-+-{'-'*8}-+-{'-'*8}")
+    for r in rows:
+        print(f"   {r['path']:<18} | {r['zones']:>6} | {r['ltm_entries']:>4} | {fmt(r['peak_mb'])} | "
+              f"{fmt(r['retained_mb'])} | {fmt(r['rss_peak_mb'])} | {fmt(r['rss_retained_mb'])}")
+
+    violations = check_budgets(rows, budgets)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"created": datetime.now().isoformat(), "python": platform.python_version(),
+                       "budgets": budgets, "results": rows,
+                       "violations": [dict(zip(["path", "zones", "ltm_entries", "metric", "measured", "limit"], v))
+                                      for v in violations]}, f, indent=2)
+        print(f"\n   JSON results: {args.out}")
+
+    print("\n" + "=" * 70)
+    if violations:
+        for path, zones, entries, metric, measured, limit in violations:
+            print(f"   ❌ {path} (zones={zones}, ltm={entries}): {metric} {measured:.2f} MB > budget {limit:.2f} MB")
+        print("MEMORY BUDGET EXCEEDED ❌")
+    else:
+        print("MEMORY BENCHMARK COMPLETE ✅ (all budgets met)")
+    print("=" * 70)
+    if violations and argv is None:
+        sys.exit(1)
+    return rows, violations
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Quality-versus-Latency Pareto Report
+
+Runs every allocation strategy over generated scenario families and sizes:
+
+- greedy: the legacy severity-order heuristic from benchmark.py (ignores
+  fairness minimums, reported as a reference point)
+- exact: VolunteerAllocator's separable solver
+- cbc:   VolunteerAllocator's integer program through CBC
+
+For every (family, size, strategy) it records the objective gap to the best
+feasible objective, the fairness CV (std / mean allocation, in %), median
+latency and whether the plan respects every constraint. Per size, the
+recommended solver is the fastest allocator solver that was feasible on
+every family with a gap of at most --max-gap; those rows are written as a
+strategy table that VolunteerAllocator(solver="auto") reads (see
+optimization.strategy).
+
+Usage:
+    python benchmark_pareto.py [--sizes 10 100 1000] [--repeats 3] [--fairness 0.6]
+                               [--max-gap 0.0] [--bottleneck-rate 0.0] [--cbc-max-zones 10000]
+                               [--out pareto.json] [--csv pareto.csv] [--table strategy.json]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import csv
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+
+from benchmark import greedy_allocation
+from datasets.generator import SEVERITY_PROFILES, ScenarioGenerator
+from optimization.fairness import fairness_metrics
+from optimization.separable import zone_bounds
+from optimization.volunteer_allocator import VolunteerAllocator
+
+SIZES = [10, 100, 1000]
+# One scenario family per severity profile
+FAMILIES = list(SEVERITY_PROFILES)
+STRATEGIES = ["greedy", "exact", "cbc"]
+FIELDS = ("id", "severity", "required_volunteers", "capacity", "resources_available", "min_resources_per_volunteer")
+
+# Tolerance when comparing objectives of two optimal solutions
+_GAP_EPS = 1e-9
+
+
+# ----------------------------------------------------------------------
+# SCENARIOS
+# ----------------------------------------------------------------------
+def make_case(family, size, bottleneck_rate=0.0, seed=0):
+    """
+    Zones and volunteer budget of one generated scenario in ``family``.
+    Resource bottlenecks are off by default: a bottlenecked zone usually
+    cannot hold its fairness minimum, which makes every solver infeasible.
+    """
+    generator = ScenarioGenerator(seed=seed, severity=family, bottleneck_rate=bottleneck_rate)
+    zones = [{field: zone[field] for field in FIELDS} for zone in generator.iter_zones(0, size)]
+    return zones, generator.header(0, size)["available_volunteers"]
+
+
+# ----------------------------------------------------------------------
+# STRATEGIES
+# ----------------------------------------------------------------------
+def run_strategy(name, zones, volunteers, fairness):
+    """Allocations (zone order) and objective of one call to strategy ``name``."""
+    if name == "greedy":
+        result = greedy_allocation(zones, volunteers)
+        allocations = [int(result["allocations"][zone["id"]]) for zone in zones]
+        return allocations, float(result["objective"])
+    result = VolunteerAllocator(fairness_weight=fairness, solver=name).allocate(zones, volunteers)
+    return [entry["allocated"] for entry in result["allocation_plan"]], result["objective_value"]
+
+
+def is_feasible(zones, volunteers, fairness, allocations):
+    """True when the plan fits the budget and every zone's bounds."""
+    lower, upper = zone_bounds(zones, volunteers, fairness)
+    return (sum(allocations) <= volunteers
+            and all(lo <= x <= hi for lo, hi, x in zip(lower, upper, allocations)))
+
+
+def fairness_cv(allocations):
+    """Coefficient of variation of the allocations in %, as in the allocator's fairness_metrics."""
+    return fairness_metrics(allocations)["coefficient_of_variation"]
+
+
+def measure(name, zones, volunteers, fairness, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        allocations, objective = run_strategy(name, zones, volunteers, fairness)
+        samples.append(time.perf_counter() - start)
+    return {
+        "objective": round(objective, 2),
+        "fairness_cv": round(fairness_cv(allocations), 2),
+        "latency_seconds": round(statistics.median(samples), 6),
+        "feasible": is_feasible(zones, volunteers, fairness, allocations),
+    }
+
+
+def run_report(sizes, strategies, fairness=0.6, repeats=3, cbc_max_zones=10000, families=None,
+               bottleneck_rate=0.0):
+    """Measured rows, one per (family, size, strategy), with objective gaps filled in."""
+    rows = []
+    for size in sizes:
+        for family in families or FAMILIES:
+            zones, volunteers = make_case(family, size, bottleneck_rate)
+            group = []
+            for name in strategies:
+                if name == "cbc" and size > cbc_max_zones:
+                    continue
+                group.append({"family": family, "zones": size, "volunteers": volunteers, "strategy": name,
+                              **measure(name, zones, volunteers, fairness, repeats)})
+            best = max((r["objective"] for r in group if r["feasible"]), default=None)
+            for r in group:
+                # Positive = worse than the best feasible plan; infeasible plans can go negative
+                r["objective_gap"] = round((best - r["objective"]) / best, 6) if best else None
+            rows.extend(group)
+    return rows
+
+
+# ----------------------------------------------------------------------
+# RECOMMENDATIONS
+# ----------------------------------------------------------------------
+def recommend(rows, max_gap=0.0):
+    """
+    Per size, the fastest allocator solver (by mean latency over families)
+    that was feasible with objective_gap <= max_gap on every family. Cases
+    no strategy solved feasibly (objective_gap None) cannot rank solvers and
+    are skipped.
+    """
+    recommendations = []
+    for size in sorted({r["zones"] for r in rows}):
+        candidates = []
+        for name in ("exact", "cbc"):
+            runs = [r for r in rows if r["zones"] == size and r["strategy"] == name
+                    and r["objective_gap"] is not None]
+            if runs and all(r["feasible"] and r["objective_gap"] <= max_gap + _GAP_EPS for r in runs):
+                latency = statistics.mean(r["latency_seconds"] for r in runs)
+                candidates.append((latency, name, max(r["objective_gap"] for r in runs)))
+        if candidates:
+            latency, name, gap = min(candidates)
+            recommendations.append({"max_zones": size, "solver": name,
+                                    "mean_latency_seconds": round(latency, 6), "max_objective_gap": gap})
+    return recommendations
+
+
+# ----------------------------------------------------------------------
+# OUTPUT
+# ----------------------------------------------------------------------
+def write_csv(path, rows):
+    fields = ["family", "zones", "volunteers", "strategy", "objective", "objective_gap", "fairness_cv",
+              "latency_seconds", "feasible"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def fmt(value, spec):
+    return format(value, spec) if isinstance(value, (int, float)) else "-"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quality-versus-latency report across allocation strategies")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="zone counts to run")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--repeats", type=int, default=3, help="timed calls per strategy and case")
+    parser.add_argument("--fairness", type=float, default=0.6, help="fairness weight of every case")
+    parser.add_argument("--max-gap", type=float, default=0.0,
+                        help="largest objective gap a recommended solver may have (0.01 = 1%%)")
+    parser.add_argument("--bottleneck-rate", type=float, default=0.0, help="share of resource-bottlenecked zones")
+    parser.add_argument("--cbc-max-zones", type=int, default=10000, help="skip CBC above this many zones")
+    parser.add_argument("--out", default="pareto_results.json")
+    parser.add_argument("--csv", default=None, help="also write the per-case table as CSV")
+    parser.add_argument("--table", default=None, help="write the recommended strategy table here")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("QUALITY VS LATENCY REPORT")
+    print(f"   Families: {', '.join(FAMILIES)}, sizes: {args.sizes}, fairness: λ={args.fairness}")
+    print("=" * 70)
+
+    rows = run_report(args.sizes, args.strategies, args.fairness, args.repeats, args.cbc_max_zones,
+                      bottleneck_rate=args.bottleneck_rate)
+
+    print(f"\n   {'Family':<10} | {'Zones':>7} | {'Strategy':<8} | {'Gap':>8} | {'CV %':>7} | {'Latency':>9} | Feasible")
+    print(f"   {'-'*10}-+-{'-'*7}-+-{'-'*8}-+-{'-'*8}-+-{'-'*7}-+-{'-'*9}-+-{'-'*8}")
+    for r in rows:
+        print(f"   {r['family']:<10} | {r['zones']:>7} | {r['strategy']:<8} | {fmt(r['objective_gap'], '>+8.2%'):>8} | "
+              f"{r['fairness_cv']:>7.2f} | {1000 * r['latency_seconds']:>7.2f}ms | "
+              f"{'✅' if r['feasible'] else '❌'}")
+
+    recommendations = recommend(rows, args.max_gap)
+    print(f"\n🎯 Recommended Solver (gap <= {args.max_gap:.2%}, feasible on every family):\n")
+    print(f"   {'Up to zones':>11} | {'Solver':<6} | {'Latency':>9} | {'Max gap':>8}")
+    print(f"   {'-'*11}-+-{'-'*6}-+-{'-'*9}-+-{'-'*8}")
+    for rec in recommendations:
+        print(f"   {rec['max_zones']:>11} | {rec['solver']:<6} | {1000 * rec['mean_latency_seconds']:>7.2f}ms | "
+              f"{rec['max_objective_gap']:>+8.2%}")
+
+    output = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fairness_weight": args.fairness,
+            "repeats": args.repeats,
+            "max_gap": args.max_gap,
+        },
+        "results": rows,
+        "recommendations": recommendations,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\n   JSON results: {args.out}")
+    if args.csv:
+        write_csv(args.csv, rows)
+        print(f"   CSV results: {args.csv}")
+    if args.table:
+        with open(args.table, "w", encoding="utf-8") as f:
+            json.dump({"recommendations": recommendations}, f, indent=2)
+        print(f"   Strategy table: {args.table} (ALLOCATOR_STRATEGY_TABLE={args.table})")
+
+    print("\n" + "=" * 70)
+    print("QUALITY VS LATENCY REPORT COMPLETE ✅")
+    print("=" * 70)
+    return output
+
+
+if __name__ == "__main__":
+    main()
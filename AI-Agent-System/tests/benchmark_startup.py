@@ -0,0 +1,138 @@
+"""
+Startup Benchmark: Cold Imports and First-Result Latency
+
+Every measurement runs in a fresh interpreter, the way a short-lived CLI
+call or a new process-pool worker starts:
+
+1. Cold import time of the main entry modules, and which heavy
+   dependencies (PuLP, pydantic, http.server) each one pulls in
+2. First-result latency: import the worker, construct it and return the
+   first allocation, per solver (exact vs CBC)
+
+Usage:
+    python benchmark_startup.py [--repeats 5] [--zones 100] [--out startup.json]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+MODULES = [
+    "optimization",
+    "optimization.volunteer_allocator",
+    "communication.codec",
+    "communication.models",
+    "agents.workers.disaster_worker",
+    "agents.workers.worker_server",
+    "agents.supervisor.supervisor",
+]
+HEAVY = ["pulp", "pydantic", "http.server"]
+SOLVERS = ["exact", "cbc"]
+
+IMPORT_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+FIRST_RESULT_CHILD = """
+import json, time
+start = time.perf_counter()
+from agents.workers.disaster_worker import DisasterAllocationWorker
+from datasets.generator import ScenarioGenerator
+imported = time.perf_counter()
+scenario = ScenarioGenerator(seed=0).scenario(0, {zones})
+worker = DisasterAllocationWorker("Worker_Startup", "Supervisor_Main", solver={solver!r})
+task = {{"zones": scenario["zones"], "available_volunteers": scenario["available_volunteers"]}}
+generated = time.perf_counter()
+worker.process_task(task)
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "solve": done - generated,
+                  "total": (imported - start) + (done - generated)}}))
+"""
+
+
+def run_child(code):
+    """Runs ``code`` in a fresh interpreter (in a scratch directory) and returns its JSON output."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.pop("ALLOCATOR_PROFILE", None)
+    env.pop("AGENT_TRACE_FILE", None)
+    with tempfile.TemporaryDirectory() as tmp:
+        output = subprocess.run([sys.executable, "-c", code], cwd=tmp, env=env,
+                                capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def cold_imports(repeats):
+    results = []
+    for module in MODULES:
+        samples = [run_child(IMPORT_CHILD.format(module=module, heavy=HEAVY)) for _ in range(repeats)]
+        results.append({
+            "module": module,
+            "median_seconds": statistics.median(s["seconds"] for s in samples),
+            "loaded": samples[-1]["loaded"],
+        })
+    return results
+
+
+def first_results(repeats, zones):
+    results = []
+    for solver in SOLVERS:
+        samples = [run_child(FIRST_RESULT_CHILD.format(zones=zones, solver=solver)) for _ in range(repeats)]
+        results.append({
+            "solver": solver,
+            "zones": zones,
+            **{key: statistics.median(s[key] for s in samples) for key in ("import", "solve", "total")},
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import and first-result latency benchmark")
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--zones", type=int, default=100, help="zones in the first task")
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("STARTUP BENCHMARK: COLD IMPORTS AND FIRST RESULT")
+    print("=" * 70)
+
+    imports = cold_imports(args.repeats)
+    print("\n📦 Cold Import (median):\n")
+    print(f"   {'Module':<36} | {'Time':>9} | Heavy dependencies loaded")
+    print(f"   {'-'*36}-+-{'-'*9}-+-{'-'*26}")
+    for r in imports:
+        print(f"   {r['module']:<36} | {1000 * r['median_seconds']:>7.1f}ms | {', '.join(r['loaded']) or '-'}")
+
+    firsts = first_results(args.repeats, args.zones)
+    print(f"\n⏱️  First Result, {args.zones} zones (median):\n")
+    print(f"   {'Solver':<8} | {'Import':>9} | {'Solve':>9} | {'Total':>9}")
+    print(f"   {'-'*8}-+-{'-'*9}-+-{'-'*9}-+-{'-'*9}")
+    for r in firsts:
+        print(f"   {r['solver']:<8} | {1000 * r['import']:>7.1f}ms | {1000 * r['solve']:>7.1f}ms | "
+              f"{1000 * r['total']:>7.1f}ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"imports": imports, "first_result": firsts}, f, indent=2)
+        print(f"\n   JSON results: {args.out}")
+
+    print("\n" + "=" * 70)
+    print("STARTUP BENCHMARK COMPLETE ✅")
+    print("=" * 70)
+    return imports, firsts
+
+
+if __name__ == "__main__":
+    main()
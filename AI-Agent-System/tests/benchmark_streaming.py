@@ -0,0 +1,123 @@
+"""
+Streaming Report Benchmark
+
+Compares a single completion report against streamed partial reports for a
+large plan sent over the local socket transport. The worker is served from a
+thread in this process, so the tracemalloc peak covers both sides.
+
+Metrics:
+1. Time to first zone (supervisor side, from task send)
+2. Time to final report
+3. Peak traced memory
+
+Usage:
+    python benchmark_streaming.py [--zones 10000] [--chunk-size 1000]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from communication import protocol
+from communication.models import Message, Task
+from communication.transport import RemoteWorker, serve_worker
+from agents.workers.disaster_worker import DisasterAllocationWorker
+
+
+def make_zones(count):
+    return [
+        {
+            "id": f"Z{i+1}",
+            "severity": 10 - (i % 10),
+            "capacity": 15 + (i % 10),
+            "resources_available": 100 - (i % 30),
+            "min_resources_per_volunteer": 3 + (i % 3)
+        }
+        for i in range(count)
+    ]
+
+
+def run_mode(zones, chunk_size, content_type):
+    worker = DisasterAllocationWorker(f"Worker_Bench_{chunk_size or 0}", "Supervisor_Main",
+                                      fairness_weight=0.0, report_chunk_size=chunk_size)
+    server = serve_worker(worker, ("127.0.0.1", 0)).start()
+
+    timings = {"first_zone": None, "final": None, "zones": 0}
+
+    def on_report(report):
+        now = time.perf_counter() - start
+        plan = (report.get("results") or {}).get("allocation_plan")
+        if plan:
+            timings["zones"] += len(plan)
+            if timings["first_zone"] is None:
+                timings["first_zone"] = now
+        if report["type"] == protocol.COMPLETION_REPORT:
+            timings["final"] = now
+
+    remote = RemoteWorker(worker._id, server.address, on_report=on_report)
+    msg = Message.new(
+        sender="Supervisor_Main",
+        recipient=worker._id,
+        msg_type=protocol.TASK_ASSIGNMENT,
+        task=Task(name="allocate_resources", priority=1,
+                  parameters={"zones": zones, "available_volunteers": len(zones) * 5}),
+        content_type=content_type,
+    )
+    payload = msg.encode()
+    del msg
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        remote.handle_incoming_message(payload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        remote.close()
+        server.stop()
+
+    timings["peak_mb"] = peak / (1024 * 1024)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark single vs streamed completion reports")
+    parser.add_argument("--zones", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--compact", action="store_true", help="use the compact codec instead of JSON")
+    args = parser.parse_args(argv)
+    content_type = protocol.CONTENT_TYPE_COMPACT if args.compact else protocol.CONTENT_TYPE_JSON
+
+    print("=" * 70)
+    print("STREAMING REPORT BENCHMARK")
+    print(f"   Zones: {args.zones}, Chunk size: {args.chunk_size}, Content type: {content_type}")
+    print("=" * 70)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # keep benchmark LTM files out of the repository
+        try:
+            zones = make_zones(args.zones)
+            single = run_mode(zones, None, content_type)
+            streamed = run_mode(zones, args.chunk_size, content_type)
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n   {'Mode':<10} | {'First zone':>11} | {'Final':>9} | {'Peak MB':>8} | {'Zones':>7}")
+    print(f"   {'-'*10}-+-{'-'*11}-+-{'-'*9}-+-{'-'*8}-+-{'-'*7}")
+    for label, r in (("single", single), ("streamed", streamed)):
+        print(f"   {label:<10} | {r['first_zone']:>10.3f}s | {r['final']:>8.3f}s | {r['peak_mb']:>8.1f} | {r['zones']:>7}")
+
+    print("\n" + "=" * 70)
+    print("STREAMING BENCHMARK COMPLETE ✅")
+    print("=" * 70)
+    return single, streamed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Scaling Benchmark Suite
+
+Sweeps the allocator over zone counts (10 to 100k), volunteer budgets,
+fairness weights and constraint mixes. Each sweep varies one dimension
+around a base case (1000 zones, budget 0.5x capacity, lambda=0.6, all
+constraints). For every case it records:
+
+1. Warm solve time (median / p95 over in-process repeats after a warm-up)
+2. Cold time (median / p95 over fresh interpreters: import + construct + solve)
+3. Peak traced memory of one allocate call
+4. Objective value and solver status
+
+Results are written as JSON (and optionally CSV). ``compare`` flags cases
+that regressed against a stored baseline by more than a threshold.
+
+Usage:
+    python benchmark_suite.py run [--max-zones 10000] [--repeats 5] [--cold-repeats 2]
+                                  [--out results.json] [--csv results.csv]
+    python benchmark_suite.py compare baseline.json results.json [--threshold 0.2]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import csv
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+from datasets.generator import ScenarioGenerator
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+BASE_CASE = {"zones": 1000, "budget": 0.5, "fairness": 0.6, "mix": "full"}
+SIZES = [10, 100, 1000, 10000, 100000]
+BUDGETS = [0.25, 0.5, 1.0, 2.0]
+FAIRNESS_WEIGHTS = [0.0, 0.3, 0.6, 1.0]
+# Which optional zone fields are present: budget only, + capacity, + resource coupling
+MIXES = ["budget", "capacity", "full"]
+
+# Metrics compared by the compare command: (field, lower_is_better)
+COMPARED = [("warm_median", True), ("cold_median", True), ("peak_memory_mb", True), ("objective", False)]
+
+
+# ----------------------------------------------------------------------
+# SCENARIOS
+# ----------------------------------------------------------------------
+def make_zones(count, mix, seed=0):
+    """
+    Deterministic zones for a case, drawn from the synthetic scenario
+    generator; ``mix`` selects the constraint fields kept.
+    """
+    fields = ["id", "severity"]
+    if mix in ("capacity", "full"):
+        fields.append("capacity")
+    if mix == "full":
+        fields += ["resources_available", "min_resources_per_volunteer"]
+    return [{field: zone[field] for field in fields}
+            for zone in ScenarioGenerator(seed=seed).iter_zones(0, count)]
+
+
+def case_volunteers(zones, budget):
+    """Volunteer budget as a multiple of total zone capacity (25 per zone when uncapped)."""
+    total_capacity = sum(zone.get("capacity", 25) for zone in zones)
+    return max(1, int(total_capacity * budget))
+
+
+def case_id(case):
+    return f"n={case['zones']}|budget={case['budget']}|fairness={case['fairness']}|mix={case['mix']}"
+
+
+def build_cases(max_zones):
+    """One-dimension-at-a-time sweeps around BASE_CASE, de-duplicated."""
+    cases = []
+    sweeps = [("zones", SIZES), ("budget", BUDGETS), ("fairness", FAIRNESS_WEIGHTS), ("mix", MIXES)]
+    for field, values in sweeps:
+        for value in values:
+            case = dict(BASE_CASE, **{field: value})
+            if case["zones"] <= max_zones and case not in cases:
+                cases.append(case)
+    return cases
+
+
+# ----------------------------------------------------------------------
+# MEASUREMENT
+# ----------------------------------------------------------------------
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(samples):
+    if not samples:
+        return None, None
+    return round(statistics.median(samples), 6), round(percentile(samples, 0.95), 6)
+
+
+def run_warm(case, repeats):
+    from optimization.volunteer_allocator import VolunteerAllocator
+
+    zones = make_zones(case["zones"], case["mix"])
+    volunteers = case_volunteers(zones, case["budget"])
+    allocator = VolunteerAllocator(fairness_weight=case["fairness"])
+    allocator.allocate(zones, volunteers)  # warm-up: imports, solver binary in page cache
+
+    samples = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = allocator.allocate(zones, volunteers)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        allocator.allocate(zones, volunteers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return samples, peak, result, volunteers
+
+
+def run_cold_once(case):
+    """Times import + construct + allocate in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "_cold", json.dumps(case)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])["seconds"]
+
+
+def cold_child(case_json):
+    case = json.loads(case_json)
+    zones = make_zones(case["zones"], case["mix"])
+    volunteers = case_volunteers(zones, case["budget"])
+    start = time.perf_counter()
+    from optimization.volunteer_allocator import VolunteerAllocator
+    VolunteerAllocator(fairness_weight=case["fairness"]).allocate(zones, volunteers)
+    print(json.dumps({"seconds": time.perf_counter() - start}))
+
+
+def run_case(case, repeats, cold_repeats):
+    record = {"case_id": case_id(case), **case}
+    try:
+        samples, peak, result, volunteers = run_warm(case, repeats)
+        cold = [run_cold_once(case) for _ in range(cold_repeats)]
+    except Exception as e:
+        record["error"] = str(e)
+        return record
+
+    record["volunteers"] = volunteers
+    record["warm_median"], record["warm_p95"] = summarize(samples)
+    record["cold_median"], record["cold_p95"] = summarize(cold)
+    record["peak_memory_mb"] = round(peak / (1024 * 1024), 3)
+    record["objective"] = result["objective_value"]
+    record["solver_status"] = result["solver_status"]
+    return record
+
+
+# ----------------------------------------------------------------------
+# OUTPUT
+# ----------------------------------------------------------------------
+def write_csv(path, records):
+    fields = ["case_id", "zones", "budget", "fairness", "mix", "volunteers", "warm_median", "warm_p95",
+              "cold_median", "cold_p95", "peak_memory_mb", "objective", "solver_status", "error"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def fmt(value, spec):
+    return format(value, spec) if isinstance(value, (int, float)) else "-"
+
+
+def cmd_run(args):
+    cases = build_cases(args.max_zones)
+    print("=" * 70)
+    print("SCALING BENCHMARK SUITE")
+    print(f"   Cases: {len(cases)}, warm repeats: {args.repeats}, cold repeats: {args.cold_repeats}")
+    print("=" * 70)
+    print(f"\n   {'Case':<44} | {'Warm p50':>9} | {'Warm p95':>9} | {'Cold p50':>9} | {'Peak MB':>8} | {'Objective':>11}")
+    print(f"   {'-'*44}-+-{'-'*9}-+-{'-'*9}-+-{'-'*9}-+-{'-'*8}-+-{'-'*11}")
+
+    records = []
+    for case in cases:
+        record = run_case(case, args.repeats, args.cold_repeats)
+        records.append(record)
+        if "error" in record:
+            print(f"   {record['case_id']:<44} | ❌ {record['error']}")
+            continue
+        print(f"   {record['case_id']:<44} | {fmt(record['warm_median'], '>8.4f')}s | "
+              f"{fmt(record['warm_p95'], '>8.4f')}s | {fmt(record['cold_median'], '>8.4f')}s | "
+              f"{record['peak_memory_mb']:>8.2f} | {record['objective']:>11.2f}")
+
+    output = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+            "cold_repeats": args.cold_repeats,
+        },
+        "results": records,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\n   JSON results: {args.out}")
+    if args.csv:
+        write_csv(args.csv, records)
+        print(f"   CSV results: {args.csv}")
+
+    print("\n" + "=" * 70)
+    print("BENCHMARK SUITE COMPLETE ✅")
+    print("=" * 70)
+    return output
+
+
+# ----------------------------------------------------------------------
+# REGRESSION COMPARE
+# ----------------------------------------------------------------------
+def compare(baseline, current, threshold=0.2, min_seconds=0.005):
+    """
+    Returns a list of regressions: (case_id, field, baseline, current, change).
+    Times and memory regress when they grow by more than ``threshold`` (times
+    must also grow by at least ``min_seconds``, to ignore timer noise on tiny
+    cases); the objective regresses when it drops. Cases that now error, or
+    are missing, are regressions too.
+    """
+    base = {r["case_id"]: r for r in baseline["results"]}
+    cur = {r["case_id"]: r for r in current["results"]}
+    regressions = []
+    for cid, old in base.items():
+        new = cur.get(cid)
+        if new is None:
+            regressions.append((cid, "missing", None, None, None))
+            continue
+        if "error" in new and "error" not in old:
+            regressions.append((cid, "error", None, new["error"], None))
+            continue
+        for field, lower_is_better in COMPARED:
+            a, b = old.get(field), new.get(field)
+            if a is None or b is None:
+                continue
+            change = (b - a) / abs(a) if a else 0.0
+            if lower_is_better:
+                noise = field.endswith("median") and b - a < min_seconds
+                if change > threshold and not noise:
+                    regressions.append((cid, field, a, b, change))
+            elif b < a - 1e-6 * max(1.0, abs(a)):
+                regressions.append((cid, field, a, b, change))
+    return regressions
+
+
+def cmd_compare(args):
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    print("=" * 70)
+    print(f"REGRESSION COMPARE (threshold {args.threshold:.0%})")
+    print(f"   Baseline: {args.baseline}")
+    print(f"   Current:  {args.current}")
+    print("=" * 70)
+
+    regressions = compare(baseline, current, args.threshold)
+    if not regressions:
+        print(f"\n   ✅ No regressions across {len(baseline['results'])} cases")
+    else:
+        print(f"\n   {'Case':<44} | {'Metric':<14} | {'Baseline':>10} | {'Current':>10} | {'Change':>8}")
+        print(f"   {'-'*44}-+-{'-'*14}-+-{'-'*10}-+-{'-'*10}-+-{'-'*8}")
+        for cid, field, a, b, change in regressions:
+            print(f"   {cid:<44} | {field:<14} | {fmt(a, '>10.4f'):>10} | {fmt(b, '>10.4f'):>10} | "
+                  f"{fmt(change, '>+8.2%'):>8}")
+        print(f"\n   ❌ {len(regressions)} regression(s)")
+    print("=" * 70)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Allocator scaling benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the sweep and write results")
+    run.add_argument("--max-zones", type=int, default=10000,
+                     help="skip cases larger than this (100000 includes the largest sweep point)")
+    run.add_argument("--repeats", type=int, default=5, help="warm in-process repeats per case")
+    run.add_argument("--cold-repeats", type=int, default=2, help="fresh-interpreter repeats per case")
+    run.add_argument("--out", default="benchmark_results.json")
+    run.add_argument("--csv", default=None, help="also write a CSV table")
+
+    cmp_parser = sub.add_parser("compare", help="flag regressions against a stored baseline")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current")
+    cmp_parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown (0.2 = 20%%)")
+
+    child = sub.add_parser("_cold", help=argparse.SUPPRESS)
+    child.add_argument("case")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return cmd_run(args)
+    if args.command == "compare":
+        regressions = cmd_compare(args)
+        if regressions and argv is None:
+            sys.exit(1)
+        return regressions
+    cold_child(args.case)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Admission Control Load Generator
+
+Drives a SupervisorAgent with a steady stream of critical tasks, first on
+its own and then alongside a flood of normal/low-priority tasks submitted at
+a multiple of the worker's measured capacity. Reports critical-task latency
+for each run, so the effect of admission control on a burst is visible.
+
+Modes:
+1. baseline    - critical stream only
+2. admission   - critical stream + flood, default admission control
+3. unprotected - critical stream + flood, no inflight/rate limits (the
+                 backlog grows with the burst)
+
+Usage:
+    python load_generator.py [--burst-factor 10] [--critical 20] [--service-time 0]
+                             [--zones 3] [--seed 0]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import itertools
+import statistics
+import tempfile
+import threading
+import time
+
+from agents.supervisor.admission import AdmissionController
+from agents.supervisor.supervisor import SupervisorAgent
+from agents.workers.disaster_worker import DisasterAllocationWorker
+from communication import codec, protocol
+from datasets.generator import ScenarioGenerator
+
+
+def task_zones(args):
+    """Zones every task carries: a seeded synthetic scenario (optimizer fields only)."""
+    fields = ("id", "severity", "capacity", "resources_available", "min_resources_per_volunteer")
+    generator = ScenarioGenerator(seed=args.seed)
+    return [{field: zone[field] for field in fields} for zone in generator.iter_zones(0, args.zones)]
+
+
+class SyntheticWorker:
+    """Worker stand-in with a fixed service time (isolates queueing from solver noise)."""
+
+    def __init__(self, service_time):
+        self._id = "Worker_Synthetic"
+        self.service_time = service_time
+
+    def handle_incoming_message(self, payload):
+        message = codec.decode_message(payload)
+        time.sleep(self.service_time)
+        return {"type": protocol.COMPLETION_REPORT, "related_message_id": message["message_id"],
+                "status": "SUCCESS", "results": {}}
+
+
+def make_worker(service_time):
+    if service_time:
+        return SyntheticWorker(service_time)
+    return DisasterAllocationWorker("Worker_Load", "Supervisor_Main", fairness_weight=0.0)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(mode, args, zones, service_time, volunteers):
+    """Runs one mode; returns critical latencies and admission stats."""
+    if mode == "unprotected":
+        admission = AdmissionController(max_inflight=10 ** 9, reserved_critical=0, shed_threshold=10 ** 9,
+                                        rate=float("inf"), burst=float("inf"))
+    else:
+        admission = AdmissionController()
+    supervisor = SupervisorAgent(worker=make_worker(args.service_time), admission=admission)
+
+    interval = 4 * service_time
+    duration = args.critical * interval
+    latencies = []
+    threads = []
+
+    def submit(priority, sender, record):
+        start = time.perf_counter()
+        report = supervisor.assign_task(zones, next(volunteers), priority=priority, sender=sender)
+        if record and report["type"] != protocol.TASK_REJECTED:
+            latencies.append(time.perf_counter() - start)
+
+    def spawn(*submit_args):
+        thread = threading.Thread(target=submit, args=submit_args)
+        thread.start()
+        threads.append(thread)
+
+    def flood():
+        # Sustained submissions at burst_factor x worker capacity, normal and low priority mixed
+        rate = args.burst_factor / service_time
+        deadline = time.perf_counter() + duration
+        for i in itertools.count():
+            if time.perf_counter() >= deadline:
+                break
+            spawn(2 if i % 2 else 3, "dispatch_bulk", False)
+            time.sleep(1.0 / rate)
+
+    flooder = threading.Thread(target=flood) if mode != "baseline" else None
+    if flooder:
+        flooder.start()
+        time.sleep(interval)  # let the backlog build before the first critical task
+    for _ in range(args.critical):
+        spawn(1, "dispatch_critical", True)
+        time.sleep(interval)
+    if flooder:
+        flooder.join()
+    for thread in threads:
+        thread.join()
+    return latencies, supervisor.admission.stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Burst load against supervisor admission control")
+    parser.add_argument("--burst-factor", type=float, default=10.0, help="flood rate as a multiple of capacity")
+    parser.add_argument("--critical", type=int, default=20, help="number of critical tasks per run")
+    parser.add_argument("--service-time", type=float, default=0.0,
+                        help="use a synthetic worker with this service time (seconds) instead of the optimizer")
+    parser.add_argument("--zones", type=int, default=3, help="zones per task (synthetic scenario)")
+    parser.add_argument("--seed", type=int, default=0, help="scenario generator seed")
+    args = parser.parse_args(argv)
+    zones = task_zones(args)
+
+    print("=" * 70)
+    print("ADMISSION CONTROL LOAD GENERATOR")
+    print("=" * 70)
+
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        os.chdir(tmp)  # keep LTM files and supervisor logs out of the repository
+        try:
+            # Every task gets a distinct volunteer count so LTM never short-circuits the solver
+            volunteers = itertools.count(30)
+            with contextlib.redirect_stdout(devnull):
+                probe = SupervisorAgent(worker=make_worker(args.service_time))
+                samples = []
+                for _ in range(10):
+                    start = time.perf_counter()
+                    probe.assign_task(zones, next(volunteers))
+                    samples.append(time.perf_counter() - start)
+            service_time = statistics.median(samples)
+            print(f"   Worker service time: {1000 * service_time:.1f} ms "
+                  f"(capacity ~{1 / service_time:.0f} tasks/s), burst: {args.burst_factor:.0f}x")
+
+            for mode in ("baseline", "admission", "unprotected"):
+                with contextlib.redirect_stdout(devnull):
+                    results[mode] = run(mode, args, zones, service_time, volunteers)
+        finally:
+            os.chdir(cwd)
+
+    print(f"\n   {'Mode':<12} | {'Crit p50':>9} | {'Crit p95':>9} | {'Crit max':>9} | "
+          f"{'Admitted':>8} | {'Rejected':>8} | {'Peak inflight':>13}")
+    print(f"   {'-'*12}-+-{'-'*9}-+-{'-'*9}-+-{'-'*9}-+-{'-'*8}-+-{'-'*8}-+-{'-'*13}")
+    for mode, (latencies, stats) in results.items():
+        print(f"   {mode:<12} | {1000 * percentile(latencies, 0.5):>7.1f}ms | "
+              f"{1000 * percentile(latencies, 0.95):>7.1f}ms | {1000 * max(latencies):>7.1f}ms | "
+              f"{stats['admitted']:>8} | {sum(stats['rejected'].values()):>8} | {stats['peak_inflight']:>13}")
+
+    # A critical task waits at most for the task already on the worker, so its
+    # latency under burst should stay within a couple of service times of baseline
+    baseline_p95 = percentile(results["baseline"][0], 0.95)
+    burst_p95 = percentile(results["admission"][0], 0.95)
+    bound = baseline_p95 + 3 * service_time
+    flat = burst_p95 <= bound
+    print(f"\n   {'✅' if flat else '❌'} Critical p95 under burst {1000 * burst_p95:.1f} ms "
+          f"(bound {1000 * bound:.1f} ms)")
+
+    print("\n" + "=" * 70)
+    print("LOAD GENERATOR COMPLETE ✅")
+    print("=" * 70)
+    return results
+
+
+if __name__ == "__main__":
+    main()
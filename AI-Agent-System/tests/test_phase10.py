@@ -0,0 +1,182 @@
+"""
+Phase 10 Test: Local Socket Transport
+Tests length-prefixed framing, persistent pooled connections, pipelining,
+reconnect handling and an out-of-process worker, all on localhost.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import subprocess
+import tempfile
+import time
+
+from communication import protocol
+from communication.models import Message, Task
+from communication.transport import ConnectionPool, FramedServer, RemoteWorker, TransportError
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+ZONES = [
+    {"id": "Z1", "severity": 10, "capacity": 20, "resources_available": 100, "min_resources_per_volunteer": 3},
+    {"id": "Z2", "severity": 7, "capacity": 15, "resources_available": 80, "min_resources_per_volunteer": 4},
+    {"id": "Z3", "severity": 5, "capacity": 12, "resources_available": 60, "min_resources_per_volunteer": 5},
+]
+
+
+def echo(payload):
+    return payload.upper()
+
+
+def wait_for_socket(path, timeout=20.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if os.path.exists(path):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_socket_transport():
+    """Test framing, pooling, pipelining and reconnects on TCP and Unix sockets."""
+
+    print("=" * 60)
+    print("PHASE 10 TEST: Local Socket Transport")
+    print("=" * 60)
+
+    test_passed = True
+    tmp = tempfile.TemporaryDirectory()
+    unix_address = f"unix:{os.path.join(tmp.name, 'echo.sock')}"
+
+    for label, address in [("TCP loopback", ("127.0.0.1", 0)), ("Unix socket", unix_address)]:
+        print(f"\n   {label}")
+        server = FramedServer(address, echo).start()
+        pool = ConnectionPool(server.address)
+        try:
+            # Test 1: Request/response over a persistent connection
+            replies = [pool.request(f"ping {i}".encode())[0] for i in range(20)]
+            if replies == [f"PING {i}".encode() for i in range(20)] and server.connections_accepted == 1:
+                print("      ✅ 20 requests served over 1 persistent connection")
+            else:
+                print(f"      ❌ Unexpected replies or {server.connections_accepted} connections")
+                test_passed = False
+
+            # Test 2: Pipelined requests keep their order
+            payloads = [f"task {i}".encode() for i in range(50)]
+            responses = pool.pipeline(payloads)
+            if [r[0] for r in responses] == [p.upper() for p in payloads]:
+                print("      ✅ 50 pipelined requests answered in order")
+            else:
+                print("      ❌ Pipelined responses out of order")
+                test_passed = False
+
+            # Test 3: Large frames
+            big = b"z" * (3 * 1024 * 1024)
+            if pool.request(big)[0] == big.upper():
+                print("      ✅ 3 MB frame round-tripped")
+            else:
+                print("      ❌ Large frame corrupted")
+                test_passed = False
+
+            # Test 4: Reconnect after the server restarts on the same address
+            server.stop()
+            server = FramedServer(server.address, echo).start()
+            if pool.request(b"again")[0] == b"AGAIN" and pool.connections_opened == 2:
+                print("      ✅ Stale pooled connection replaced after restart")
+            else:
+                print("      ❌ Reconnect failed")
+                test_passed = False
+        finally:
+            pool.close()
+            server.stop()
+
+    # Test 5: Unreachable peers raise TransportError after retries
+    print("\n   Unreachable Peer")
+    try:
+        ConnectionPool(f"unix:{os.path.join(tmp.name, 'missing.sock')}", retries=1, backoff=0.01).request(b"x")
+        print("      ❌ Request to missing socket succeeded")
+        test_passed = False
+    except TransportError:
+        print("      ✅ TransportError raised for unreachable peer")
+
+    # Test 5b: A read timeout after the request was sent is not retried (no second execution)
+    print("\n   Read Timeout")
+    calls = []
+
+    def slow(payload):
+        calls.append(payload)
+        time.sleep(0.5)
+        return payload
+
+    slow_server = FramedServer(("127.0.0.1", 0), slow).start()
+    slow_pool = ConnectionPool(slow_server.address, timeout=0.1, retries=2, backoff=0.01)
+    outcomes = []
+    for call in (lambda: slow_pool.request(b"solve"), lambda: list(slow_pool.stream(b"solve"))):
+        try:
+            call()
+            outcomes.append("returned")
+        except TransportError:
+            outcomes.append("TransportError")
+    time.sleep(0.6)
+    slow_pool.close()
+    slow_server.stop()
+    print(f"      request / stream: {outcomes}, handler calls: {len(calls)}")
+    if outcomes == ["TransportError", "TransportError"] and len(calls) == 2:
+        print("      ✅ Timed-out requests surface as TransportError without being re-sent")
+    else:
+        print("      ❌ Timed-out request re-sent or not reported")
+        test_passed = False
+
+    # Test 6: Worker running in a separate process
+    print("\n   Out-of-Process Worker")
+    sock_path = os.path.join(tmp.name, "worker.sock")
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "agents.workers.worker_server", "--address", f"unix:{sock_path}"],
+        cwd=tmp.name, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_for_socket(sock_path):
+            print("      ❌ Worker process did not start listening")
+            test_passed = False
+        else:
+            reports = []
+            remote = RemoteWorker("Worker_Disaster", f"unix:{sock_path}", on_report=reports.append)
+            for content_type in (protocol.CONTENT_TYPE_JSON, protocol.CONTENT_TYPE_COMPACT):
+                msg = Message.new(
+                    sender="Supervisor_Main",
+                    recipient="Worker_Disaster",
+                    msg_type=protocol.TASK_ASSIGNMENT,
+                    task=Task(name="allocate_resources", priority=1,
+                              parameters={"zones": ZONES, "available_volunteers": 30}),
+                    content_type=content_type,
+                )
+                remote.handle_incoming_message(msg.encode())
+            remote.close()
+
+            statuses = [r["status"] for r in reports]
+            sources = [r["results"].get("source") for r in reports]
+            print(f"      Report statuses: {statuses}, sources: {sources}")
+            if statuses == ["SUCCESS", "SUCCESS"] and reports[1]["content_type"] == protocol.CONTENT_TYPE_COMPACT:
+                print("      ✅ Remote worker answered JSON and compact tasks")
+            else:
+                print("      ❌ Remote worker reports incorrect")
+                test_passed = False
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        tmp.cleanup()
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 10 TEST PASSED ✅")
+    else:
+        print("PHASE 10 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_socket_transport()
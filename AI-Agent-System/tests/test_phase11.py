@@ -0,0 +1,129 @@
+"""
+Phase 11 Test: Streaming Completion Reports
+Tests that large plans are reported as sequenced zone-range chunks followed
+by a summary frame, and that the supervisor consumes chunks as they arrive.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import time
+
+from communication import protocol
+from communication.transport import RemoteWorker, serve_worker
+from agents.workers.disaster_worker import DisasterAllocationWorker
+from agents.supervisor.supervisor import SupervisorAgent
+
+
+def make_zones(count):
+    return [
+        {
+            "id": f"Z{i+1}",
+            "severity": 10 - (i % 10),
+            "capacity": 15 + (i % 10),
+            "resources_available": 100 - (i % 30),
+            "min_resources_per_volunteer": 3 + (i % 3)
+        }
+        for i in range(count)
+    ]
+
+
+class CaptureTransport:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, recipient, message_obj):
+        self.sent.append(message_obj)
+
+
+def test_streaming_reports():
+    """Test chunk framing on the worker and incremental consumption on the supervisor."""
+
+    print("=" * 60)
+    print("PHASE 11 TEST: Streaming Completion Reports")
+    print("=" * 60)
+
+    test_passed = True
+    cwd = os.getcwd()
+    tmp = tempfile.TemporaryDirectory()
+    os.chdir(tmp.name)
+    try:
+        # Test 1: Worker emits sequenced partial reports and a summary frame
+        print("\n   Test 1: Chunked Worker Reports")
+        capture = CaptureTransport()
+        worker = DisasterAllocationWorker("Worker_Stream", "Supervisor_Main", fairness_weight=0.0,
+                                          transport=capture, report_chunk_size=4)
+        worker._execute_task({"zones": make_zones(10), "available_volunteers": 60}, "task-1")
+
+        partials = [m for m in capture.sent if m["type"] == protocol.COMPLETION_REPORT_PARTIAL]
+        final = capture.sent[-1]
+        ranges = [m["zone_range"] for m in partials]
+        print(f"      Chunks: {len(partials)}, ranges: {ranges}")
+        if ranges == [[0, 4], [4, 8], [8, 10]] and [m["sequence"] for m in partials] == [0, 1, 2]:
+            print("      ✅ Zone ranges contiguous and sequence numbers ordered")
+        else:
+            print("      ❌ Unexpected chunk framing")
+            test_passed = False
+        if (final["type"] == protocol.COMPLETION_REPORT and final["sequence"] == 3
+                and "allocation_plan" not in final["results"]
+                and final["results"]["stream"] == {"chunks": 3, "zones": 10}):
+            print("      ✅ Summary frame closes the stream without repeating the plan")
+        else:
+            print("      ❌ Summary frame malformed")
+            test_passed = False
+
+        # Test 2: Supervisor consumes chunks over a socket as they arrive
+        print("\n   Test 2: Incremental Consumption Over Socket")
+        served = DisasterAllocationWorker("Worker_Remote", "Supervisor_Main", fairness_weight=0.0,
+                                          report_chunk_size=250)
+        server = serve_worker(served, ("127.0.0.1", 0)).start()
+        remote = RemoteWorker("Worker_Remote", server.address)
+        try:
+            supervisor = SupervisorAgent(worker=remote)
+            arrivals = []
+            supervisor.on_zones = lambda task_id, chunk: arrivals.append((time.perf_counter(), len(chunk)))
+            # Wrap the supervisor's report hook to time the summary frame
+            received = []
+            remote.on_report = lambda report: (received.append((time.perf_counter(), report["type"])),
+                                               supervisor.receive_report(report))
+            supervisor.assign_task(make_zones(1000), 5000)
+        finally:
+            remote.close()
+            server.stop()
+
+        zones_seen = sum(n for _, n in arrivals)
+        final_time = received[-1][0]
+        print(f"      Chunks consumed: {len(arrivals)}, zones: {zones_seen}")
+        if zones_seen == 1000 and len(arrivals) == 4 and received[-1][1] == protocol.COMPLETION_REPORT:
+            print("      ✅ All zones consumed in 4 chunks before the summary")
+        else:
+            print("      ❌ Supervisor did not consume every chunk")
+            test_passed = False
+        if arrivals and arrivals[0][0] < final_time:
+            print(f"      ✅ First zones available {1000 * (final_time - arrivals[0][0]):.1f} ms before summary")
+        else:
+            print("      ❌ First zones not available before summary")
+            test_passed = False
+        if not supervisor._streams:
+            print("      ✅ Stream state released after summary")
+        else:
+            print("      ❌ Stream state leaked")
+            test_passed = False
+    finally:
+        os.chdir(cwd)
+        tmp.cleanup()
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 11 TEST PASSED ✅")
+    else:
+        print("PHASE 11 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_streaming_reports()
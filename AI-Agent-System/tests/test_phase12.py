@@ -0,0 +1,129 @@
+"""
+Phase 12 Test: Runtime Metrics
+Tests that health_check reports live throughput, latency quantiles, solve
+phase timings, LTM hit ratios, queue depth and worker utilization, and that
+metrics export as JSON and Prometheus text to a file and a local endpoint.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import urllib.request
+
+from agents.supervisor.supervisor import SupervisorAgent
+from monitoring.metrics import Histogram
+
+ZONES = [
+    {"id": "Z1", "severity": 10, "capacity": 20, "resources_available": 100, "min_resources_per_volunteer": 3},
+    {"id": "Z2", "severity": 7, "capacity": 15, "resources_available": 80, "min_resources_per_volunteer": 4},
+    {"id": "Z3", "severity": 5, "capacity": 12, "resources_available": 60, "min_resources_per_volunteer": 5},
+]
+
+
+def test_runtime_metrics():
+    """Test metric collection in the supervisor and the exporters."""
+
+    print("=" * 60)
+    print("PHASE 12 TEST: Runtime Metrics")
+    print("=" * 60)
+
+    test_passed = True
+    cwd = os.getcwd()
+    tmp = tempfile.TemporaryDirectory()
+    os.chdir(tmp.name)
+    try:
+        # Test 1: Histogram quantiles stay within the bucket growth factor
+        print("\n   Test 1: Histogram Quantiles")
+        hist = Histogram()
+        for i in range(1, 1001):
+            hist.observe(i / 1000)
+        summary = hist.summary()
+        print(f"      p50={summary['p50']}, p95={summary['p95']}, p99={summary['p99']}")
+        if all(abs(summary[k] - v) / v <= 0.05 for k, v in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))):
+            print("      ✅ Quantiles within 5% of exact values")
+        else:
+            print("      ❌ Quantile error too large")
+            test_passed = False
+
+        # Test 2: health_check reports live metrics after a miss and a hit
+        print("\n   Test 2: Health Check Metrics")
+        supervisor = SupervisorAgent()
+        supervisor.assign_task(ZONES, 30)
+        supervisor.assign_task(ZONES, 30)
+        health = supervisor.health_check()
+        metrics = health["metrics"]
+        print(f"      Tasks: {metrics['tasks']}, LTM: {metrics['ltm']}")
+        if health["status"] == "OK" and metrics["tasks"] == {"SUCCESS": 2} and metrics["latency_seconds"]["count"] == 2:
+            print("      ✅ Task counts and latency histogram populated")
+        else:
+            print("      ❌ Task metrics missing")
+            test_passed = False
+        if metrics["ltm"].get("file") == {"hits": 1, "misses": 1, "hit_ratio": 0.5}:
+            print("      ✅ LTM hit ratio tracked per tier")
+        else:
+            print("      ❌ LTM hit ratio incorrect")
+            test_passed = False
+        if set(metrics["solve_phases_seconds"]) == {"build", "solve", "extract", "metrics"}:
+            print("      ✅ Solve time split into build / solve / extract / metrics")
+        else:
+            print("      ❌ Solve phases missing")
+            test_passed = False
+        if (metrics["queue_depth"] == {"1": 0} and metrics["throughput_per_second"] > 0
+                and 0 < metrics["worker_utilization"] <= 1):
+            print(f"      ✅ Queue depth, throughput and utilization ({metrics['worker_utilization']:.2f}) reported")
+        else:
+            print("      ❌ Queue depth / throughput / utilization incorrect")
+            test_passed = False
+
+        # Test 3: File exports
+        print("\n   Test 3: JSON and Prometheus Exports")
+        supervisor.export_metrics("metrics.json")
+        supervisor.export_metrics("metrics.prom", fmt="prometheus")
+        with open("metrics.json", encoding="utf-8") as f:
+            exported = json.load(f)
+        with open("metrics.prom", encoding="utf-8") as f:
+            prom = f.read()
+        if exported["supervisor_task_latency_seconds"][0]["count"] == 2:
+            print("      ✅ JSON export written")
+        else:
+            print("      ❌ JSON export malformed")
+            test_passed = False
+        if ('supervisor_task_latency_seconds{quantile="0.99"}' in prom
+                and 'ltm_lookups_total{outcome="hit",tier="file"} 1' in prom):
+            print("      ✅ Prometheus text export written")
+        else:
+            print("      ❌ Prometheus export malformed")
+            test_passed = False
+
+        # Test 4: Local HTTP endpoint
+        print("\n   Test 4: Metrics Endpoint")
+        host, port = supervisor.metrics.serve(port=0)
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as resp:
+                body = resp.read().decode("utf-8")
+        finally:
+            supervisor.metrics.stop_serving()
+        if "supervisor_worker_utilization" in body:
+            print("      ✅ /metrics served over HTTP")
+        else:
+            print("      ❌ /metrics missing series")
+            test_passed = False
+    finally:
+        os.chdir(cwd)
+        tmp.cleanup()
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 12 TEST PASSED ✅")
+    else:
+        print("PHASE 12 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_runtime_metrics()
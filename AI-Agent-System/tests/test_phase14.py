@@ -0,0 +1,163 @@
+"""
+Phase 14 Test: Allocation Profiling Hooks
+Tests structured phase timings in allocate results, per-call and global
+cProfile / tracemalloc / solver capture, the pluggable sink, and that the
+hooks cost next to nothing when profiling is disabled, and per-phase memory
+peaks on Pythons without tracemalloc.reset_peak.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import time
+import tracemalloc
+
+from optimization import profiling
+from optimization.profiling import JsonlSink, PhaseProfiler
+from datasets.generator import ScenarioGenerator
+from optimization.separable import zone_bounds
+from optimization.volunteer_allocator import VolunteerAllocator
+
+ZONES = [
+    {"id": f"Z{i+1}", "severity": 10 - (i % 10), "capacity": 15 + (i % 10),
+     "resources_available": 100 - (i % 30), "min_resources_per_volunteer": 3 + (i % 3)}
+    for i in range(200)
+]
+PHASES = ["build", "solve", "extract", "metrics"]
+
+
+def test_profiling_hooks():
+    """Test phase timings, optional capture and sinks."""
+
+    print("=" * 60)
+    print("PHASE 14 TEST: Allocation Profiling Hooks")
+    print("=" * 60)
+
+    test_passed = True
+    allocator = VolunteerAllocator(fairness_weight=0.0)
+
+    # Test 1: Phase timings are always present; no capture by default
+    print("\n   Test 1: Phase Timings")
+    result = allocator.allocate(ZONES, 1000)
+    timings = result["phase_timings_seconds"]
+    print(f"      Timings: {timings}")
+    if list(timings) == PHASES and "profile" not in result:
+        print("      ✅ build / solve / extract / metrics recorded, no profile when disabled")
+    else:
+        print("      ❌ Unexpected phase timings or profile")
+        test_passed = False
+    # Model building is timed as build for the non-CBC solvers too
+    many = ScenarioGenerator(seed=14).zones(50000)
+    start = time.perf_counter()
+    zone_bounds(many, 200000, 0.3)
+    bounds_time = time.perf_counter() - start
+    exact = VolunteerAllocator(0.3, solver="exact").allocate(many, 200000)["phase_timings_seconds"]
+    print(f"      exact solver, 50000 zones: {exact} (zone bounds alone {bounds_time:.3f}s)")
+    if exact["build"] >= 0.5 * bounds_time:
+        print("      ✅ Exact solver's bounds counted as build, not solve")
+    else:
+        print("      ❌ Build phase empty for the exact solver")
+        test_passed = False
+
+    # Test 2: Per-call capture
+    print("\n   Test 2: Per-Call Capture")
+    # The solver capture reads CBC's log, so this call goes through CBC
+    cbc_allocator = VolunteerAllocator(fairness_weight=0.0, solver="cbc")
+    result = cbc_allocator.allocate(ZONES, 1000, profile=["cprofile", "tracemalloc", "solver"])
+    record = result.get("profile", {})
+    top = record.get("cprofile_top", [])
+    solver = record.get("solver", {})
+    print(f"      Top function: {top[0]['function'] if top else None}")
+    print(f"      Memory peaks (MB): {record.get('memory_peak_mb')}")
+    print(f"      Solver split: {solver}")
+    if top and list(record.get("memory_peak_mb", {})) == PHASES and record["memory_peak_mb"]["build"] > 0:
+        print("      ✅ cProfile summary and per-phase memory peaks captured")
+    else:
+        print("      ❌ cProfile / tracemalloc capture missing")
+        test_passed = False
+    if solver.get("cbc_wall_seconds") is not None and solver["overhead_seconds"] >= 0:
+        print("      ✅ CBC wall time separated from solver overhead")
+    else:
+        print("      ❌ Solver split missing")
+        test_passed = False
+    try:
+        allocator.allocate(ZONES, 1000, profile=["bogus"])
+        print("      ❌ Unknown capture accepted")
+        test_passed = False
+    except ValueError:
+        print("      ✅ Unknown capture rejected")
+
+    # Test 3: Global configuration and JSONL sink
+    print("\n   Test 3: Global Capture and Sink")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "profile.jsonl")
+        profiling.configure(capture=["tracemalloc"], sink=JsonlSink(path))
+        try:
+            result = allocator.allocate(ZONES, 1000)
+            allocator.allocate(ZONES, 500, profile=[])
+        finally:
+            profiling.configure()
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+    print(f"      Sink records: {len(records)}")
+    if ("memory_peak_mb" in result.get("profile", {}) and len(records) == 2
+            and records[1]["total_volunteers"] == 500 and "memory_peak_mb" not in records[1]):
+        print("      ✅ Global capture applied; sink received timings for every call")
+    else:
+        print("      ❌ Global configuration or sink not applied")
+        test_passed = False
+
+    # Test 4: Overhead when disabled
+    print("\n   Test 4: Disabled Overhead")
+    runs = 10000
+    start = time.perf_counter()
+    for _ in range(runs):
+        profiler = PhaseProfiler().start()
+        for phase in PHASES:
+            profiler.mark(phase)
+        profiler.finish()
+    per_call_us = 1e6 * (time.perf_counter() - start) / runs
+    print(f"      Hook cost per allocate call: {per_call_us:.1f} µs")
+    if per_call_us < 100:
+        print("      ✅ Near-zero cost when disabled")
+    else:
+        print("      ❌ Hooks too expensive when disabled")
+        test_passed = False
+
+    # Test 5: Per-phase memory peaks without tracemalloc.reset_peak (Python 3.8)
+    print("\n   Test 5: Peak Reset Fallback")
+    reset_peak = getattr(tracemalloc, "reset_peak", None)
+    if reset_peak is not None:
+        del tracemalloc.reset_peak
+    try:
+        profiler = PhaseProfiler(["tracemalloc"]).start()
+        block = [0] * 1000000
+        profiler.mark("build")
+        del block
+        profiler.mark("solve")
+        profiler.stop()
+    finally:
+        if reset_peak is not None:
+            tracemalloc.reset_peak = reset_peak
+    print(f"      peaks: {profiler.memory_peaks_mb}, still tracing: {tracemalloc.is_tracing()}")
+    if profiler.memory_peaks_mb["build"] > 5 > profiler.memory_peaks_mb["solve"] and not tracemalloc.is_tracing():
+        print("      ✅ Peaks reset per phase by restarting tracemalloc")
+    else:
+        print("      ❌ Peak not reset without reset_peak")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 14 TEST PASSED ✅")
+    else:
+        print("PHASE 14 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_profiling_hooks()
@@ -0,0 +1,168 @@
+"""
+Phase 15 Test: End-to-End Tracing
+Tests that a trace id travels in Message, that spans from the supervisor,
+codec, worker, LTM and optimizer nest under one trace (also across a
+worker process), and that the summarizer prints a per-task breakdown.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib
+import io
+import subprocess
+import tempfile
+import time
+
+from communication import protocol
+from communication.models import Message, Task
+from communication.transport import RemoteWorker
+from agents.supervisor.supervisor import SupervisorAgent
+from monitoring import tracing
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+ZONES = [
+    {"id": "Z1", "severity": 10, "capacity": 20, "resources_available": 100, "min_resources_per_volunteer": 3},
+    {"id": "Z2", "severity": 7, "capacity": 15, "resources_available": 80, "min_resources_per_volunteer": 4},
+    {"id": "Z3", "severity": 5, "capacity": 12, "resources_available": 60, "min_resources_per_volunteer": 5},
+]
+
+EXPECTED_PARENTS = {
+    "message.build": "supervisor.assign_task",
+    "message.encode": "supervisor.assign_task",
+    "worker.handle_incoming_message": "supervisor.assign_task",
+    "codec.decode": "worker.handle_incoming_message",
+    "worker.process_task": "worker.handle_incoming_message",
+    "ltm.read": "worker.process_task",
+    "optimizer.allocate": "worker.process_task",
+    "allocate.solve": "optimizer.allocate",
+    "ltm.write": "worker.process_task",
+    "worker.report_completion": "worker.handle_incoming_message",
+}
+
+
+def parents_by_name(spans):
+    names = {s["span_id"]: s["name"] for s in spans}
+    return {s["name"]: names.get(s["parent_id"]) for s in spans}
+
+
+def test_tracing():
+    """Test trace propagation, span nesting, cross-process traces and the summarizer."""
+
+    print("=" * 60)
+    print("PHASE 15 TEST: End-to-End Tracing")
+    print("=" * 60)
+
+    test_passed = True
+    cwd = os.getcwd()
+    tmp = tempfile.TemporaryDirectory()
+    os.chdir(tmp.name)
+    try:
+        # Test 1: Trace ids survive both wire formats
+        print("\n   Test 1: Trace Context in Message")
+        for content_type in (protocol.CONTENT_TYPE_JSON, protocol.CONTENT_TYPE_COMPACT):
+            msg = Message.new(sender="S", recipient="W", msg_type=protocol.TASK_ASSIGNMENT,
+                              task=Task(name="t", priority=1, parameters={}), content_type=content_type,
+                              trace_id="abc123", parent_span_id="def456")
+            decoded = Message.decode(msg.encode())
+            if (decoded.trace_id, decoded.parent_span_id) == ("abc123", "def456"):
+                print(f"      ✅ Trace context round-trips as {content_type}")
+            else:
+                print(f"      ❌ Trace context lost as {content_type}")
+                test_passed = False
+
+        # Test 2: Disabled tracing writes nothing
+        print("\n   Test 2: Disabled Tracing")
+        with contextlib.redirect_stdout(io.StringIO()):
+            SupervisorAgent().assign_task(ZONES, 30)
+        if not tracing.enabled() and not os.path.exists("trace.jsonl"):
+            print("      ✅ No spans recorded while tracing is off")
+        else:
+            print("      ❌ Spans recorded while disabled")
+            test_passed = False
+
+        # Test 3: In-process spans nest under one trace per task
+        print("\n   Test 3: In-Process Trace")
+        tracing.configure("trace.jsonl")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                SupervisorAgent().assign_task(ZONES, 31)
+        finally:
+            tracing.configure()
+        spans = tracing.load_spans("trace.jsonl")
+        parents = parents_by_name(spans)
+        print(f"      Spans: {len(spans)}, traces: {len({s['trace_id'] for s in spans})}")
+        mismatched = {n: parents.get(n) for n, p in EXPECTED_PARENTS.items() if parents.get(n) != p}
+        if len({s["trace_id"] for s in spans}) == 1 and not mismatched:
+            print("      ✅ Supervisor, codec, worker, LTM and optimizer spans nested in one trace")
+        else:
+            print(f"      ❌ Unexpected span tree: {mismatched}")
+            test_passed = False
+
+        # Test 4: Summarizer breakdown
+        print("\n   Test 4: Summarizer")
+        summary = tracing.summarize(spans)
+        print("\n".join("      " + line for line in summary.splitlines()[:8]))
+        if "Self time by span" in summary and "allocate.solve" in summary:
+            print("      ✅ Flame-style breakdown printed")
+        else:
+            print("      ❌ Summary incomplete")
+            test_passed = False
+
+        # Test 5: Worker in another process continues the supervisor's trace
+        print("\n   Test 5: Cross-Process Trace")
+        sock_path = os.path.join(tmp.name, "worker.sock")
+        worker_trace = os.path.join(tmp.name, "worker_trace.jsonl")
+        env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "agents.workers.worker_server", "--address", f"unix:{sock_path}",
+             "--trace-file", worker_trace],
+            cwd=tmp.name, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.time() + 20
+            while not os.path.exists(sock_path) and time.time() < deadline:
+                time.sleep(0.05)
+            remote = RemoteWorker("Worker_Disaster", f"unix:{sock_path}")
+            tracing.configure("supervisor_trace.jsonl")
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    report = SupervisorAgent(worker=remote).assign_task(ZONES, 32)
+            finally:
+                tracing.configure()
+                remote.close()
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+        sup_spans = tracing.load_spans("supervisor_trace.jsonl")
+        worker_spans = tracing.load_spans(worker_trace) if os.path.exists(worker_trace) else []
+        merged = parents_by_name(sup_spans + worker_spans)
+        same_trace = {s["trace_id"] for s in sup_spans + worker_spans}
+        print(f"      Supervisor spans: {len(sup_spans)}, worker spans: {len(worker_spans)}")
+        if (worker_spans and len(same_trace) == 1
+                and merged.get("worker.handle_incoming_message") == "supervisor.assign_task"
+                and report.get("trace_id") in same_trace):
+            print("      ✅ Worker process spans joined the supervisor's trace")
+        else:
+            print("      ❌ Trace not propagated across processes")
+            test_passed = False
+    finally:
+        tracing.configure()
+        os.chdir(cwd)
+        tmp.cleanup()
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 15 TEST PASSED ✅")
+    else:
+        print("PHASE 15 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_tracing()
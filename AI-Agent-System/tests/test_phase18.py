@@ -0,0 +1,121 @@
+"""
+Phase 18 Test: Quality-versus-Latency Report and Strategy Table
+Tests that the Pareto report measures every strategy, recommends a solver
+with no objective gap, and that solver="auto" follows the written table
+(with model_type naming the solver that ran).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import tempfile
+
+import numpy as np
+
+from benchmark_pareto import FAMILIES, STRATEGIES, main as pareto_main
+from optimization import strategy
+from optimization.volunteer_allocator import VolunteerAllocator
+
+ZONES = [
+    {"id": "Z1", "severity": 5, "capacity": 10},
+    {"id": "Z2", "severity": 3, "capacity": 10},
+    {"id": "Z3", "severity": 1, "capacity": 10},
+]
+
+
+def test_pareto_report():
+    """Test report rows, recommendations and strategy-table selection."""
+
+    print("=" * 60)
+    print("PHASE 18 TEST: Quality-versus-Latency Report")
+    print("=" * 60)
+
+    test_passed = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out, table_path = os.path.join(tmp, "pareto.json"), os.path.join(tmp, "strategy.json")
+        report = pareto_main(["--sizes", "10", "50", "--repeats", "1", "--out", out, "--table", table_path])
+        with open(table_path, encoding="utf-8") as f:
+            written = json.load(f)
+
+        # Test 1: Every strategy runs on every family and size
+        print("\n   Test 1: Report Rows")
+        rows = report["results"]
+        print(f"      Rows: {len(rows)} (expected {2 * len(FAMILIES) * len(STRATEGIES)})")
+        if len(rows) == 2 * len(FAMILIES) * len(STRATEGIES):
+            print("      ✅ One row per family, size and strategy")
+        else:
+            print("      ❌ Missing rows")
+            test_passed = False
+        exact = [r for r in rows if r["strategy"] == "exact" and r["objective_gap"] is not None]
+        greedy = [r for r in rows if r["strategy"] == "greedy"]
+        if exact and all(r["feasible"] and abs(r["objective_gap"]) < 1e-9 for r in exact):
+            print("      ✅ Exact solver has no objective gap")
+        else:
+            print("      ❌ Exact solver shows a gap")
+            test_passed = False
+        if any(not r["feasible"] for r in greedy):
+            print("      ✅ Greedy flagged infeasible where it ignores fairness minimums")
+        else:
+            print("      ❌ Greedy never flagged infeasible at λ=0.6")
+            test_passed = False
+
+        # Test 2: Recommendations are written as a loadable table
+        print("\n   Test 2: Strategy Table")
+        table = strategy.load_table(table_path)
+        print(f"      Table: {table}")
+        if table and table == strategy.load_table(report) and written["recommendations"] == report["recommendations"]:
+            print("      ✅ Table written and loadable")
+        else:
+            print("      ❌ Table missing or inconsistent with the report")
+            test_passed = False
+
+    # Test 3: Auto follows the table by zone count
+    print("\n   Test 3: Auto Selection From Table")
+    rows = [{"max_zones": 2, "solver": "exact"}, {"max_zones": 10, "solver": "cbc"}]
+    small = VolunteerAllocator(0.0, strategy_table=rows).allocate(ZONES[:2], 8)
+    large = VolunteerAllocator(0.0, strategy_table=rows).allocate(ZONES, 8)
+    plain = VolunteerAllocator(0.0).allocate(ZONES, 8)
+    print(f"      2 zones: {small['solver']}, 3 zones: {large['solver']}, no table: {plain['solver']}")
+    columns = {"severity": np.array([5.0, 3.0]), "capacity": np.array([10.0, 10.0])}
+    model_types = (small["model_type"], large["model_type"],
+                   VolunteerAllocator(0.0).allocate_columns(columns, 8)["model_type"])
+    print(f"      model types: {model_types}")
+    if ((small["solver"], large["solver"], plain["solver"]) == ("exact", "cbc", "exact")
+            and model_types == ("Separable Greedy", "Integer Program", "Separable Greedy")):
+        print("      ✅ Auto uses the table's solver for the zone count, model_type names it")
+    else:
+        print("      ❌ Unexpected solver selection")
+        test_passed = False
+    strategy.configure(rows)
+    try:
+        configured = VolunteerAllocator(0.0).allocate(ZONES, 8)["solver"]
+    finally:
+        strategy.configure(None)
+    if configured == "cbc":
+        print("      ✅ Global table applies to allocators without their own")
+    else:
+        print("      ❌ Global table ignored")
+        test_passed = False
+    try:
+        strategy.load_table([{"max_zones": 10, "solver": "greedy"}])
+        print("      ❌ Unknown solver accepted")
+        test_passed = False
+    except ValueError:
+        print("      ✅ Unknown solver rejected")
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 18 TEST PASSED ✅")
+    else:
+        print("PHASE 18 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_pareto_report()
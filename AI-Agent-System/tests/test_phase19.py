@@ -0,0 +1,120 @@
+"""
+Phase 19 Test: Response Team Assignment
+Tests that response teams are matched to zones by specialty fit within each
+zone's allocated volunteers, that the stage scales to thousands of teams and
+zones, and that completion reports carry the team assignment.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import time
+
+from datasets.generator import ScenarioGenerator
+from optimization.team_assignment import assign_teams
+from optimization.volunteer_allocator import VolunteerAllocator
+from agents.workers.disaster_worker import DisasterAllocationWorker
+from agents.supervisor.supervisor import SupervisorAgent
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'datasets', 'disaster_scenarios.json')
+
+
+def load_scenario(index=0):
+    with open(DATASET, encoding="utf-8") as f:
+        scenario = json.load(f)["scenarios"][index]
+    zones = [dict(zone, capacity=zone["required_volunteers"]) for zone in scenario["zones"]]
+    return zones, scenario["available_volunteers"], scenario["response_teams"]
+
+
+def test_team_assignment():
+    """Test specialty matching, capacity limits, scale and report integration."""
+
+    print("=" * 60)
+    print("PHASE 19 TEST: Response Team Assignment")
+    print("=" * 60)
+
+    test_passed = True
+
+    # Test 1: Specialty fit on the urban earthquake scenario
+    print("\n   Test 1: Specialty Fit")
+    zones, volunteers, teams = load_scenario(0)
+    plan = VolunteerAllocator(fairness_weight=0.6).allocate(zones, volunteers)["allocation_plan"]
+    result = assign_teams(zones, teams, plan)
+    hazmat = [entry["zone_id"] for entry in result["assignments"] if entry["specialty"] == "Hazmat"]
+    print(f"      Hazmat team sent to: {hazmat}, match rate: {result['specialty_match_rate']:.0%}")
+    if hazmat == ["Z3"]:
+        print("      ✅ Hazmat team sent to the chemical spill zone")
+    else:
+        print("      ❌ Hazmat team misplaced")
+        test_passed = False
+
+    # Test 2: Team and zone limits hold
+    print("\n   Test 2: Capacity Limits")
+    allocated = {entry["zone_id"]: entry["allocated"] for entry in plan}
+    per_zone, per_team = {}, {}
+    for entry in result["assignments"]:
+        per_zone[entry["zone_id"]] = per_zone.get(entry["zone_id"], 0) + entry["members"]
+        per_team[entry["team_id"]] = per_team.get(entry["team_id"], 0) + entry["members"]
+    capacity = {team["team_id"]: team["capacity"] for team in teams}
+    within = (all(members <= allocated[z] for z, members in per_zone.items())
+              and all(members <= capacity[t] for t, members in per_team.items()))
+    covered = result["uncovered_volunteers"] == sum(allocated.values()) - result["deployed_members"]
+    print(f"      Deployed: {result['deployed_members']}, uncovered: {result['uncovered_volunteers']}")
+    if within and covered:
+        print("      ✅ No zone over its allocation, no team over its capacity")
+    else:
+        print("      ❌ Limits violated")
+        test_passed = False
+
+    # Test 3: Thousands of teams and zones
+    print("\n   Test 3: Scale")
+    scenario = ScenarioGenerator(seed=3, zones_per_team=1, bottleneck_rate=0.0).scenario(0, 5000)
+    plan = VolunteerAllocator(fairness_weight=0.6).allocate(scenario["zones"], scenario["available_volunteers"])
+    start = time.perf_counter()
+    large = assign_teams(scenario["zones"], scenario["response_teams"], plan["allocation_plan"])
+    elapsed = time.perf_counter() - start
+    print(f"      {len(scenario['response_teams'])} teams x 5000 zones: {elapsed:.3f}s ({large['solver_status']}, "
+          f"{large['deployed_members']} members deployed)")
+    if large["solver_status"] == "Optimal" and elapsed < 1.0:
+        print("      ✅ Solved in under a second")
+    else:
+        print("      ❌ Too slow or not optimal")
+        test_passed = False
+
+    # Test 4: Completion report carries the team assignment
+    print("\n   Test 4: Completion Report")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            zones, volunteers, teams = load_scenario(1)
+            worker = DisasterAllocationWorker("Worker_Teams", "Supervisor_Main")
+            supervisor = SupervisorAgent(worker=worker)
+            report = supervisor.assign_task(zones, volunteers, response_teams=teams)
+            without = supervisor.assign_task(zones, volunteers)
+        finally:
+            os.chdir(cwd)
+    assignment = report["results"].get("team_assignment", {})
+    print(f"      Assignments: {len(assignment.get('assignments', []))}, "
+          f"without teams: {'team_assignment' in without['results']}")
+    if assignment.get("assignments") and "team_assignment" not in without["results"]:
+        print("      ✅ Team assignment reported only for tasks with response teams")
+    else:
+        print("      ❌ Team assignment missing from the report")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 19 TEST PASSED ✅")
+    else:
+        print("PHASE 19 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_team_assignment()
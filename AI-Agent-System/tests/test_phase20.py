@@ -0,0 +1,176 @@
+"""
+Phase 20 Test: Proximity-Aware Allocation
+Tests the staging point spatial index, the travel-cost objective against an
+exact all-pairs LP, near-linear scaling, and staging sources in worker
+reports.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+import random
+import tempfile
+import time
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix, vstack
+
+from datasets.generator import ScenarioGenerator
+from optimization.proximity import EARTH_RADIUS_KM, StagingIndex, solve_proximity
+from optimization.separable import STATUS_FEASIBLE, zone_bounds
+from optimization.volunteer_allocator import VolunteerAllocator
+from agents.workers.disaster_worker import DisasterAllocationWorker
+
+
+def staging_points(zones, count, volunteers, seed=0):
+    """Staging points scattered around randomly chosen zones, sharing ``volunteers``."""
+    rng = random.Random(seed)
+    points = []
+    for i in range(count):
+        zone = rng.choice(zones)
+        points.append({"id": f"S{i+1}", "latitude": zone["latitude"] + rng.gauss(0, 0.02),
+                       "longitude": zone["longitude"] + rng.gauss(0, 0.02), "volunteers": volunteers // count + 1})
+    return points
+
+
+def haversine_km(a, b):
+    lat1, lon1, lat2, lon2 = map(math.radians, (a["latitude"], a["longitude"], b["latitude"], b["longitude"]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def exact_objective(zones, points, volunteers, fairness, cost_per_km):
+    """Optimal objective of the all-pairs LP (integral: the constraint matrix is a network matrix)."""
+    n_zones, n_points = len(zones), len(points)
+    km = np.array([[haversine_km(z, p) for p in points] for z in zones])
+    lower, upper = zone_bounds(zones, volunteers, fairness)
+    severity = np.array([z["severity"] for z in zones], dtype=float)
+    cols = np.arange(n_zones * n_points)
+    rows = np.concatenate([cols // n_points, n_zones + cols % n_points])
+    matrix = csr_matrix((np.ones(2 * len(cols)), (rows, np.concatenate([cols, cols]))),
+                        shape=(n_zones + n_points, len(cols)))
+    matrix = vstack([matrix, csr_matrix(np.ones((1, len(cols)))), -matrix[:n_zones]]).tocsr()
+    bounds = np.concatenate([upper, [p["volunteers"] for p in points], [volunteers], -np.array(lower)])
+    result = linprog(-(np.repeat(severity, n_points) - cost_per_km * km.ravel()), A_ub=matrix, b_ub=bounds,
+                     bounds=(0, None), method="highs")
+    return -result.fun
+
+
+def test_proximity_allocation():
+    """Test spatial lookups, plan quality, distance penalty, scale and reports."""
+
+    print("=" * 60)
+    print("PHASE 20 TEST: Proximity-Aware Allocation")
+    print("=" * 60)
+
+    test_passed = True
+    zones = ScenarioGenerator(seed=2, bottleneck_rate=0.0).zones(150)
+    volunteers = int(len(zones) * 7.75)
+    points = staging_points(zones, 15, int(volunteers * 1.3))
+
+    # Test 1: KD-tree neighbours match a brute-force scan
+    print("\n   Test 1: Spatial Index")
+    index = StagingIndex(points)
+    km, nearest = index.nearest([z["latitude"] for z in zones], [z["longitude"] for z in zones], 3)
+    mismatches = 0
+    for z, zone in enumerate(zones):
+        brute = sorted(range(len(points)), key=lambda p: haversine_km(zone, points[p]))[:3]
+        if list(nearest[z]) != brute or abs(km[z][0] - haversine_km(zone, points[brute[0]])) > 1e-6:
+            mismatches += 1
+    print(f"      Zones checked: {len(zones)}, mismatches: {mismatches}")
+    if mismatches == 0:
+        print("      ✅ Nearest staging points and distances match brute force")
+    else:
+        print("      ❌ Spatial index disagrees with brute force")
+        test_passed = False
+
+    # Test 2: Greedy plan is close to the exact all-pairs optimum
+    print("\n   Test 2: Plan Quality")
+    for fairness in (0.0, 0.3):
+        allocations, objective, status, sources = solve_proximity(zones, points, volunteers, fairness, 0.05)
+        exact = exact_objective(zones, points, volunteers, fairness, 0.05)
+        lower, upper = zone_bounds(zones, volunteers, fairness)
+        supplied = {}
+        for entry in sources:
+            for source in entry:
+                supplied[source["staging_id"]] = supplied.get(source["staging_id"], 0) + source["volunteers"]
+        valid = (status == STATUS_FEASIBLE and sum(allocations) <= volunteers
+                 and all(lo <= x <= hi for lo, hi, x in zip(lower, upper, allocations))
+                 and all(supplied.get(p["id"], 0) <= p["volunteers"] for p in points))
+        gap = (exact - objective) / exact
+        print(f"      λ={fairness}: objective {objective:.1f} vs exact {exact:.1f} (gap {gap:.2%})")
+        if valid and gap < 0.02:
+            print("      ✅ Constraints hold, within 2% of the exact optimum")
+        else:
+            print("      ❌ Invalid plan or large gap")
+            test_passed = False
+
+    # Test 3: Distance is penalized
+    print("\n   Test 3: Travel Cost")
+    near = {"id": "Near", "severity": 2, "capacity": 10, "latitude": 40.70, "longitude": -74.00}
+    far = {"id": "Far", "severity": 3, "capacity": 10, "latitude": 41.70, "longitude": -74.00}
+    depot = [{"id": "S1", "latitude": 40.70, "longitude": -74.00, "volunteers": 10}]
+    cheap = VolunteerAllocator(cost_per_km=0.001).allocate([near, far], 10, staging_points=depot)
+    costly = VolunteerAllocator(cost_per_km=0.05).allocate([near, far], 10, staging_points=depot)
+    picked = lambda r: [entry["zone_id"] for entry in r["allocation_plan"] if entry["allocated"]]
+    print(f"      Low cost sends to: {picked(cheap)}, high cost sends to: {picked(costly)}")
+    if picked(cheap) == ["Far"] and picked(costly) == ["Near"] and costly["solver"] == "proximity":
+        print("      ✅ Far zone dropped once travel outweighs its extra severity")
+    else:
+        print("      ❌ Distance penalty not applied")
+        test_passed = False
+
+    # Test 4: Near-linear scaling in zones
+    print("\n   Test 4: Scale")
+    times = {}
+    for size in (5000, 20000):
+        big = ScenarioGenerator(seed=4, bottleneck_rate=0.0).zones(size)
+        pts = staging_points(big, size // 10, int(size * 9))
+        StagingIndex(pts[:2])  # scipy import outside the timing
+        start = time.perf_counter()
+        result = VolunteerAllocator(fairness_weight=0.6).allocate(big, int(size * 7.75), staging_points=pts)
+        times[size] = time.perf_counter() - start
+        arcs = sum(len(entry["sources"]) for entry in result["allocation_plan"])
+        print(f"      {size} zones x {len(pts)} points: {times[size]:.2f}s, {arcs} source arcs, "
+              f"status {result['solver_status']}")
+    if times[20000] < 10 * times[5000]:
+        print("      ✅ Time grows roughly linearly with zones")
+    else:
+        print("      ❌ Superlinear growth")
+        test_passed = False
+
+    # Test 5: Worker reports staging sources and travel totals
+    print("\n   Test 5: Worker Report")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            worker = DisasterAllocationWorker("Worker_Proximity", "Supervisor_Main", fairness_weight=0.3)
+            result = worker.process_task({"zones": zones[:20], "available_volunteers": 150,
+                                          "staging_points": points})
+        finally:
+            os.chdir(cwd)
+    travel = result["optimization_metadata"].get("travel", {})
+    with_sources = [entry for entry in result["allocation_plan"] if entry.get("sources")]
+    print(f"      Zones with sources: {len(with_sources)}, volunteer-km: {travel.get('volunteer_km')}")
+    if with_sources and "volunteer_km" in travel:
+        print("      ✅ Plan entries carry staging sources, metadata carries travel totals")
+    else:
+        print("      ❌ Sources or travel missing")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 20 TEST PASSED ✅")
+    else:
+        print("PHASE 20 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_proximity_allocation()
@@ -0,0 +1,143 @@
+"""
+Phase 21 Test: Rolling-Horizon Multi-Period Planning
+Tests shift counts, volunteer conservation and fatigue limits, warm-start
+carry-over, flat per-shift cost as the horizon grows, and the worker's
+per-period LTM cache (with a flat cost per cached shift).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import time
+
+from datasets.generator import ScenarioGenerator
+from optimization.multiperiod import RollingHorizonPlanner, state_volunteers
+from agents.workers.disaster_worker import DisasterAllocationWorker
+
+
+def strip_timing(timeline):
+    return [{k: v for k, v in record.items() if k not in ("solve_time_seconds", "source")} for record in timeline]
+
+
+def test_multiperiod_planning():
+    """Test shift planning, fatigue, warm starts, scaling and per-period caching."""
+
+    print("=" * 60)
+    print("PHASE 21 TEST: Rolling-Horizon Multi-Period Planning")
+    print("=" * 60)
+
+    test_passed = True
+    zones = [{"id": "Z1", "severity": 5, "capacity": 10}, {"id": "Z2", "severity": 3, "capacity": 10},
+             {"id": "Z3", "severity": 1, "capacity": 10}]
+
+    # Test 1: Shifts cover the duration and volunteers are conserved
+    print("\n   Test 1: Shifts and Conservation")
+    planner = RollingHorizonPlanner(fairness_weight=0.3)
+    state = planner.initial_state(20)
+    counts, assigned = [], []
+    for period in range(planner.periods(44)):
+        record, state = planner.step(zones, period, state)
+        counts.append(state_volunteers(state))
+        assigned.append(sum(entry["assigned_volunteers"] for entry in record["allocation_plan"]))
+    print(f"      Shifts for 44h: {len(counts)}, volunteers per state: {set(counts)}, assigned: {assigned}")
+    if len(counts) == 6 and set(counts) == {20}:
+        print("      ✅ 8h shifts cover the horizon, no volunteer lost or created")
+    else:
+        print("      ❌ Wrong shift count or volunteers not conserved")
+        test_passed = False
+
+    # Test 2: Nobody works more than max_consecutive_shifts in a row
+    print("\n   Test 2: Fatigue Limit")
+    if assigned == [20, 20, 0, 20, 20, 0]:
+        print("      ✅ Full crew works two shifts, then rests one")
+    else:
+        print("      ❌ Fatigue limit not enforced")
+        test_passed = False
+
+    # Test 3: Warm start keeps volunteers in place
+    print("\n   Test 3: Warm Start")
+    timeline = RollingHorizonPlanner(fairness_weight=0.3).plan(zones, 40, 24)["timeline"]
+    second = timeline[1]["allocation_plan"]
+    carried = [(entry["carried_over"], entry["fresh"]) for entry in second]
+    print(f"      Shift 2 (carried, fresh): {carried}")
+    if all(record["warm_started"] for record in timeline) and all(fresh == 0 for _, fresh in carried[:2]):
+        print("      ✅ Second shift reuses the first shift's crews")
+    else:
+        print("      ❌ Crews reshuffled between shifts")
+        test_passed = False
+
+    # Test 4: Per-shift cost stays flat as the horizon grows
+    print("\n   Test 4: Flat Cost per Shift")
+    big = ScenarioGenerator(seed=5, bottleneck_rate=0.0).zones(3000)
+    per_shift = {}
+    for hours in (32, 320):
+        start = time.perf_counter()
+        shifts = RollingHorizonPlanner(fairness_weight=0.6).plan(big, 23000, hours)["timeline"]
+        per_shift[hours] = (time.perf_counter() - start) / len(shifts)
+        print(f"      {hours}h ({len(shifts)} shifts): {per_shift[hours] * 1000:.1f} ms per shift")
+    if per_shift[320] < 2 * per_shift[32]:
+        print("      ✅ Per-shift time independent of horizon length")
+    else:
+        print("      ❌ Per-shift time grows with the horizon")
+        test_passed = False
+
+    # Test 5: Worker caches shifts by period, so longer horizons reuse earlier ones
+    print("\n   Test 5: Worker Per-Period Cache")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            worker = DisasterAllocationWorker("Worker_Shifts", "Supervisor_Main", fairness_weight=0.3)
+            short = worker.process_task({"zones": zones, "available_volunteers": 25, "duration_hours": 24})
+            longer = worker.process_task({"zones": zones, "available_volunteers": 25, "duration_hours": 48})
+        finally:
+            os.chdir(cwd)
+    sources = [record["source"] for record in longer["timeline"]]
+    print(f"      24h sources: {[r['source'] for r in short['timeline']]}, 48h sources: {sources}")
+    if (sources == ["LTM"] * 3 + ["LIVE"] * 3
+            and strip_timing(longer["timeline"][:3]) == strip_timing(short["timeline"])
+            and strip_timing(longer["timeline"]) == strip_timing(
+                RollingHorizonPlanner(fairness_weight=0.3).plan(zones, 25, 48)["timeline"])):
+        print("      ✅ Earlier shifts served from LTM, timeline matches a fresh plan")
+    else:
+        print("      ❌ Period cache missed or changed the timeline")
+        test_passed = False
+
+    # Test 6: Caching a shift costs the same however long the horizon is
+    print("\n   Test 6: Flat Worker Cost per Shift")
+    mid = ScenarioGenerator(seed=6, bottleneck_rate=0.0).zones(500)
+    per_period, ltm_sizes = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for shifts in (12, 48):
+                worker = DisasterAllocationWorker(f"Worker_Flat_{shifts}", "Supervisor_Main", fairness_weight=0.6)
+                start = time.perf_counter()
+                timeline = worker._plan_timeline({"zones": mid, "available_volunteers": 4000,
+                                                  "duration_hours": shifts * 8})
+                per_period[shifts] = (time.perf_counter() - start) / len(timeline)
+                ltm_sizes[shifts] = sum(f.stat().st_size for f in worker.ltm_dir.rglob("*") if f.is_file())
+                print(f"      {shifts} shifts: {per_period[shifts] * 1000:.1f} ms per shift, "
+                      f"LTM {ltm_sizes[shifts] / 1024:.0f} KB")
+        finally:
+            os.chdir(cwd)
+    if per_period[48] < 2 * per_period[12] and ltm_sizes[48] < 6 * ltm_sizes[12]:
+        print("      ✅ Per-shift time and LTM size per shift independent of horizon length")
+    else:
+        print("      ❌ Cached shifts get costlier as the horizon grows")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 21 TEST PASSED ✅")
+    else:
+        print("PHASE 21 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_multiperiod_planning()
@@ -0,0 +1,167 @@
+"""
+Phase 23 Test: Individual Volunteer Roster Matching
+Tests named assignments from a volunteer roster: validity, maximum fill and
+weight against an all-pairs LP, availability windows, augmenting paths,
+100k-volunteer scale and worker reports.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
+
+from datasets.generator import ScenarioGenerator
+from optimization.proximity import EARTH_RADIUS_KM
+from optimization.roster import MAX_KM, _fit_table, match_roster, volunteer_available
+from optimization.volunteer_allocator import VolunteerAllocator
+from agents.workers.disaster_worker import DisasterAllocationWorker
+
+
+def all_pairs_lp(zones, roster, counts):
+    """Max-weight b-matching over every compatible pair within MAX_KM (LP relaxation)."""
+    zones = [zone for zone in zones if counts.get(zone["id"], 0) > 0]
+    combos = list({frozenset(v["skills"]) for v in roster})
+    table = _fit_table(zones, combos)
+    combo = np.array([combos.index(frozenset(v["skills"])) for v in roster])
+    lat = np.radians([[v["latitude"] for v in roster]]).T
+    lon = np.radians([[v["longitude"] for v in roster]]).T
+    zone_lat = np.radians([zone["latitude"] for zone in zones])
+    zone_lon = np.radians([zone["longitude"] for zone in zones])
+    h = np.sin((zone_lat - lat) / 2) ** 2 + np.cos(lat) * np.cos(zone_lat) * np.sin((zone_lon - lon) / 2) ** 2
+    km = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(h))
+    fit = np.array([row if row is not None else [0.0] * len(combos) for row in table]).T[combo]
+    open_zone = np.array([row is None for row in table])
+    volunteer, zone = np.nonzero((km <= MAX_KM) & ((fit > 0) | open_zone))
+    severity = np.array([z["severity"] for z in zones])
+    weight = severity[zone] * (1 + fit[volunteer, zone]) - 0.01 * km[volunteer, zone]
+    edges = len(weight)
+    rows, cols = np.r_[volunteer, len(roster) + zone], np.r_[np.arange(edges), np.arange(edges)]
+    matrix = csr_matrix((np.ones(2 * edges), (rows, cols)), shape=(len(roster) + len(zones), edges))
+    limits = np.r_[np.ones(len(roster)), [counts[z["id"]] for z in zones]]
+    result = linprog(-weight, A_ub=matrix, b_ub=limits, bounds=(0, 1), method="highs")
+    return -result.fun, result.x.sum()
+
+
+def test_roster_matching():
+    """Test roster validity, optimality, availability, scale and worker reports."""
+
+    print("=" * 60)
+    print("PHASE 23 TEST: Individual Volunteer Roster Matching")
+    print("=" * 60)
+
+    test_passed = True
+    generator = ScenarioGenerator(seed=1, bottleneck_rate=0.0)
+    zones = generator.zones(150)
+    roster = [v for v in generator.roster(2500) if volunteer_available(v)]
+    plan = VolunteerAllocator(fairness_weight=0.6).allocate(zones, 1800)["allocation_plan"]
+    counts = {entry["zone_id"]: entry["allocated"] for entry in plan}
+    result = match_roster(zones, roster, plan)
+
+    # Test 1: Every assignment is valid
+    print("\n   Test 1: Valid Assignments")
+    per_volunteer = Counter(a["volunteer_id"] for a in result["assignments"])
+    per_zone = Counter(a["zone_id"] for a in result["assignments"])
+    print(f"      {result['filled']}/{result['requested']} slots filled from {len(roster)} volunteers, "
+          f"{result['edges']} edges, mean {result['mean_distance_km']} km")
+    if (max(per_volunteer.values()) == 1 and all(per_zone[z] <= counts[z] for z in per_zone)
+            and all(a["distance_km"] <= MAX_KM for a in result["assignments"])
+            and result["edges"] < len(roster) * len(zones) // 5):
+        print("      ✅ Each volunteer once, zone counts respected, edges sparse")
+    else:
+        print("      ❌ Invalid assignment")
+        test_passed = False
+
+    # Test 2: Fill and weight against the all-pairs LP
+    print("\n   Test 2: All-Pairs LP")
+    optimum, fill = all_pairs_lp(zones, roster, counts)
+    print(f"      weight {result['objective_value']} vs LP {optimum:.2f}, fill {result['filled']} vs {fill:.0f}, "
+          f"status {result['solver_status']}")
+    if (result["filled"] >= round(fill) and result["objective_value"] >= 0.95 * optimum
+            and result["solver_status"] == "MaxFill"):
+        print("      ✅ Maximum fill, weight within 5% of the LP optimum (reported as MaxFill, not Optimal)")
+    else:
+        print("      ❌ Matching falls short of the LP")
+        test_passed = False
+
+    # Test 3: Augmenting paths move a volunteer to make room
+    print("\n   Test 3: Augmenting Paths")
+    pair = [{"id": "A", "severity": 5, "latitude": 40.0, "longitude": -74.0, "hazards": ["Fire"],
+             "resources_needed": ["Evacuation transport"]},
+            {"id": "B", "severity": 1, "latitude": 40.0, "longitude": -74.01, "hazards": ["Smoke"]}]
+    people = [{"volunteer_id": "v1", "skills": ["Firefighting"], "latitude": 40.0, "longitude": -74.0},
+              {"volunteer_id": "v2", "skills": ["Evacuation Coordination"], "latitude": 40.0, "longitude": -74.0}]
+    small = match_roster(pair, people, [{"zone_id": "A", "allocated": 1}, {"zone_id": "B", "allocated": 1}])
+    print(f"      {[(a['volunteer_id'], a['zone_id']) for a in small['assignments']]}, augmented {small['augmented']}")
+    if small["fill_rate"] == 1.0 and small["augmented"] == 1:
+        print("      ✅ Firefighter moved to B so both zones fill")
+    else:
+        print("      ❌ Greedy matching left a zone short")
+        test_passed = False
+
+    # Test 4: Only volunteers available at the requested hour
+    print("\n   Test 4: Availability Windows")
+    night = match_roster(zones, roster, plan, hour=20)
+    on_shift = {v["volunteer_id"] for v in roster if v["availability"][0] <= 20 < v["availability"][1]}
+    print(f"      hour 20: {len(on_shift)} on shift, {night['filled']} slots filled")
+    if {a["volunteer_id"] for a in night["assignments"]} <= on_shift and night["filled"] <= len(on_shift):
+        print("      ✅ Off-shift volunteers are never assigned")
+    else:
+        print("      ❌ Assigned a volunteer outside their window")
+        test_passed = False
+
+    # Test 5: 100k volunteers across 5k zones within seconds
+    print("\n   Test 5: Scale")
+    large = ScenarioGenerator(seed=3, bottleneck_rate=0.0)
+    large_zones = large.zones(5000)
+    large_plan = VolunteerAllocator(fairness_weight=0.6).allocate(large_zones, 80000)["allocation_plan"]
+    large_roster = large.roster(100000)
+    start = time.perf_counter()
+    big = match_roster(large_zones, large_roster, large_plan)
+    elapsed = time.perf_counter() - start
+    print(f"      {big['filled']}/{big['requested']} filled, {big['edges']} edges in {elapsed:.2f}s")
+    if big["fill_rate"] >= 0.99 and elapsed < 60:
+        print("      ✅ 100k-volunteer roster matched")
+    else:
+        print("      ❌ Roster matching too slow or incomplete")
+        test_passed = False
+
+    # Test 6: Worker reports named assignments
+    print("\n   Test 6: Worker Report")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            worker = DisasterAllocationWorker("Worker_Roster", "Supervisor_Main", fairness_weight=0.6)
+            report = worker.process_task({"zones": zones[:20], "available_volunteers": 200,
+                                          "roster": roster[:400], "roster_hour": 10})
+        finally:
+            os.chdir(cwd)
+    assignment = report.get("roster_assignment", {})
+    print(f"      {assignment.get('filled')}/{assignment.get('requested')} filled, "
+          f"{len(assignment.get('unfilled_zones', []))} zones short")
+    if (assignment.get("requested") == sum(e["assigned_volunteers"] for e in report["allocation_plan"])
+            and len(assignment["assignments"]) == assignment["filled"] > 0):
+        print("      ✅ Worker names who goes to each zone")
+    else:
+        print("      ❌ Roster assignment missing from the report")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 23 TEST PASSED ✅")
+    else:
+        print("PHASE 23 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_roster_matching()
@@ -0,0 +1,168 @@
+"""
+Phase 25 Test: Streaming Fairness Metrics
+Tests one-pass Gini, Jain, variance and satisfaction against two-pass
+references, chunked / batched / merged accumulation, numerical stability,
+and the metrics reported by the allocator and over streamed plans.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import random
+import tempfile
+
+import numpy as np
+
+from agents.supervisor.supervisor import SupervisorAgent
+from agents.workers.disaster_worker import DisasterAllocationWorker
+from communication import protocol
+from datasets.generator import ScenarioGenerator
+from optimization.fairness import FairnessAccumulator, fairness_metrics
+from optimization.volunteer_allocator import VolunteerAllocator
+
+
+class CaptureTransport:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, recipient, message_obj):
+        self.sent.append(message_obj)
+
+
+def reference(allocated, severity, required):
+    """Two-pass definitions over the whole plan."""
+    x = np.array(allocated, dtype=float)
+    n, ordered = len(x), np.sort(x)
+    rated = np.array(required) > 0
+    satisfaction = np.minimum(x[rated] / np.array(required)[rated], 1.0)
+    return {
+        "variance": x.var(),
+        "gini": (2 * np.arange(1, n + 1) - n - 1) @ ordered / (n * x.sum()),
+        "jain_index": x.sum() ** 2 / (n * (x ** 2).sum()),
+        "severity_weighted_satisfaction_pct": 100 * np.array(severity)[rated] @ satisfaction
+        / np.array(severity)[rated].sum(),
+        "min_satisfaction_pct": 100 * satisfaction.min(),
+    }
+
+
+def close(metrics, expected, keys):
+    tolerance = {"variance": 0.01, "gini": 1e-4, "jain_index": 1e-4}
+    return all(abs(metrics[k] - expected[k]) <= tolerance.get(k, 0.1) for k in keys)
+
+
+def test_fairness_metrics():
+    """Test one-pass fairness metrics, streaming accumulation and reports."""
+
+    print("=" * 60)
+    print("PHASE 25 TEST: Streaming Fairness Metrics")
+    print("=" * 60)
+
+    test_passed = True
+    rng = random.Random(7)
+    allocated = [rng.randint(0, 40) for _ in range(20001)]
+    severity = [rng.randint(1, 10) for _ in allocated]
+    required = [rng.choice((0, 5, 10, 20, 30)) for _ in allocated]
+    keys = ("variance", "gini", "jain_index", "severity_weighted_satisfaction_pct", "min_satisfaction_pct")
+
+    # Test 1: One pass matches the two-pass definitions
+    print("\n   Test 1: One-Pass Metrics")
+    metrics = fairness_metrics(allocated, severity, required)
+    expected = reference(allocated, severity, required)
+    print(f"      Gini {metrics['gini']} (ref {expected['gini']:.4f}), Jain {metrics['jain_index']} "
+          f"(ref {expected['jain_index']:.4f}), variance {metrics['variance']} (ref {expected['variance']:.2f})")
+    if close(metrics, expected, keys):
+        print("      ✅ Matches the two-pass references")
+    else:
+        print("      ❌ One-pass metrics differ")
+        test_passed = False
+
+    # Test 2: Chunks, numpy batches and merged accumulators agree
+    print("\n   Test 2: Streaming and Batches")
+    streamed = FairnessAccumulator()
+    for start in range(0, len(allocated), 777):
+        streamed.add_plan({"allocated": x, "severity": s, "required": r}
+                          for x, s, r in zip(allocated[start:start + 777], severity[start:start + 777],
+                                             required[start:start + 777]))
+    batched = FairnessAccumulator()
+    for start in range(0, len(allocated), 5000):
+        part = FairnessAccumulator()
+        part.add_batch(np.array(allocated[start:start + 5000]), np.array(severity[start:start + 5000]),
+                       np.array(required[start:start + 5000]))
+        batched.merge(part)
+    print(f"      streamed {streamed.metrics()['gini']}, batched {batched.metrics()['gini']}")
+    if streamed.metrics() == metrics and batched.metrics() == metrics:
+        print("      ✅ Chunked, batched and merged accumulation give the same metrics")
+    else:
+        print("      ❌ Accumulation order changes the result")
+        test_passed = False
+
+    # Test 3: Stable when allocations share a large offset
+    print("\n   Test 3: Numerical Stability")
+    shifted = fairness_metrics([1e9 + x for x in allocated])
+    print(f"      variance with 1e9 offset: {shifted['variance']} (expected {metrics['variance']})")
+    if abs(shifted["variance"] - metrics["variance"]) <= 0.01:
+        print("      ✅ No catastrophic cancellation")
+    else:
+        print("      ❌ Variance lost to cancellation")
+        test_passed = False
+
+    # Test 4: Allocator reports the full set
+    print("\n   Test 4: Allocator Metrics")
+    zones = ScenarioGenerator(seed=4, bottleneck_rate=0.0).zones(500)
+    result = VolunteerAllocator(fairness_weight=0.6).allocate(zones, 4000)
+    plan = result["allocation_plan"]
+    expected = reference([e["allocated"] for e in plan], [z["severity"] for z in zones],
+                         [z["required_volunteers"] for z in zones])
+    reported = result["fairness_metrics"]
+    print(f"      {reported}")
+    if close(reported, expected, keys) and reported["zones"] == len(zones):
+        print("      ✅ Gini, Jain and satisfaction reported with the plan")
+    else:
+        print("      ❌ Allocator metrics incomplete or wrong")
+        test_passed = False
+
+    # Test 5: Supervisor accumulates fairness over a streamed plan
+    print("\n   Test 5: Streamed Plan")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            capture = CaptureTransport()
+            worker = DisasterAllocationWorker("Worker_Fair", "Supervisor_Main", fairness_weight=0.6,
+                                              transport=capture, report_chunk_size=64)
+            worker._execute_task({"zones": zones, "available_volunteers": 4000}, "task-fair")
+            supervisor = SupervisorAgent()
+            running = []
+            for message in capture.sent:
+                supervisor.receive_report(message)
+                if message["type"] == protocol.COMPLETION_REPORT_PARTIAL:
+                    running.append(supervisor.stream_fairness("task-fair")["zones"])
+            with open(supervisor.log_file) as f:
+                logged = [json.loads(line) for line in f]
+        finally:
+            os.chdir(cwd)
+    final = [entry["data"] for entry in logged if entry["type"] == "stream_fairness"]
+    worker_metrics = capture.sent[-1]["results"]["optimization_metadata"]["fairness_metrics"]
+    print(f"      zones seen while streaming: {running[:3]}..., final Gini {final[0]['gini'] if final else None}")
+    if (running == sorted(running) and running[-1] == len(zones) and final
+            and final[0]["severity_weighted_satisfaction_pct"] is not None
+            and all(final[0][k] == worker_metrics[k] for k in worker_metrics)):
+        print("      ✅ Running metrics while chunks arrive, final metrics match the worker's")
+    else:
+        print("      ❌ Streamed fairness differs")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 25 TEST PASSED ✅")
+    else:
+        print("PHASE 25 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_fairness_metrics()
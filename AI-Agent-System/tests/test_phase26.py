@@ -0,0 +1,151 @@
+"""
+Phase 26 Test: Sensitivity Analysis
+Tests shadow prices, binding constraints and ranges reported with each plan,
+and what-if answers for budget and zone bound changes against re-solves.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import tempfile
+
+from agents.workers.disaster_worker import DisasterAllocationWorker
+from datasets.generator import ScenarioGenerator
+from optimization import sensitivity
+from optimization.separable import solve_separable, zone_bounds
+from optimization.volunteer_allocator import VolunteerAllocator
+
+
+def resolve_bound(zones, total, fairness, zone_id, changes):
+    """Re-solve with one zone's fields changed (other zones keep their bounds)."""
+    changed = [dict(zone, **changes) if zone["id"] == zone_id else zone for zone in zones]
+    lower, upper = zone_bounds(zones, total, fairness)
+    _, new_upper = zone_bounds(changed, total, fairness)
+    i = next(i for i, zone in enumerate(zones) if zone["id"] == zone_id)
+    upper[i] = new_upper[i]
+    return solve_separable(changed, total, fairness, (lower, upper))
+
+
+def agrees(answer, objective, status):
+    return answer["feasible"] == (status == 1) and (status != 1 or abs(answer["objective_value"] - objective) < 1e-6)
+
+
+def test_sensitivity_analysis():
+    """Test sensitivity reports and what-if queries."""
+
+    print("=" * 60)
+    print("PHASE 26 TEST: Sensitivity Analysis")
+    print("=" * 60)
+
+    test_passed = True
+    rng = random.Random(26)
+    zones = ScenarioGenerator(seed=26, bottleneck_rate=0.0).zones(800)
+
+    # Test 1: Shadow price, binding constraints and ranges
+    print("\n   Test 1: Report")
+    result = VolunteerAllocator(fairness_weight=0.3).allocate(zones, 5000)
+    report = result["sensitivity"]
+    bindings = {}
+    for info in report["zones"].values():
+        bindings[info["binding"]] = bindings.get(info["binding"], 0) + 1
+    print(f"      shadow price {report['shadow_price']}, range {report['budget_range']}, bindings {bindings}")
+    if (report["shadow_price"] > 0 and report["marginal_zones"]
+            and all(report["zones"][z]["binding"] == "budget" for z in report["marginal_zones"])
+            and {"fairness", "budget"} <= set(bindings) and set(bindings) & {"capacity", "resources", "required"}
+            and report["budget_range"][0] <= 5000 <= report["budget_range"][1]):
+        print("      ✅ Prices, per-zone binding constraints and ranges reported")
+    else:
+        print("      ❌ Report incomplete")
+        test_passed = False
+
+    # Test 2: Budget what-ifs match re-solves (fairness minimums move with the budget)
+    print("\n   Test 2: Budget Changes")
+    mismatches, checked = 0, 0
+    for fairness, total in ((0.0, 4000), (0.3, 5000), (0.6, 9000)):
+        allocations, _, _ = solve_separable(zones, total, fairness)
+        report = sensitivity.analyze(zones, allocations, total, fairness)
+        for delta in [1, 10, -10] + [rng.randint(-total // 10, total // 10) for _ in range(30)]:
+            answer = sensitivity.budget_change(report, delta)
+            _, objective, status = solve_separable(zones, total + delta, fairness)
+            checked += 1
+            mismatches += not (answer["exact"] and agrees(answer, objective, status))
+    ten_more = sensitivity.budget_change(report, 10)
+    print(f"      {checked} changes, {mismatches} mismatches; +10 volunteers: {ten_more['objective_change']}")
+    if mismatches == 0:
+        print("      ✅ Budget answers equal the re-solved objective")
+    else:
+        print("      ❌ Budget answers differ from re-solves")
+        test_passed = False
+
+    # Test 3: Zone capacity / resource what-ifs match re-solves
+    print("\n   Test 3: Bound Changes")
+    allocations, _, _ = solve_separable(zones, 5000, 0.3)
+    report = sensitivity.analyze(zones, allocations, 5000, 0.3)
+    mismatches, checked, infeasible = 0, 0, 0
+    for zone in rng.sample(zones, 60):
+        for field in ("capacity", "resources_available"):
+            for factor in (0, 0.5, 1.5, 3):
+                changes = {field: int(zone[field] * factor)}
+                answer = sensitivity.bound_change(report, zone, **changes)
+                _, objective, status = resolve_bound(zones, 5000, 0.3, zone["id"], changes)
+                checked += 1
+                infeasible += status != 1
+                mismatches += not agrees(answer, objective, status)
+    print(f"      {checked} changes ({infeasible} infeasible), {mismatches} mismatches")
+    if mismatches == 0 and infeasible > 0:
+        print("      ✅ Bound answers equal re-solves, infeasible changes flagged")
+    else:
+        print("      ❌ Bound answers differ from re-solves")
+        test_passed = False
+
+    # Test 4: Spare volunteers are worth nothing; far changes are flagged
+    print("\n   Test 4: Slack Budget and Exact Range")
+    allocations, _, _ = solve_separable(zones, 200000, 0.0)
+    slack = sensitivity.analyze(zones, allocations, 200000, 0.0)
+    spare = sensitivity.budget_change(slack, 100)
+    allocations, _, _ = solve_separable(zones, 5000, 0.3)
+    far = sensitivity.budget_change(sensitivity.analyze(zones, allocations, 5000, 0.3), 3000)
+    print(f"      slack: price {slack['shadow_price']}, +100 -> {spare['objective_change']}; "
+          f"+3000 at λ=0.3 exact: {far['exact']}")
+    if (slack["shadow_price"] == 0 and spare["objective_change"] == 0
+            and slack["budget_range"][1] is None and not far["exact"]):
+        print("      ✅ Unused volunteers priced at 0, answers outside the exact range flagged")
+    else:
+        print("      ❌ Slack or range handling wrong")
+        test_passed = False
+
+    # Test 5: Worker returns the report with the plan
+    print("\n   Test 5: Worker")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            worker = DisasterAllocationWorker("Worker_Sensitivity", "Supervisor_Main", fairness_weight=0.3)
+            worker_report = worker.process_task({"zones": zones[:100], "available_volunteers": 600})
+        finally:
+            os.chdir(cwd)
+    staged = VolunteerAllocator().allocate(zones[:5], 50, staging_points=[
+        {"id": "S1", "latitude": zones[0]["latitude"], "longitude": zones[0]["longitude"], "volunteers": 50}])
+    print(f"      worker shadow price: {worker_report.get('sensitivity', {}).get('shadow_price')}, "
+          f"staged plan report: {'sensitivity' in staged}")
+    if ("sensitivity" in worker_report and len(worker_report["sensitivity"]["zones"]) == 100
+            and "sensitivity" not in staged):
+        print("      ✅ Sensitivity travels with the worker's plan")
+    else:
+        print("      ❌ Worker report missing sensitivity")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 26 TEST PASSED ✅")
+    else:
+        print("PHASE 26 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_sensitivity_analysis()
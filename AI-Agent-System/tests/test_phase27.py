@@ -0,0 +1,112 @@
+"""
+Phase 27 Test: Budget Curve
+Tests the objective-versus-budget curve against separate solves: objective
+and plans at any budget, concavity and breakpoints, fixed fairness minimums,
+and lookups against a sweep of solves.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+
+from datasets.generator import ScenarioGenerator
+from optimization.budget_curve import BudgetCurve
+from optimization.separable import solve_separable, zone_bounds
+from optimization.volunteer_allocator import VolunteerAllocator
+
+
+def test_budget_curve():
+    """Test the budget curve against per-budget solves."""
+
+    print("=" * 60)
+    print("PHASE 27 TEST: Budget Curve")
+    print("=" * 60)
+
+    test_passed = True
+    rng = random.Random(27)
+    zones = ScenarioGenerator(seed=27, bottleneck_rate=0.0).zones(2000)
+    pool = 20000
+    curve = BudgetCurve(zones, pool)
+
+    # Test 1: Objective and plans equal separate solves
+    print("\n   Test 1: Any Budget")
+    budgets = [0, 1, curve.ends[0], curve.ends[0] + 1, curve.ends[-1], pool]
+    budgets += [rng.randint(0, pool) for _ in range(40)]
+    mismatches = 0
+    for budget in budgets:
+        allocations, objective, _ = solve_separable(zones, budget, 0.0)
+        sampled = rng.sample(range(len(zones)), 25)
+        if (abs(curve.objective(budget) - objective) > 1e-9 or curve.allocations(budget) != allocations
+                or any(curve.allocated(budget, i) != allocations[i] for i in sampled)):
+            mismatches += 1
+    print(f"      {len(budgets)} budgets, {mismatches} mismatches")
+    if mismatches == 0:
+        print("      ✅ Same objective and plan as solving each budget")
+    else:
+        print("      ❌ Curve differs from the solver")
+        test_passed = False
+
+    # Test 2: Concave, one breakpoint per filled zone, diminishing returns
+    print("\n   Test 2: Breakpoints")
+    slopes = [point["severity"] for point in curve.breakpoints]
+    middle = curve.breakpoints[len(curve.breakpoints) // 2]
+    print(f"      {len(curve.breakpoints)} breakpoints, slopes {slopes[0]} -> {slopes[-1]}, "
+          f"zone at budget {middle['budget'] - 1}: {curve.partial_zone(middle['budget'] - 1)}")
+    if (all(a >= b for a, b in zip(slopes, slopes[1:]))
+            and all(p["objective_value"] == curve.objective(p["budget"]) for p in curve.breakpoints)
+            and curve.marginal_value(0) == slopes[0] and curve.marginal_value(pool) == 0.0
+            and curve.partial_zone(middle["budget"] - 1) in (middle["zone_id"], None)):
+        print("      ✅ Concave curve with the zone filled at each step")
+    else:
+        print("      ❌ Breakpoints wrong")
+        test_passed = False
+
+    # Test 3: Fairness minimums held fixed
+    print("\n   Test 3: Fixed Fairness Minimums")
+    bounds = zone_bounds(zones, pool, 0.6)
+    fair = VolunteerAllocator(fairness_weight=0.6).budget_curve(zones, pool)
+    checks = [fair.min_budget, pool] + [rng.randint(fair.min_budget, pool) for _ in range(10)]
+    mismatches = sum(abs(fair.objective(b) - solve_separable(zones, b, 0.6, bounds)[1]) > 1e-9 for b in checks)
+    try:
+        fair.objective(fair.min_budget - 1)
+        rejected = False
+    except ValueError:
+        rejected = True
+    print(f"      curve starts at {fair.min_budget}, {mismatches} mismatches, below minimums rejected: {rejected}")
+    if mismatches == 0 and rejected and fair.min_budget > 0:
+        print("      ✅ Minimums of the full pool held along the curve")
+    else:
+        print("      ❌ Fixed-minimum curve wrong")
+        test_passed = False
+
+    # Test 4: One build answers a sweep faster than solving each point
+    print("\n   Test 4: Sweep")
+    start = time.perf_counter()
+    curve = BudgetCurve(zones, pool)
+    swept = [curve.objective(b) for b in range(0, pool + 1, 100)]
+    curve_time = time.perf_counter() - start
+    start = time.perf_counter()
+    solved = [solve_separable(zones, b, 0.0)[1] for b in range(0, pool + 1, 100)]
+    solve_time = time.perf_counter() - start
+    print(f"      {len(swept)} budgets: curve {curve_time:.3f}s, solves {solve_time:.3f}s")
+    if swept == solved and curve_time < solve_time:
+        print("      ✅ Whole sweep from one computation")
+    else:
+        print("      ❌ Sweep differs or is slower")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 27 TEST PASSED ✅")
+    else:
+        print("PHASE 27 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_budget_curve()
@@ -0,0 +1,152 @@
+"""
+Phase 29 Test: Streaming Scenario Reader
+Tests reading scenario files one scenario or zone chunk at a time: the same
+data as json.load for JSON and JSONL files, random access by scenario_id
+through the side index, index reuse and rebuild, bounded memory, and
+feeding a scenario to the allocator.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from datasets import ScenarioGenerator, ScenarioReader, write_json, write_jsonl
+from optimization.volunteer_allocator import VolunteerAllocator
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'datasets', 'disaster_scenarios.json')
+
+
+def peak_mb(function):
+    """Peak traced memory while running ``function``."""
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def test_scenario_reader():
+    """Test the streaming reader against full loads."""
+
+    print("=" * 60)
+    print("PHASE 29 TEST: Streaming Scenario Reader")
+    print("=" * 60)
+
+    test_passed = True
+    generator = ScenarioGenerator(seed=29)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Test 1: Same scenarios as json.load (pretty-printed, non-ASCII, tiny read blocks)
+        print("\n   Test 1: Same Data as json.load")
+        sample = os.path.join(tmp, "sample.json")
+        shutil.copy(DATASET, sample)
+        with open(sample, encoding="utf-8") as f:
+            expected = json.load(f)
+        unicode_file = os.path.join(tmp, "unicode.json")
+        unicode_data = {"scenarios": [dict(s, name=f"Zürich – {s['name']}") for s in expected["scenarios"]]}
+        with open(unicode_file, "w", encoding="utf-8") as f:
+            json.dump(unicode_data, f, ensure_ascii=False, indent=4)
+        same = all(ScenarioReader(sample, chunk_size=2, block_size=50).scenario(i) == s
+                   for i, s in enumerate(expected["scenarios"]))
+        reader = ScenarioReader(unicode_file, block_size=33)
+        same = same and all(reader.scenario(s["scenario_id"]) == s for s in reversed(unicode_data["scenarios"]))
+        same = same and ScenarioReader(sample).metadata == expected["metadata"]
+        print(f"      scenarios: {reader.ids()}")
+        if same:
+            print("      ✅ Every scenario and the metadata equal the full load")
+        else:
+            print("      ❌ Streamed scenarios differ from json.load")
+            test_passed = False
+
+        # Test 2: Random access through the side index, for JSON and JSONL
+        print("\n   Test 2: Random Access")
+        large = os.path.join(tmp, "archive.json")
+        write_json(large, generator, 20000, scenarios=5)
+        write_jsonl(os.path.join(tmp, "archive.jsonl"), generator, 20000, scenarios=5)
+        reader = ScenarioReader(large)
+        start = time.perf_counter()
+        scanned = len(reader)
+        scan_time = time.perf_counter() - start
+        start = time.perf_counter()
+        last = reader.scenario("synthetic_29_005")
+        seek_time = time.perf_counter() - start
+        records = ScenarioReader(os.path.join(tmp, "archive.jsonl"))
+        print(f"      first read (index) {scan_time:.2f}s, one scenario by id {seek_time:.2f}s")
+        if (scanned == 5 and reader.index_built and last == generator.scenario(4, 20000)
+                and records.scenario("synthetic_29_002") == generator.scenario(1, 20000)
+                and reader.zone_count(2) == 20000 and seek_time < scan_time):
+            print("      ✅ Scenarios read by id without reading the rest of the file")
+        else:
+            print("      ❌ Random access wrong")
+            test_passed = False
+
+        # Test 3: Index reused by later readers, rebuilt when the file changes
+        print("\n   Test 3: Side Index")
+        reused = ScenarioReader(large)
+        reused.header("synthetic_29_001")
+        write_json(large, generator, 100, scenarios=2)
+        changed = ScenarioReader(large)
+        try:
+            changed.scenario("synthetic_29_005")
+            missing = False
+        except KeyError:
+            missing = True
+        print(f"      index file: {os.path.exists(large + '.index.json')}, reused: {not reused.index_built}, "
+              f"rebuilt: {changed.index_built}, old id gone: {missing}")
+        if not reused.index_built and changed.index_built and missing and len(changed) == 2:
+            print("      ✅ Index written on first read, reused, and rebuilt when stale")
+        else:
+            print("      ❌ Index not reused or stale index served")
+            test_passed = False
+
+        # Test 4: Bounded memory while streaming zone chunks
+        print("\n   Test 4: Bounded Memory")
+        write_json(large, generator, 30000, scenarios=1)
+        reader = ScenarioReader(large, chunk_size=1000, block_size=1 << 16)
+        len(reader)
+        chunks = []
+        streamed = peak_mb(lambda: chunks.extend(len(chunk) for chunk in reader.zone_chunks(0)))
+
+        def load():
+            with open(large, encoding="utf-8") as f:
+                json.load(f)
+
+        loaded = peak_mb(load)
+        print(f"      peak {streamed:.1f} MB streaming chunks vs {loaded:.1f} MB for json.load")
+        if streamed < loaded / 5 and max(chunks) == 1000 and sum(chunks) == 30000:
+            print("      ✅ Memory bounded by one chunk of zones")
+        else:
+            print("      ❌ Streaming held too much memory")
+            test_passed = False
+
+        # Test 5: A streamed scenario goes straight to the allocator
+        print("\n   Test 5: Allocation")
+        scenario = ScenarioReader(sample).scenario("scenario_002")
+        result = VolunteerAllocator().allocate(scenario["zones"], scenario["available_volunteers"])
+        direct = VolunteerAllocator().allocate(expected["scenarios"][1]["zones"],
+                                               expected["scenarios"][1]["available_volunteers"])
+        print(f"      objective {result['objective_value']}")
+        if result["allocation_plan"] == direct["allocation_plan"]:
+            print("      ✅ Same plan as from the fully loaded file")
+        else:
+            print("      ❌ Streamed scenario allocated differently")
+            test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 29 TEST PASSED ✅")
+    else:
+        print("PHASE 29 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_scenario_reader()
@@ -0,0 +1,160 @@
+"""
+Phase 30 Test: Columnar Scenario Format
+Tests the columnar format: lossless conversion to and from
+disaster_scenarios.json, typed memory-mapped columns (with fields missing
+from some zones, mixed int/float fields and explicit nulls), allocation straight from the columns against the dict
+path, and load-to-plan time against JSON.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import tempfile
+import time
+
+import numpy as np
+
+from datasets import ScenarioGenerator, columnar_to_json, json_to_columnar, load_columnar, write_columnar, write_json
+from datasets.columnar import main as columnar_main
+from optimization.volunteer_allocator import VolunteerAllocator
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', 'datasets', 'disaster_scenarios.json')
+
+
+def close(a, b):
+    """Fairness metrics equal up to the last rounded digit (batch vs per-zone means)."""
+    return a.keys() == b.keys() and all(a[k] == b[k] or abs(a[k] - b[k]) <= 0.011 for k in a)
+
+
+def test_columnar_format():
+    """Test conversion, memory-mapped loading and columnar allocation."""
+
+    print("=" * 60)
+    print("PHASE 30 TEST: Columnar Scenario Format")
+    print("=" * 60)
+
+    test_passed = True
+    with open(DATASET, encoding="utf-8") as f:
+        expected = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Test 1: JSON -> columnar -> JSON is lossless (library and command line)
+        print("\n   Test 1: Round Trip")
+        directories = json_to_columnar(DATASET, os.path.join(tmp, "cols"))
+        columnar_to_json(directories, os.path.join(tmp, "back.json"))
+        with open(os.path.join(tmp, "back.json"), encoding="utf-8") as f:
+            back = json.load(f)
+        columnar_main(["to-columnar", DATASET, os.path.join(tmp, "cli"), "--scenario", "scenario_002"])
+        columnar_main(["to-json", os.path.join(tmp, "cli", "scenario_002"), "--out", os.path.join(tmp, "cli.json")])
+        with open(os.path.join(tmp, "cli.json"), encoding="utf-8") as f:
+            cli = json.load(f)
+        print(f"      {len(directories)} scenario directories, columns: "
+              f"{load_columnar(directories[0]).numeric_columns()}")
+        if back == expected and cli["scenarios"] == [expected["scenarios"][1]]:
+            print("      ✅ Scenarios and metadata survive the round trip")
+        else:
+            print("      ❌ Round trip lost data")
+            test_passed = False
+
+        # Test 2: Typed, memory-mapped columns; fields missing from some zones
+        print("\n   Test 2: Typed Columns")
+        generator = ScenarioGenerator(seed=30, infeasible_rate=0.05)
+        write_columnar(os.path.join(tmp, "gen"), generator, 2000)
+        generated = load_columnar(os.path.join(tmp, "gen"))
+        sparse = {"scenarios": [generator.scenario(0, 500)]}
+        for zone in sparse["scenarios"][0]["zones"][::7]:
+            del zone["capacity"]
+        with open(os.path.join(tmp, "sparse.json"), "w", encoding="utf-8") as f:
+            json.dump(sparse, f)
+        sparse_columns = load_columnar(json_to_columnar(os.path.join(tmp, "sparse.json"), os.path.join(tmp, "sp"))[0])
+        severity = generated["severity"]
+        print(f"      severity {type(severity).__name__} {severity.dtype}, sparse capacity "
+              f"{sparse_columns['capacity'].dtype} ({int(np.isnan(sparse_columns['capacity']).sum())} missing)")
+        if (isinstance(severity, np.memmap) and severity.dtype == np.int8
+                and list(generated.iter_zones(chunk_size=300)) == generator.zones(2000)
+                and sparse_columns.columns["capacity"].get("nullable")
+                and sparse_columns.to_dict() == sparse["scenarios"][0]):
+            print("      ✅ Numeric fields memory-mapped with their dtypes, missing values kept missing")
+        else:
+            print("      ❌ Columns wrongly typed or not memory-mapped")
+            test_passed = False
+
+        # Test 2b: Mixed int/float fields keep each value's type; null differs from missing
+        print("\n   Test 2b: Mixed Types and Nulls")
+        mixed = {"scenarios": [{"scenario_id": "mixed", "available_volunteers": 10, "zones": [
+            {"id": "A", "severity": 2, "capacity": 2, "note": None},
+            {"id": "B", "severity": 3, "capacity": 2.5, "note": "dry"},
+            {"id": "C", "severity": 4, "capacity": 4.0},
+            {"id": "D", "severity": 5, "note": None, "label": None},
+        ]}]}
+        with open(os.path.join(tmp, "mixed.json"), "w", encoding="utf-8") as f:
+            json.dump(mixed, f)
+        mixed_dirs = json_to_columnar(os.path.join(tmp, "mixed.json"), os.path.join(tmp, "mx"))
+        columnar_to_json(mixed_dirs, os.path.join(tmp, "mixed_back.json"))
+        with open(os.path.join(tmp, "mixed_back.json"), encoding="utf-8") as f:
+            mixed_back = json.load(f)
+        zones_back = mixed_back["scenarios"][0]["zones"]
+        types = [type(zone.get("capacity")).__name__ for zone in zones_back]
+        print(f"      capacity types: {types}, zone C keys: {sorted(zones_back[2])}")
+        if (mixed_back == mixed and types == ["int", "float", "float", "NoneType"]
+                and "note" not in zones_back[2] and zones_back[3]["note"] is None
+                and load_columnar(mixed_dirs[0])["note"] == [None, "dry", None, None]):
+            print("      ✅ Ints stay ints next to floats, explicit nulls kept apart from missing keys")
+        else:
+            print("      ❌ Mixed types or nulls not preserved")
+            test_passed = False
+
+        # Test 3: Allocation from columns equals the dict path
+        print("\n   Test 3: Columnar Allocation")
+        mismatches = 0
+        for scenario in (generated, sparse_columns):
+            zones = list(scenario.iter_zones())
+            for fairness in (0.0, 0.3, 0.6):
+                for total in (0, 500, 5000, 100000):
+                    columns = VolunteerAllocator(fairness_weight=fairness).allocate_columns(scenario, total)
+                    plan = VolunteerAllocator(fairness_weight=fairness, solver="exact").allocate(zones, total)
+                    mismatches += (columns["allocations"].tolist() != [e["allocated"] for e in plan["allocation_plan"]]
+                                   or columns["objective_value"] != plan["objective_value"]
+                                   or columns["solver_status"] != plan["solver_status"]
+                                   or not close(columns["fairness_metrics"], plan["fairness_metrics"]))
+        print(f"      24 allocations, {mismatches} mismatches")
+        if mismatches == 0:
+            print("      ✅ Same plan, objective, status and fairness metrics as allocate")
+        else:
+            print("      ❌ Columnar allocation differs")
+            test_passed = False
+
+        # Test 4: Load-to-plan time against JSON
+        print("\n   Test 4: Load Time")
+        large = ScenarioGenerator(seed=31, bottleneck_rate=0.0)
+        write_json(os.path.join(tmp, "large.json"), large, 50000)
+        write_columnar(os.path.join(tmp, "large"), large, 50000)
+        start = time.perf_counter()
+        with open(os.path.join(tmp, "large.json"), encoding="utf-8") as f:
+            scenario = json.load(f)["scenarios"][0]
+        from_json = VolunteerAllocator(solver="exact").allocate(scenario["zones"], scenario["available_volunteers"])
+        json_time = time.perf_counter() - start
+        start = time.perf_counter()
+        from_columns = VolunteerAllocator().allocate_columns(load_columnar(os.path.join(tmp, "large")))
+        columnar_time = time.perf_counter() - start
+        print(f"      50000 zones: JSON {json_time:.3f}s, columnar {columnar_time:.3f}s")
+        if from_columns["objective_value"] == from_json["objective_value"] and columnar_time * 10 < json_time:
+            print("      ✅ Allocated from mapped columns over 10x faster")
+        else:
+            print("      ❌ Columnar path not faster")
+            test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 30 TEST PASSED ✅")
+    else:
+        print("PHASE 30 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_columnar_format()
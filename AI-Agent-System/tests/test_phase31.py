@@ -0,0 +1,137 @@
+"""
+Phase 31 Test: CSV Zone Ingestion
+Tests chunked CSV ingestion: column aliases and the sample file, row-level
+errors for every check (across chunk boundaries), rejected files, and
+allocation from the validated columns against the dict path.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import csv
+import tempfile
+import time
+
+from datasets import ScenarioGenerator, read_zones_csv
+from optimization.volunteer_allocator import VolunteerAllocator
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_data.csv')
+FIELDS = ["id", "severity", "required_volunteers", "capacity", "resources_available", "min_resources_per_volunteer"]
+
+
+def write_rows(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def test_csv_ingestion():
+    """Test CSV ingestion, validation and columnar allocation."""
+
+    print("=" * 60)
+    print("PHASE 31 TEST: CSV Zone Ingestion")
+    print("=" * 60)
+
+    test_passed = True
+
+    # Test 1: The sample file ("zone" column, severities out of the default range)
+    print("\n   Test 1: Sample File")
+    sample = read_zones_csv(SAMPLE)
+    wide = read_zones_csv(SAMPLE, severity_range=(1, 20))
+    unchecked = read_zones_csv(SAMPLE, severity_range=None)
+    print(f"      {sample.report()}; with severity_range=(1, 20): {len(wide)} rows")
+    try:
+        VolunteerAllocator().allocate_columns(wide)
+        budget_error = None
+    except ValueError as error:
+        budget_error = str(error)
+    if (list(sample["id"]) == ["A"] and sample.rows_read == 3
+            and [(e["row"], e["column"], e["value"]) for e in sample.errors] == [(2, "severity", "20"),
+                                                                                 (3, "severity", "15")]
+            and list(wide["id"]) == ["A", "B", "C"] and wide.errors == [] and len(unchecked) == 3
+            and budget_error and "total_volunteers" in budget_error
+            and VolunteerAllocator().allocate_columns(wide, 30)["remaining_volunteers"] >= 0):
+        print("      ✅ Aliased id column read, out-of-range rows reported, range configurable, "
+              "missing budget a clear ValueError")
+    else:
+        print("      ❌ Sample file misread")
+        test_passed = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Test 2: One bad row per check, spread over chunks of 4
+        print("\n   Test 2: Row Errors")
+        rows = [[f"Z{i}", 3, 5, 8, 40, 2] for i in range(1, 21)]
+        bad = {2: ("id", ""), 5: ("id", "Z1"), 7: ("severity", ""), 9: ("severity", "11"),
+               10: ("capacity", "-1"), 13: ("resources_available", "lots"),
+               14: ("min_resources_per_volunteer", "0"), 18: ("required_volunteers", "-4")}
+        for row, (field, value) in bad.items():
+            rows[row - 1][FIELDS.index(field)] = value
+        rows[15][3] = ""  # empty optional cell: capacity not given, not an error
+        write_rows(os.path.join(tmp, "dirty.csv"), [" ID", "Severity"] + FIELDS[2:] + ["notes"], rows)
+        table = read_zones_csv(os.path.join(tmp, "dirty.csv"), chunk_size=4)
+        reported = {e["row"]: e["column"] for e in table.errors}
+        print(f"      errors: {[(e['row'], e['column'], e['error']) for e in table.errors]}")
+        if (reported == {row: field for row, (field, _) in bad.items()} and len(table) == 12
+                and table.rows_rejected == 8 and "Z16" in list(table["id"])
+                and table.report()["errors_by_kind"]["id: duplicate"] == 1):
+            print("      ✅ Every failing row reported by row, column and reason, the rest kept")
+        else:
+            print("      ❌ Row errors wrong")
+            test_passed = False
+
+        # Test 3: Files without a required column are rejected
+        print("\n   Test 3: Required Columns")
+        write_rows(os.path.join(tmp, "no_severity.csv"), ["id", "capacity"], [["Z1", 4]])
+        try:
+            read_zones_csv(os.path.join(tmp, "no_severity.csv"))
+            rejected = False
+        except ValueError as error:
+            rejected = "severity" in str(error)
+        capped = read_zones_csv(os.path.join(tmp, "dirty.csv"), max_errors=3)
+        print(f"      missing severity rejected: {rejected}, errors kept with max_errors=3: {len(capped.errors)}")
+        if rejected and len(capped.errors) == 3 and capped.report()["errors_truncated"]:
+            print("      ✅ Missing columns rejected, error list capped but counted")
+        else:
+            print("      ❌ Column or error-cap handling wrong")
+            test_passed = False
+
+        # Test 4: Validated columns allocate like the same zones as dicts
+        print("\n   Test 4: Allocation")
+        zones = ScenarioGenerator(seed=31).zones(100000)
+        for zone in zones[::9]:
+            del zone["capacity"]
+        path = os.path.join(tmp, "zones.csv")
+        write_rows(path, FIELDS, ([zone.get(field, "") for field in FIELDS] for zone in zones))
+        start = time.perf_counter()
+        table = read_zones_csv(path, chunk_size=20000)
+        from_csv = VolunteerAllocator(fairness_weight=0.3).allocate_columns(table, 400000)
+        csv_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with open(path, newline="", encoding="utf-8") as f:
+            dict_zones = [{k: (v if k == "id" else int(v)) for k, v in row.items() if v != ""}
+                          for row in csv.DictReader(f)]
+        plan = VolunteerAllocator(fairness_weight=0.3, solver="exact").allocate(dict_zones, 400000)
+        dict_time = time.perf_counter() - start
+        print(f"      100000 rows: chunked columns {csv_time:.2f}s, csv.DictReader + allocate {dict_time:.2f}s")
+        if (from_csv["allocations"].tolist() == [e["allocated"] for e in plan["allocation_plan"]]
+                and from_csv["objective_value"] == plan["objective_value"] and table.errors == []
+                and csv_time < dict_time):
+            print("      ✅ Same plan, faster, without per-zone dicts")
+        else:
+            print("      ❌ Columnar CSV plan differs or is slower")
+            test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 31 TEST PASSED ✅")
+    else:
+        print("PHASE 31 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_csv_ingestion()
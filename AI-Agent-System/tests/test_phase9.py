@@ -0,0 +1,178 @@
+"""
+Phase 9 Test: Compact Binary Message Codec
+Tests that task messages round-trip losslessly through the columnar codec
+(including user dicts that look like table references), that damaged frames
+raise CodecError, and that the worker replies in the content type it was
+addressed in.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from communication import codec, protocol
+from communication.models import Message, Task
+from agents.workers.worker_base import AbstractWorkerAgent
+
+
+def make_zones(count):
+    return [
+        {
+            "id": f"Z{i+1}",
+            "name": f"Zone {i+1}",
+            "latitude": 40.0 + i * 0.001,
+            "longitude": -74.0 - i * 0.001,
+            "severity": 10 - (i % 10),
+            "required_volunteers": 5 + (i % 7),
+            "capacity": 15 + (i % 10),
+            "resources_available": 100 - (i % 30),
+            "min_resources_per_volunteer": 3 + (i % 3),
+            "hazards": ["Flooding", "Debris"][: 1 + (i % 2)]
+        }
+        for i in range(count)
+    ]
+
+
+class RecordingWorker(AbstractWorkerAgent):
+    """Minimal worker that echoes zone counts and records outgoing messages."""
+
+    def __init__(self):
+        super().__init__("Worker_Test", "Supervisor_Test")
+        self.sent = []
+
+    def process_task(self, task_data):
+        return {"zones_seen": len(task_data.get("zones", []))}
+
+    def send_message(self, recipient, message_obj):
+        self.sent.append(message_obj)
+
+    def write_to_ltm(self, key, value):
+        return True
+
+    def read_from_ltm(self, key):
+        return None
+
+
+def test_compact_codec():
+    """Test round trips, size reduction and content-type negotiation."""
+
+    print("=" * 60)
+    print("PHASE 9 TEST: Compact Binary Message Codec")
+    print("=" * 60)
+
+    test_passed = True
+    zones = make_zones(200)
+    # Heterogeneous records: a missing key and a mixed int/float column
+    zones[3].pop("capacity")
+    zones[5]["min_resources_per_volunteer"] = 2.5
+
+    msg = Message.new(
+        sender="Supervisor_Test",
+        recipient="Worker_Test",
+        msg_type=protocol.TASK_ASSIGNMENT,
+        task=Task(name="allocate_resources", priority=1,
+                  parameters={"zones": zones, "available_volunteers": 500}),
+        content_type=protocol.CONTENT_TYPE_COMPACT,
+    )
+
+    # Test 1: Lossless round trip (types preserved, missing keys preserved)
+    print("\n   Test 1: Lossless Round Trip")
+    payload = msg.encode()
+    decoded = Message.decode(payload)
+    if decoded.dict() == msg.dict():
+        print("      ✅ Decoded message equals original")
+    else:
+        print("      ❌ Decoded message differs from original")
+        test_passed = False
+    decoded_zones = decoded.task.parameters["zones"]
+    if "capacity" not in decoded_zones[3] and type(decoded_zones[0]["min_resources_per_volunteer"]) is int:
+        print("      ✅ Missing keys and int/float types preserved")
+    else:
+        print("      ❌ Column types or presence not preserved")
+        test_passed = False
+
+    # Test 2: Compact payload is smaller than JSON
+    print("\n   Test 2: Payload Size")
+    json_size = len(msg.json().encode("utf-8"))
+    compact_size = len(payload)
+    print(f"      JSON: {json_size} bytes, Compact: {compact_size} bytes")
+    if compact_size < json_size:
+        print(f"      ✅ Compact payload is {100 * (1 - compact_size / json_size):.1f}% smaller")
+    else:
+        print("      ❌ Compact payload is not smaller than JSON")
+        test_passed = False
+
+    # Test 3: Content type sniffing
+    print("\n   Test 3: Content Type Detection")
+    if (codec.detect_content_type(payload) == protocol.CONTENT_TYPE_COMPACT
+            and codec.detect_content_type(msg.json()) == protocol.CONTENT_TYPE_JSON):
+        print("      ✅ Compact and JSON payloads detected correctly")
+    else:
+        print("      ❌ Content type detection failed")
+        test_passed = False
+
+    # Test 4: Worker negotiates the reply content type
+    print("\n   Test 4: Worker Reply Negotiation")
+    worker = RecordingWorker()
+    json_msg = msg.copy(update={"content_type": protocol.CONTENT_TYPE_JSON})
+    worker.handle_incoming_message(payload)
+    worker.handle_incoming_message(json_msg.encode())
+    reply_types = [m["content_type"] for m in worker.sent]
+    results = [m["results"]["zones_seen"] for m in worker.sent]
+    print(f"      Reply content types: {reply_types}")
+    if reply_types == [protocol.CONTENT_TYPE_COMPACT, protocol.CONTENT_TYPE_JSON] and results == [200, 200]:
+        print("      ✅ Replies mirror the incoming content type")
+    else:
+        print("      ❌ Reply content type not negotiated")
+        test_passed = False
+
+    # Test 5: Corrupt frames are rejected with CodecError
+    print("\n   Test 5: Corrupt Frame Handling")
+    try:
+        codec.decode_message(payload[:-7])
+        print("      ❌ Truncated frame was accepted")
+        test_passed = False
+    except codec.CodecError:
+        print("      ✅ Truncated frame rejected")
+
+    # Test 6: User dicts shaped like table references survive; every truncation is a CodecError
+    print("\n   Test 6: Reserved Keys and Truncation")
+    tricky = Message.new(
+        sender="Supervisor_Test",
+        recipient="Worker_Test",
+        msg_type=protocol.TASK_ASSIGNMENT,
+        task=Task(name="allocate_resources", priority=1,
+                  parameters={"zones": zones[:3], "note": {"$table": 0}, "wrapped": {"$dict": {"$table": 1}},
+                              "rows": [{"a": 1}, {"b": 2.5}, {"a": 3, "b": {"$table": 0}}]}),
+        content_type=protocol.CONTENT_TYPE_COMPACT,
+    )
+    frame = tricky.encode()
+    errors = set()
+    for cut in range(2, len(frame)):
+        try:
+            codec.decode_message(frame[:cut])
+            errors.add("accepted")
+        except codec.CodecError:
+            pass
+        except Exception as e:
+            errors.add(type(e).__name__)
+    print(f"      note decodes to: {Message.decode(frame).task.parameters['note']}, "
+          f"non-CodecError outcomes over {len(frame) - 2} truncations: {sorted(errors)}")
+    if Message.decode(frame).dict() == tricky.dict() and not errors:
+        print("      ✅ Reserved-looking dicts kept, truncated masks and columns raise CodecError")
+    else:
+        print("      ❌ Reserved keys corrupted or truncation escaped as another error")
+        test_passed = False
+
+    print("\n" + "=" * 60)
+    if test_passed:
+        print("PHASE 9 TEST PASSED ✅")
+    else:
+        print("PHASE 9 TEST FAILED ❌")
+    print("=" * 60)
+
+    assert test_passed
+
+
+if __name__ == "__main__":
+    test_compact_codec()